@@ -3,6 +3,14 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Para servir la API con las vistas CRUD async (core/views_async.py):
+
+    API_ASYNC_VIEWS=1 uvicorn backend.asgi:application
+
+Los eventos en vivo (``/api/events/``, Server-Sent Events) también
+requieren ASGI. Con más de un worker configure ``REDIS_URL`` para que el
+broker de ``core/eventos.py`` reparta cada cambio entre todos los procesos.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -10,22 +10,47 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
+from .env import database_url, env_bool, env_int, env_list, env_max_age, env_str
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
+# Perfiles (DJANGO_PROFILE): valores por defecto que las variables de
+# entorno pueden sobrescribir.
+#   dev   - desarrollo local con DEBUG (guarda cada consulta SQL en memoria).
+#   prod  - sin DEBUG; exige DJANGO_SECRET_KEY, DJANGO_ALLOWED_HOSTS,
+#           API_METRICS_TOKEN y elegir la caché (REDIS_URL o CACHE_BACKEND).
+#   bench - sin DEBUG y SQLite en modo WAL para medir rendimiento sin MySQL.
+PERFILES = {
+    'dev': {'DEBUG': True, 'DATABASE_URL': ''},
+    'prod': {'DEBUG': False, 'DATABASE_URL': ''},
+    'bench': {'DEBUG': False, 'DATABASE_URL': 'sqlite:///bench.sqlite3'},
+}
+PERFIL = env_str('DJANGO_PROFILE', 'dev')
+if PERFIL not in PERFILES:
+    raise ImproperlyConfigured(f"DJANGO_PROFILE debe ser uno de: {', '.join(PERFILES)}.")
+
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-@#&khm7$m+vp6&maujq4e97p#h^d%e((t^b$-2#3@694)o1a5+'
+SECRET_KEY = env_str('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    if PERFIL == 'prod':
+        raise ImproperlyConfigured("El perfil prod requiere DJANGO_SECRET_KEY.")
+    SECRET_KEY = 'django-insecure-@#&khm7$m+vp6&maujq4e97p#h^d%e((t^b$-2#3@694)o1a5+'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env_bool('DJANGO_DEBUG', PERFILES[PERFIL]['DEBUG'])
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', ['*'] if PERFIL == 'bench' else [])
+if PERFIL == 'prod' and not ALLOWED_HOSTS:
+    raise ImproperlyConfigured("El perfil prod requiere DJANGO_ALLOWED_HOSTS.")
 
 
 # Application definition
@@ -47,6 +72,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricasMiddleware',
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -80,19 +106,131 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': 'optimizacion_logistica',  
-        'USER': 'root',                    
-        'PASSWORD': '6487063a1234',     
-        'HOST': 'localhost',
-        'PORT': '3306',
-        'OPTIONS': {
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
-        },
+# Vistas CRUD async (core/views_async.py) para servir con ASGI, p. ej.
+# API_ASYNC_VIEWS=1 uvicorn backend.asgi:application
+API_ASYNC_VIEWS = env_bool('API_ASYNC_VIEWS')
+
+# DATABASE_URL (mysql://, postgresql://, sqlite:///) tiene prioridad; si no
+# está definida se usa DB_ENGINE=mysql (por defecto) o postgresql con las
+# credenciales de DB_NAME, DB_USER, DB_PASSWORD, DB_HOST y DB_PORT.
+DATABASE_URL = env_str('DATABASE_URL', PERFILES[PERFIL]['DATABASE_URL'])
+DB_ENGINE = env_str('DB_ENGINE', 'mysql')
+
+if DATABASE_URL:
+    DATABASES = {'default': database_url(DATABASE_URL)}
+elif DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': env_str('DB_NAME', 'optimizacion_logistica'),
+            'USER': env_str('DB_USER', 'postgres'),
+            'PASSWORD': env_str('DB_PASSWORD'),
+            'HOST': env_str('DB_HOST', 'localhost'),
+            'PORT': env_str('DB_PORT', '5432'),
+            'OPTIONS': {},
+        }
+    }
+elif DB_ENGINE == 'mysql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': env_str('DB_NAME', 'optimizacion_logistica'),
+            'USER': env_str('DB_USER', 'root'),
+            'PASSWORD': env_str('DB_PASSWORD', '6487063a1234'),
+            'HOST': env_str('DB_HOST', 'localhost'),
+            'PORT': env_str('DB_PORT', '3306'),
+            'OPTIONS': {
+                'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured("DB_ENGINE debe ser 'mysql' o 'postgresql'.")
+
+_motor = DATABASES['default']['ENGINE']
+
+# Pool nativo de Django (psycopg[pool]): cada proceso mantiene entre
+# DB_POOL_MIN_SIZE y DB_POOL_MAX_SIZE conexiones abiertas. El total hacia
+# PostgreSQL es workers × DB_POOL_MAX_SIZE.
+if _motor.endswith('postgresql') and env_bool('DB_POOL', True):
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': env_int('DB_POOL_MIN_SIZE', 2),
+        'max_size': env_int('DB_POOL_MAX_SIZE', 10),
+        'timeout': env_int('DB_POOL_TIMEOUT', 10),
     }
-}
+
+# SQLite: rutas relativas a BASE_DIR y, salvo SQLITE_WAL=0, modo WAL (las
+# lecturas no esperan a las escrituras), synchronous=NORMAL y BEGIN
+# IMMEDIATE para que las escrituras concurrentes esperen busy_timeout en
+# vez de fallar con "database is locked".
+if _motor.endswith('sqlite3'):
+    _nombre = DATABASES['default']['NAME']
+    if _nombre != ':memory:' and not os.path.isabs(_nombre):
+        DATABASES['default']['NAME'] = str(BASE_DIR / _nombre)
+    if env_bool('SQLITE_WAL', True) and _nombre != ':memory:':
+        DATABASES['default']['OPTIONS'].update({
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA busy_timeout=5000;'
+                'PRAGMA cache_size=-65536;'
+                'PRAGMA temp_store=MEMORY;'
+                'PRAGMA mmap_size=268435456'
+            ),
+            'transaction_mode': 'IMMEDIATE',
+        })
+
+# Conexiones persistentes: cada thread reutiliza su conexión durante
+# DB_CONN_MAX_AGE segundos ('none' = sin límite) en vez de abrir una por
+# petición; CONN_HEALTH_CHECKS descarta las que el servidor cerró.
+# Con el pool de PostgreSQL debe ser 0 (el pool ya reutiliza conexiones) y
+# con las vistas async también, porque cada petición usa un thread distinto.
+if 'pool' in DATABASES['default']['OPTIONS'] or API_ASYNC_VIEWS:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = env_max_age('DB_CONN_MAX_AGE', 60)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env_bool('DB_CONN_HEALTH_CHECKS', True)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND=locmem (por defecto, caché LRU en memoria del proceso),
+# redis (compartida entre workers, REDIS_URL) o dummy (sin caché). Si sólo
+# se define REDIS_URL se usa Redis. En prod la caché en memoria debe pedirse
+# explícitamente (CACHE_BACKEND=locmem), porque no se comparte entre workers.
+
+if PERFIL == 'prod' and not (env_str('CACHE_BACKEND') or env_str('REDIS_URL')):
+    raise ImproperlyConfigured("El perfil prod requiere REDIS_URL o CACHE_BACKEND.")
+
+CACHE_BACKEND = env_str('CACHE_BACKEND', 'redis' if env_str('REDIS_URL') else 'locmem')
+CACHE_TIMEOUT = env_int('CACHE_TIMEOUT', 300)
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': env_str('REDIS_URL', 'redis://127.0.0.1:6379/0'),
+            'TIMEOUT': CACHE_TIMEOUT,
+        }
+    }
+elif CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'optimizacion-api',
+            'TIMEOUT': CACHE_TIMEOUT,
+            'OPTIONS': {'MAX_ENTRIES': env_int('CACHE_MAX_ENTRIES', 5000)},
+        }
+    }
+elif CACHE_BACKEND == 'dummy':
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+else:
+    raise ImproperlyConfigured("CACHE_BACKEND debe ser 'locmem', 'redis' o 'dummy'.")
+
+# Procesos del servidor web (gunicorn.conf.py lee la misma variable). Con
+# más de uno la caché en memoria no es compartida entre ellos: la caché de
+# listados y la de tokens sólo se usan con Redis (core.cache.compartida).
+API_WEB_WORKERS = env_int('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1)
 
 
 # Password validation
@@ -139,15 +277,110 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CORS_ALLOW_ALL_ORIGINS = True
 
 REST_FRAMEWORK = {
+    # La API navegable sólo con DEBUG: en producción cada respuesta es JSON
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Paginación por cursor de los listados
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 100,
 }
 
+# Máximo que un cliente puede pedir con ?page_size=
+API_MAX_PAGE_SIZE = 1000
+
+# Filas leídas por consulta al exportar con ?stream=
+API_STREAM_CHUNK_SIZE = 2000
+
+# Endpoints /bulk/: máximo de registros por petición y filas por INSERT/UPDATE
+API_BULK_MAX_ITEMS = 1000
+API_BULK_BATCH_SIZE = 500
+
+# Importación de planillas (core/importacion.py): filas validadas e
+# insertadas por bloque y máximo de errores informados
+API_IMPORT_CHUNK_SIZE = 2000
+API_IMPORT_MAX_ERRORS = 1000
+
+# Sincronización incremental (/api/changes/, core/cambios.py): cambios por
+# página y antigüedad mínima para entregarlos (margen entre reservar el id
+# y confirmar el INSERT)
+API_CHANGES_PAGE_SIZE = 500
+API_CHANGES_LAG_SECONDS = env_int('API_CHANGES_LAG_SECONDS', 2)
+
+# Eventos en vivo (/api/events/, core/eventos.py). Con varios workers el
+# broker debe ser Redis para que cada escritura llegue a todos los clientes.
+API_EVENTS_BROKER = env_str(
+    'API_EVENTS_BROKER',
+    'core.eventos.RedisBroker' if env_str('REDIS_URL') else 'core.eventos.MemoriaBroker',
+)
+API_EVENTS_REDIS_URL = env_str('REDIS_URL', 'redis://127.0.0.1:6379/0')
+# Más cambios por recurso que esto en un lote se publican como un evento "lote"
+API_EVENTS_MAX_BATCH = 100
+API_EVENTS_QUEUE_SIZE = 1000
+API_EVENTS_HEARTBEAT_SECONDS = 15
+
+# Trabajos en segundo plano (core/trabajos.py, manage.py runworker):
+# procesos por worker, reintentos con espera exponencial desde
+# API_JOBS_RETRY_SECONDS y segundos sin latido para dar un trabajo por
+# perdido. Los archivos de las importaciones en segundo plano se guardan
+# en API_JOBS_DIR, que debe ser visible para los workers.
+API_JOBS_WORKERS = env_int('API_JOBS_WORKERS', os.cpu_count() or 1)
+API_JOBS_POLL_SECONDS = 1
+API_JOBS_MAX_ATTEMPTS = 3
+API_JOBS_RETRY_SECONDS = 30
+API_JOBS_TIMEOUT_SECONDS = 600
+API_JOBS_DIR = Path(env_str('API_JOBS_DIR', str(BASE_DIR / 'tmp' / 'trabajos')))
+
+# Nómina (core/nomina.py): jornada semanal para el valor hora, recargo de
+# las horas extras y estados de asistencia que se descuentan a valor día
+API_PAYROLL_WEEKLY_HOURS = 44
+API_PAYROLL_OVERTIME_FACTOR = 1.5
+API_PAYROLL_UNPAID_STATES = ('AUSENTE',)
+
+# Puntaje de eficiencia (core/eficiencia.py): peso de cada indicador en el
+# promedio de percentiles; los que no se indiquen usan core.eficiencia.PESOS
+API_EFFICIENCY_WEIGHTS = {}
+
+# Listados leídos con .values() y conversión precompilada (core/fastpath.py)
+API_FASTPATH_LISTADOS = True
+
+# Caché de respuestas de los listados (core/cache.py); sin caché compartida
+# y con varios workers no se usa
+API_CACHE_LISTADOS = env_bool('API_CACHE_LISTADOS', True)
+API_CACHE_TIMEOUT = CACHE_TIMEOUT
+
+# Métricas por petición (core/middleware.py): se registra en el log
+# core.lentas toda petición que tarde API_SLOW_REQUEST_MS o más, con hasta
+# API_SLOW_REQUEST_SQL_MAX consultas (sin sus parámetros). /metrics exige "Authorization: Bearer
+# <API_METRICS_TOKEN>" si la variable está definida; en prod es obligatoria
+# para no publicar las rutas y los tiempos de la API.
+API_SLOW_REQUEST_MS = env_int('API_SLOW_REQUEST_MS', 500)
+API_SLOW_REQUEST_SQL_MAX = 50
+API_METRICS_TOKEN = env_str('API_METRICS_TOKEN')
+if PERFIL == 'prod' and not API_METRICS_TOKEN:
+    raise ImproperlyConfigured("El perfil prod requiere API_METRICS_TOKEN.")
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.lentas': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+# Segundos que se recuerda un token válido (core/authentication.py)
+AUTH_TOKEN_CACHE_TTL = 300
+
 SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': False,  
     'PERSIST_AUTH': True,       
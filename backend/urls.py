@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
-from core import views
+from core import views, views_async
 
 from rest_framework.authtoken.views import obtain_auth_token
 
@@ -10,31 +11,53 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+# CRUD síncrono (WSGI) o async (ASGI) según API_ASYNC_VIEWS
+crud = views_async if settings.API_ASYNC_VIEWS else views
+
 urlpatterns = [
     path('', views.home),
+    path('metrics', views.metrics, name='metrics'),
     path('admin/', admin.site.urls),
 
     # Token DRF
     path('api/token/', obtain_auth_token, name='api_token_auth'),
 
     # Endpoints API
-    path('api/trabajadores/', views.trabajador_list, name='trabajador_list'),
-    path('api/trabajadores/<int:pk>/', views.trabajador_detail, name='trabajador_detail'),
+    path('api/trabajadores/', crud.trabajador_list, name='trabajador_list'),
+    path('api/trabajadores/<int:pk>/', crud.trabajador_detail, name='trabajador_detail'),
+
+    path('api/asistencias/', crud.asistencia_list, name='asistencia_list'),
+    path('api/asistencias/<int:pk>/', crud.asistencia_detail, name='asistencia_detail'),
+    path('api/asistencias/bulk/', views.asistencia_bulk, name='asistencia_bulk'),
+    path('api/asistencias/importar/', views.asistencia_importar, name='asistencia_importar'),
+
+    path('api/accidentes/', crud.accidente_list, name='accidente_list'),
+    path('api/accidentes/<int:pk>/', crud.accidente_detail, name='accidente_detail'),
+
+    path('api/eficiencias/', crud.eficiencia_list, name='eficiencia_list'),
+    path('api/eficiencias/<int:pk>/', crud.eficiencia_detail, name='eficiencia_detail'),
+    path('api/eficiencias/puntajes/', views.eficiencia_puntajes, name='eficiencia_puntajes'),
 
-    path('api/asistencias/', views.asistencia_list, name='asistencia_list'),
-    path('api/asistencias/<int:pk>/', views.asistencia_detail, name='asistencia_detail'),
+    path('api/desempenos/', crud.desempeno_list, name='desempeno_list'),
+    path('api/desempenos/<int:pk>/', crud.desempeno_detail, name='desempeno_detail'),
 
-    path('api/accidentes/', views.accidente_list, name='accidente_list'),
-    path('api/accidentes/<int:pk>/', views.accidente_detail, name='accidente_detail'),
+    path('api/sueldos/', crud.sueldo_list, name='sueldo_list'),
+    path('api/sueldos/<int:pk>/', crud.sueldo_detail, name='sueldo_detail'),
+    path('api/sueldos/bulk/', views.sueldo_bulk, name='sueldo_bulk'),
+    path('api/sueldos/importar/', views.sueldo_importar, name='sueldo_importar'),
+    path('api/sueldos/calcular/', views.sueldo_calcular, name='sueldo_calcular'),
 
-    path('api/eficiencias/', views.eficiencia_list, name='eficiencia_list'),
-    path('api/eficiencias/<int:pk>/', views.eficiencia_detail, name='eficiencia_detail'),
+    path('api/resumen-mensual/', views.resumen_mensual, name='resumen_mensual'),
+    path('api/changes/', views.changes, name='changes'),
+    path('api/events/', views_async.stream_eventos, name='eventos'),
 
-    path('api/desempenos/', views.desempeno_list, name='desempeno_list'),
-    path('api/desempenos/<int:pk>/', views.desempeno_detail, name='desempeno_detail'),
+    path('api/trabajos/', views.trabajo_list, name='trabajo_list'),
+    path('api/trabajos/<int:pk>/', views.trabajo_detail, name='trabajo_detail'),
 
-    path('api/sueldos/', views.sueldo_list, name='sueldo_list'),
-    path('api/sueldos/<int:pk>/', views.sueldo_detail, name='sueldo_detail'),
+    path('api/stats/asistencia/', views.stats_asistencia, name='stats_asistencia'),
+    path('api/stats/atrasos/', views.stats_atrasos, name='stats_atrasos'),
+    path('api/stats/accidentes/', views.stats_accidentes, name='stats_accidentes'),
+    path('api/stats/sueldos/', views.stats_sueldos, name='stats_sueldos'),
 
     # ✅ drf-spectacular schema + Swagger UI
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
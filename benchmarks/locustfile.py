@@ -0,0 +1,123 @@
+"""
+Carga HTTP contra un servidor en ejecución (gunicorn/uvicorn), para medir
+con concurrencia real lo que ``manage.py bench_api`` mide dentro del proceso:
+
+    DJANGO_PROFILE=bench python manage.py generar_datos --trabajadores 2000
+    DJANGO_PROFILE=bench gunicorn backend.wsgi
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000 \\
+        --headless -u 50 -r 10 -t 2m
+
+Al terminar guarda p50/p95/p99 y throughput por endpoint en
+``benchmarks/resultados/locust-<fecha>.json``. Con ``API_TOKEN`` definido
+también ejecuta escrituras (upsert de asistencias en lote).
+"""
+import json
+import os
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from locust import HttpUser, between, events, task
+
+RESULTADOS = Path(__file__).resolve().parent / "resultados"
+
+
+class UsuarioApi(HttpUser):
+    wait_time = between(0.1, 0.5)
+
+    def on_start(self):
+        token = os.environ.get("API_TOKEN")
+        if token:
+            self.client.headers["Authorization"] = f"Token {token}"
+        self.escribe = bool(token)
+
+        trabajadores = self.client.get("/api/trabajadores/?page_size=200&fields=id,rut", name="setup").json()["results"]
+        asistencias = self.client.get("/api/asistencias/?page_size=200&fields=id,fecha", name="setup").json()["results"]
+        self.trabajadores = trabajadores
+        self.asistencias = [a["id"] for a in asistencias]
+        self.ultima_fecha = date.fromisoformat(asistencias[0]["fecha"]) if asistencias else date.today()
+
+    @task(10)
+    def listar_asistencias(self):
+        self.client.get("/api/asistencias/?page_size=100", name="/api/asistencias/")
+
+    @task(6)
+    def asistencias_de_trabajador(self):
+        rut = random.choice(self.trabajadores)["rut"]
+        self.client.get(f"/api/asistencias/?trabajador_rut={rut}&page_size=100", name="/api/asistencias/?trabajador_rut")
+
+    @task(4)
+    def recorrer_cursor(self):
+        pagina = self.client.get("/api/asistencias/?page_size=100", name="/api/asistencias/").json()
+        for _ in range(3):
+            if not pagina.get("next"):
+                break
+            pagina = self.client.get(pagina["next"], name="/api/asistencias/?cursor").json()
+
+    @task(6)
+    def detalle_asistencia(self):
+        self.client.get(f"/api/asistencias/{random.choice(self.asistencias)}/", name="/api/asistencias/[id]/")
+
+    @task(4)
+    def listar_trabajadores(self):
+        self.client.get("/api/trabajadores/?page_size=100&estado=ACTIVO", name="/api/trabajadores/")
+
+    @task(4)
+    def detalle_trabajador(self):
+        self.client.get(f"/api/trabajadores/{random.choice(self.trabajadores)['id']}/", name="/api/trabajadores/[id]/")
+
+    @task(2)
+    def resumen(self):
+        self.client.get("/api/resumen-mensual/?agrupar=mes,area", name="/api/resumen-mensual/")
+
+    @task(2)
+    def estadisticas(self):
+        self.client.get("/api/stats/asistencia/?agrupar=area", name="/api/stats/asistencia/")
+        self.client.get("/api/stats/accidentes/?por_gravedad=1", name="/api/stats/accidentes/")
+
+    @task(1)
+    def exportar(self):
+        desde = self.ultima_fecha - timedelta(days=7)
+        with self.client.get(f"/api/asistencias/?stream=ndjson&fecha__gte={desde}", name="/api/asistencias/?stream", stream=True) as r:
+            for _ in r.iter_content(chunk_size=65536):
+                pass
+
+    @task(2)
+    def upsert_lote(self):
+        if not self.escribe:
+            return
+        fecha = self.ultima_fecha - timedelta(days=random.randrange(30))
+        lote = [
+            {"trabajador_rut": t["rut"], "fecha": str(fecha), "estado": random.choice(("PRESENTE", "AUSENTE"))}
+            for t in random.sample(self.trabajadores, min(20, len(self.trabajadores)))
+        ]
+        self.client.post("/api/asistencias/bulk/?upsert=1", json=lote, name="/api/asistencias/bulk/?upsert")
+
+
+@events.quitting.add_listener
+def guardar_resultados(environment, **kwargs):
+    endpoints = {}
+    for (nombre, metodo), entrada in sorted(environment.stats.entries.items()):
+        if nombre == "setup" or not entrada.num_requests:
+            continue
+        endpoints[f"{metodo} {nombre}"] = {
+            "peticiones": entrada.num_requests,
+            "fallas": entrada.num_failures,
+            "p50_ms": entrada.get_response_time_percentile(0.5),
+            "p95_ms": entrada.get_response_time_percentile(0.95),
+            "p99_ms": entrada.get_response_time_percentile(0.99),
+            "media_ms": round(entrada.avg_response_time, 3),
+            "peticiones_por_segundo": round(entrada.total_rps, 1),
+        }
+    if not endpoints:
+        return
+
+    RESULTADOS.mkdir(exist_ok=True)
+    salida = RESULTADOS / f"locust-{datetime.now():%Y%m%d-%H%M%S}.json"
+    salida.write_text(json.dumps({
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "host": environment.host,
+        "usuarios": environment.runner.user_count if environment.runner else None,
+        "endpoints": endpoints,
+    }, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Resultados guardados en {salida}")
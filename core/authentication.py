@@ -0,0 +1,48 @@
+# core/authentication.py
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.authentication import TokenAuthentication
+
+from .cache import compartida
+
+
+def _cache():
+    return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+
+def clave_token(key):
+    # Nunca se guarda el token en claro como clave de la caché
+    return "api:auth:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def olvidar_tokens(*keys):
+    _cache().delete_many([clave_token(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication que guarda ``(user, token)`` en la caché durante
+    ``AUTH_TOKEN_CACHE_TTL`` segundos, así una petición autenticada no
+    consulta ``authtoken_token`` ni ``auth_user`` mientras esté en caché.
+
+    Las entradas se borran al eliminar el token y al guardar o eliminar el
+    usuario (desactivación, cambio de permisos), ver ``core/signals.py``.
+    Ese borrado sólo llega a los demás workers si la caché es compartida:
+    con una caché en memoria y varios workers se autentica sin caché.
+    """
+
+    def authenticate_credentials(self, key):
+        if not compartida():
+            return super().authenticate_credentials(key)
+        cache = _cache()
+        clave = clave_token(key)
+        cacheado = cache.get(clave)
+        if cacheado is not None:
+            return cacheado
+
+        user, token = super().authenticate_credentials(key)
+        cache.set(clave, (user, token), timeout=getattr(settings, "AUTH_TOKEN_CACHE_TTL", 300))
+        return user, token
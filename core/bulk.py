@@ -0,0 +1,313 @@
+# core/bulk.py
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from . import cambios, resumen
+from .models import Trabajador
+from .signals import registros_en_lote
+
+
+def _lote_maximo():
+    return getattr(settings, "API_BULK_MAX_ITEMS", 1000)
+
+
+def _batch_size():
+    return getattr(settings, "API_BULK_BATCH_SIZE", 500)
+
+
+def _items(data):
+    if not isinstance(data, list):
+        raise ValidationError({"detail": "Se esperaba un arreglo de registros."})
+    if not data:
+        raise ValidationError({"detail": "El arreglo está vacío."})
+    if len(data) > _lote_maximo():
+        raise ValidationError({"detail": f"Máximo {_lote_maximo()} registros por lote."})
+    return data
+
+
+def _errores(errors):
+    """Convierte los errores de ``many=True`` en ``[{indice, errores}]``."""
+    if isinstance(errors, dict):
+        # DRF puede entregar los errores de la lista como {"<indice>": {...}}
+        if errors and all(str(k).isdigit() for k in errors):
+            return [{"indice": int(k), "errores": e} for k, e in sorted(errors.items(), key=lambda kv: int(kv[0]))]
+        return [{"indice": None, "errores": errors}]
+    return [{"indice": i, "errores": e} for i, e in enumerate(errors) if e]
+
+
+def contexto_trabajadores(items, request=None):
+    """
+    Resuelve en una sola consulta los trabajadores referenciados por
+    ``trabajador`` o ``trabajador_rut`` en un lote, para que la validación
+    de cada fila no tenga que consultarlos uno a uno.
+    """
+    ids, ruts = set(), set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if item.get("trabajador") is not None:
+            ids.add(item["trabajador"])
+        if item.get("trabajador_rut"):
+            ruts.add(item["trabajador_rut"])
+
+    ids = {i for i in ids if isinstance(i, int) or (isinstance(i, str) and i.isdigit())}
+    trabajadores = list(Trabajador.objects.filter(Q(pk__in=ids) | Q(rut__in=ruts))) if ids or ruts else []
+    return {
+        "request": request,
+        "trabajadores_por_id": {t.pk: t for t in trabajadores},
+        "trabajadores_por_rut": {t.rut: t for t in trabajadores},
+    }
+
+
+def _clave(datos, unique_key):
+    return tuple(datos[campo] for campo in unique_key)
+
+
+def duplicados(model, unique_key, filas, excluir=()):
+    """
+    Índices de ``filas`` cuya clave ya existe en la tabla o se repite dentro
+    del lote. Usa una sola consulta ``IN`` por columna de la clave; las
+    filas con id en ``excluir`` (las que el lote actualiza) no cuentan como
+    existentes.
+    """
+    claves = [_clave(datos, unique_key) for datos in filas]
+    filtros = {f"{campo}__in": {c[i] for c in claves} for i, campo in enumerate(unique_key)}
+    existentes = set(model.objects.filter(**filtros).exclude(pk__in=excluir).values_list(*unique_key))
+
+    repetidos, vistos = [], set()
+    for i, clave in enumerate(claves):
+        if clave in existentes or clave in vistos:
+            repetidos.append(i)
+        vistos.add(clave)
+    return repetidos
+
+
+def _releer(model, objs, unique_key):
+    """Las filas de la tabla con la clave de cada uno de ``objs``, en el mismo orden."""
+    claves = [_clave(obj.__dict__, unique_key) for obj in objs]
+    filtros = {f"{campo}__in": {c[i] for c in claves} for i, campo in enumerate(unique_key)}
+    guardados = {_clave(obj.__dict__, unique_key): obj for obj in model.objects.filter(**filtros)}
+    return [guardados[clave] for clave in claves if clave in guardados]
+
+
+def insertar(model, objs, unique_key=()):
+    """
+    ``bulk_create`` de ``objs``. Devuelve las filas creadas con su ``id``:
+    si la base no lo entrega (MySQL no tiene ``RETURNING``) se releen por
+    ``unique_key``.
+    """
+    creados = model.objects.bulk_create(objs, batch_size=_batch_size())
+    if not creados or creados[0].pk is not None or not unique_key:
+        return creados
+    return _releer(model, creados, unique_key)
+
+
+def guardar_upsert(model, objs, unique_key, campos=None, releer=True):
+    """
+    Inserta ``objs`` y, si la clave ``unique_key`` ya existe, actualiza la
+    fila existente (``ON CONFLICT DO UPDATE`` / ``ON DUPLICATE KEY UPDATE``);
+    con ``campos`` sólo esas columnas, si no todas.
+
+    Dentro del lote gana la última fila de cada clave. Devuelve las filas
+    resultantes, con su ``id``, en el orden de la primera aparición de cada
+    clave; con ``releer=False`` no las vuelve a leer y devuelve ``objs``
+    (sin ``id`` garantizado), en una sola sentencia por bloque.
+    """
+    por_clave = {}
+    for obj in objs:
+        por_clave[_clave(obj.__dict__, unique_key)] = obj
+    objs = list(por_clave.values())
+
+    update_fields = list(campos) if campos is not None else [
+        f.name for f in model._meta.concrete_fields
+        if not f.primary_key and f.name not in unique_key
+    ]
+    # MySQL no permite indicar la restricción: usa cualquier clave única.
+    unique_fields = list(unique_key) if connection.features.supports_update_conflicts_with_target else None
+
+    opciones = {
+        "batch_size": _batch_size(),
+        "update_conflicts": True,
+        "unique_fields": unique_fields,
+        "update_fields": update_fields,
+    }
+    if not releer:
+        model.objects.bulk_create(objs, **opciones)
+        return objs
+    # Sin savepoint propio: los llamadores ya abren la transacción del lote
+    with transaction.atomic(savepoint=False):
+        model.objects.bulk_create(objs, **opciones)
+        return _releer(model, objs, unique_key)
+
+
+def _respuesta_duplicados(unique_key, repetidos, sugerencia=""):
+    mensaje = f"Ya existe un registro con los mismos {', '.join(unique_key)}.{sugerencia}"
+    return Response(
+        {"errores": [{"indice": i, "errores": {"non_field_errors": [mensaje]}} for i in repetidos]},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def clave_upsert(serializer_class):
+    """``unique_key`` del serializer, o 400 si el recurso no admite upsert."""
+    unique_key = getattr(serializer_class, "unique_key", ())
+    if not unique_key:
+        raise ValidationError({"upsert": "Este recurso no admite upsert."})
+    return unique_key
+
+
+def upsert_uno(request, serializer_class):
+    unique_key = clave_upsert(serializer_class)
+    serializer = serializer_class(
+        data=request.data,
+        context={"request": request, "verificar_unicidad": False},
+    )
+    serializer.is_valid(raise_exception=True)
+
+    model = serializer_class.Meta.model
+    with transaction.atomic():
+        guardados = guardar_upsert(model, [model(**serializer.validated_data)], unique_key)
+        registros_en_lote.send(sender=model, instancias=guardados)
+    return Response(serializer_class(guardados[0]).data)
+
+
+def crear_en_lote(request, serializer_class, upsert=False):
+    items = _items(request.data)
+    unique_key = clave_upsert(serializer_class) if upsert else getattr(serializer_class, "unique_key", ())
+
+    contexto = contexto_trabajadores(items, request)
+    contexto["verificar_unicidad"] = False
+    serializer = serializer_class(data=items, many=True, context=contexto)
+    if not serializer.is_valid():
+        return Response({"errores": _errores(serializer.errors)}, status=status.HTTP_400_BAD_REQUEST)
+
+    model = serializer_class.Meta.model
+    objs = [model(**datos) for datos in serializer.validated_data]
+
+    if upsert:
+        with transaction.atomic():
+            guardados = guardar_upsert(model, objs, unique_key)
+            registros_en_lote.send(sender=model, instancias=guardados)
+        return Response({
+            "guardados": len(guardados),
+            "resultados": serializer_class(guardados, many=True).data,
+        })
+
+    if unique_key:
+        repetidos = duplicados(model, unique_key, serializer.validated_data)
+        if repetidos:
+            return _respuesta_duplicados(unique_key, repetidos, " Use ?upsert=1 para actualizarlo.")
+
+    try:
+        with transaction.atomic():
+            creados = insertar(model, objs, unique_key)
+            registros_en_lote.send(sender=model, instancias=creados)
+    except IntegrityError:
+        return Response(
+            {"detail": "El lote entra en conflicto con registros existentes."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    return Response({
+        "creados": len(creados),
+        "resultados": serializer_class(creados, many=True).data,
+    }, status=status.HTTP_201_CREATED)
+
+
+def actualizar_en_lote(request, serializer_class, partial=False):
+    items = _items(request.data)
+    model = serializer_class.Meta.model
+
+    ids = []
+    for i, item in enumerate(items):
+        pk = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(pk, int):
+            return Response(
+                {"errores": [{"indice": i, "errores": {"id": ["Se requiere el id del registro."]}}]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        ids.append(pk)
+
+    instancias = model.objects.in_bulk(ids)
+    unique_key = getattr(serializer_class, "unique_key", ())
+    contexto = contexto_trabajadores(items, request)
+    # La unicidad se revisa para todo el lote después, no fila a fila
+    contexto["verificar_unicidad"] = False
+
+    errores, objs, campos = [], [], set()
+    for i, (pk, item) in enumerate(zip(ids, items)):
+        instancia = instancias.get(pk)
+        if instancia is None:
+            errores.append({"indice": i, "errores": {"id": ["Registro no encontrado."]}})
+            continue
+        serializer = serializer_class(instancia, data=item, partial=partial, context=contexto)
+        if not serializer.is_valid():
+            errores.append({"indice": i, "errores": serializer.errors})
+            continue
+        for campo, valor in serializer.validated_data.items():
+            setattr(instancia, campo, valor)
+            campos.add(campo)
+        objs.append(instancia)
+
+    if errores:
+        return Response({"errores": errores}, status=status.HTTP_400_BAD_REQUEST)
+
+    if unique_key and campos.intersection(unique_key):
+        repetidos = duplicados(model, unique_key, [obj.__dict__ for obj in objs], excluir=ids)
+        if repetidos:
+            return _respuesta_duplicados(unique_key, repetidos)
+
+    if campos:
+        # bulk_update no pasa por pre_save: auto_now se asigna a mano
+        ahora = timezone.now()
+        for obj in objs:
+            obj.updated_at = ahora
+        campos.add("updated_at")
+        with transaction.atomic():
+            model.objects.bulk_update(objs, sorted(campos), batch_size=_batch_size())
+            registros_en_lote.send(sender=model, instancias=objs)
+
+    return Response({
+        "actualizados": len(objs),
+        "resultados": serializer_class(objs, many=True).data,
+    })
+
+
+def eliminar_en_lote(request, model):
+    data = request.data
+    ids = data.get("ids") if isinstance(data, dict) else data
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+        raise ValidationError({"ids": "Se esperaba un arreglo de ids."})
+    if len(ids) > _lote_maximo():
+        raise ValidationError({"ids": f"Máximo {_lote_maximo()} registros por lote."})
+
+    with transaction.atomic(), resumen.agrupar(), cambios.agrupar():
+        eliminados, _ = model.objects.filter(pk__in=ids).delete()
+
+    return Response({"eliminados": eliminados})
+
+
+def procesar_lote(request, serializer_class):
+    """
+    Despacha un endpoint ``/bulk/``:
+
+    - POST: crea un arreglo de registros con ``bulk_create``; con
+      ``?upsert=1`` actualiza los que ya existen según ``unique_key``.
+    - PUT / PATCH: actualiza un arreglo de registros (cada uno con ``id``) con ``bulk_update``.
+    - DELETE: elimina ``{"ids": [...]}`` en una sola sentencia.
+
+    Todo el lote se valida antes de escribir y se guarda en una única
+    transacción: si alguna fila es inválida no se escribe nada y se
+    responde 400 con los errores por índice.
+    """
+    if request.method == "POST":
+        return crear_en_lote(request, serializer_class, upsert=bool(request.query_params.get("upsert")))
+    if request.method in ("PUT", "PATCH"):
+        return actualizar_en_lote(request, serializer_class, partial=request.method == "PATCH")
+    return eliminar_en_lote(request, serializer_class.Meta.model)
@@ -0,0 +1,106 @@
+# core/cache.py
+"""
+Caché de respuestas de los listados con invalidación por versión.
+
+Cada modelo tiene un contador de versión en la caché; la clave de una
+respuesta incluye la versión vigente, así que al escribir en el modelo
+basta con cambiar la versión (``invalidar``) para que todas sus
+respuestas anteriores dejen de usarse y expiren solas.
+
+La versión vive en la caché: con una caché en memoria de cada proceso
+(``LocMemCache``) una escritura sólo invalidaría las respuestas del worker
+que la atendió, así que con varios workers la caché de listados se usa
+únicamente si la caché es compartida (Redis).
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+_lock = threading.Lock()
+_metricas = {"hits": 0, "misses": 0, "invalidaciones": 0}
+
+
+def _cache():
+    return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+
+# Backends que guardan los datos en la memoria de cada proceso
+_LOCALES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def compartida():
+    """
+    Si todos los workers ven la misma caché: un backend compartido (Redis,
+    Memcached, base de datos) o un solo proceso (``API_WEB_WORKERS=1``).
+    """
+    alias = getattr(settings, "API_CACHE_ALIAS", "default")
+    if settings.CACHES[alias]["BACKEND"] not in _LOCALES:
+        return True
+    return getattr(settings, "API_WEB_WORKERS", 1) <= 1
+
+
+def habilitada():
+    return getattr(settings, "API_CACHE_LISTADOS", True) and compartida()
+
+
+def _contar(nombre):
+    with _lock:
+        _metricas[nombre] += 1
+
+
+def metricas():
+    """Contadores de este proceso: ``hits``, ``misses`` e ``invalidaciones``."""
+    with _lock:
+        return dict(_metricas)
+
+
+def _clave_version(model):
+    return f"api:version:{model._meta.label_lower}"
+
+
+def version(model):
+    """
+    Versión vigente del modelo. Si la clave no existe (o fue desalojada) se
+    inicia con un valor basado en la hora, nunca con uno ya usado.
+    """
+    cache = _cache()
+    clave = _clave_version(model)
+    actual = cache.get(clave)
+    if actual is None:
+        cache.add(clave, time.time_ns(), timeout=None)
+        actual = cache.get(clave)
+    return actual
+
+
+def invalidar(model):
+    cache = _cache()
+    clave = _clave_version(model)
+    try:
+        cache.incr(clave)
+    except ValueError:
+        cache.set(clave, time.time_ns(), timeout=None)
+    _contar("invalidaciones")
+
+
+def clave_respuesta(request, model):
+    params = sorted(request.query_params.lists())
+    firma = hashlib.md5(
+        f"{request.get_host()}{request.path}?{params}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"api:resp:{model._meta.label_lower}:{version(model)}:{firma}"
+
+
+def obtener(clave):
+    entrada = _cache().get(clave)
+    _contar("hits" if entrada is not None else "misses")
+    return entrada
+
+
+def guardar(clave, entrada):
+    _cache().set(clave, entrada, timeout=getattr(settings, "API_CACHE_TIMEOUT", 300))
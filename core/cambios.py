@@ -0,0 +1,204 @@
+# core/cambios.py
+"""
+Registro de cambios para la sincronización incremental (``/api/changes/``).
+
+Cada alta, modificación o eliminación de los modelos de la API agrega una
+fila a ``Cambio`` al confirmar la transacción; las eliminaciones quedan como
+marcas ``eliminado``. ``Cambio.id`` es el cursor: el cliente pide
+``?since=<cursor>`` y recibe el estado actual de los registros que
+cambiaron después, en páginas acotadas, así sincroniza en proporción a lo
+que cambió y no al tamaño de las tablas.
+
+Las filas se escriben dentro de la misma transacción que los datos, así
+un cambio confirmado siempre queda registrado (si el proceso muere después
+del COMMIT no se pierde). Dentro de ``agrupar()`` (lotes, importaciones,
+nómina) se escriben en un solo INSERT al final del bloque, justo antes del
+COMMIT, para que los ids no queden reservados durante toda la
+transacción. ``API_CHANGES_LAG_SECONDS`` sólo debe cubrir el margen entre
+ese INSERT y el COMMIT de escrituras concurrentes. Cada lote confirmado se
+publica también como eventos en vivo (``core/eventos.py``).
+"""
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+
+from . import eventos, fastpath
+from .models import (
+    Trabajador, Asistencia, Accidente,
+    EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador, Cambio
+)
+from .serializers import (
+    TrabajadorSerializer, AsistenciaSerializer, AccidenteSerializer,
+    EficienciaTrabajadorSerializer, DesempenoTrabajadorSerializer, SueldoTrabajadorSerializer
+)
+
+RECURSOS = {
+    "trabajadores": (Trabajador, TrabajadorSerializer),
+    "asistencias": (Asistencia, AsistenciaSerializer),
+    "accidentes": (Accidente, AccidenteSerializer),
+    "eficiencias": (EficienciaTrabajador, EficienciaTrabajadorSerializer),
+    "desempenos": (DesempenoTrabajador, DesempenoTrabajadorSerializer),
+    "sueldos": (SueldoTrabajador, SueldoTrabajadorSerializer),
+}
+RECURSO_DE = {model: nombre for nombre, (model, _serializer) in RECURSOS.items()}
+
+_local = threading.local()
+
+
+def _page_size():
+    return getattr(settings, "API_CHANGES_PAGE_SIZE", 500)
+
+
+def _retraso():
+    return timedelta(seconds=getattr(settings, "API_CHANGES_LAG_SECONDS", 2))
+
+
+# ---------------------- registro ---------------------- #
+def _guardar(filas):
+    momento = timezone.now()
+    creados = Cambio.objects.bulk_create(
+        [Cambio(recurso=recurso, objeto_id=pk, operacion=operacion, momento=momento) for recurso, pk, operacion in filas],
+        batch_size=getattr(settings, "API_BULK_BATCH_SIZE", 500),
+    )
+    # El id (cursor) sólo llega con bases que devuelven las filas insertadas
+    publicados = [(c.id, c.recurso, c.objeto_id, c.operacion) for c in creados]
+    transaction.on_commit(partial(eventos.publicar, publicados))
+
+
+def marcar(model, pks, operacion):
+    """
+    Registra ``operacion`` sobre ``pks`` en la transacción actual. Dentro
+    de ``agrupar()`` los cambios se acumulan y se escriben juntos al final.
+    """
+    recurso = RECURSO_DE.get(model)
+    filas = [(recurso, pk, operacion) for pk in pks if pk is not None]
+    if recurso is None or not filas:
+        return
+    lote = getattr(_local, "lote", None)
+    if lote is not None:
+        lote.extend(filas)
+    else:
+        _guardar(filas)
+
+
+@contextmanager
+def agrupar():
+    """
+    Acumula los cambios marcados en el bloque y los escribe en un solo
+    INSERT al salir. Debe usarse dentro de la transacción de los datos
+    (``with transaction.atomic(), cambios.agrupar():``); si el bloque
+    falla no se escribe nada.
+    """
+    if getattr(_local, "lote", None) is not None:
+        yield
+        return
+    _local.lote = []
+    try:
+        yield
+    except BaseException:
+        _local.lote = None
+        raise
+    filas, _local.lote = _local.lote, None
+    if filas:
+        _guardar(filas)
+
+
+def purgar(dias):
+    """Elimina los cambios con más de ``dias`` de antigüedad. Devuelve cuántos."""
+    eliminados, _ = Cambio.objects.filter(momento__lt=timezone.now() - timedelta(days=dias)).delete()
+    return eliminados
+
+
+# ---------------------- consulta ---------------------- #
+def _entero(params, nombre, minimo=0):
+    try:
+        valor = int(params.get(nombre))
+    except (TypeError, ValueError):
+        raise ValidationError({nombre: "Debe ser un número entero."})
+    if valor < minimo:
+        raise ValidationError({nombre: f"Debe ser mayor o igual a {minimo}."})
+    return valor
+
+
+def _recursos(params):
+    nombres = [r.strip() for r in params.get("recursos", "").split(",") if r.strip()]
+    invalidos = [r for r in nombres if r not in RECURSOS]
+    if invalidos:
+        raise ValidationError({"recursos": f"Use uno o más de: {', '.join(RECURSOS)}."})
+    return nombres
+
+
+def _cargar(recurso, pks):
+    """Estado actual de ``pks`` serializado, por id."""
+    model, serializer_class = RECURSOS[recurso]
+    queryset = model.objects.filter(pk__in=pks)
+    if fastpath.habilitada(serializer_class):
+        valores, convertir = fastpath.valores(queryset, serializer_class)
+        filas = convertir(list(valores))
+    else:
+        filas = serializer_class(queryset, many=True).data
+    return {fila["id"]: fila for fila in filas}
+
+
+def consultar(params):
+    """
+    Página de cambios posteriores a ``?since=``. Sin ``since`` devuelve sólo
+    el cursor actual, para tomarlo antes de una descarga completa.
+
+    Varias operaciones sobre un mismo registro dentro de la página se
+    entregan una vez, con su estado actual. Si ``since`` es anterior a los
+    cambios conservados (ver ``purgar``) responde ``{"reiniciar": true}``.
+    """
+    recursos = _recursos(params)
+    visibles = Cambio.objects.filter(momento__lte=timezone.now() - _retraso())
+    hasta = visibles.order_by("-id").values_list("id", flat=True).first() or 0
+
+    if params.get("since") in (None, ""):
+        return {"cursor": str(hasta), "mas": False, "cambios": []}
+    since = _entero(params, "since")
+    limite = min(
+        _entero(params, "page_size", minimo=1) if params.get("page_size") else _page_size(),
+        getattr(settings, "API_MAX_PAGE_SIZE", 1000),
+    )
+
+    primero = Cambio.objects.order_by("id").values_list("id", flat=True).first()
+    if primero is not None and since < primero - 1:
+        return {"reiniciar": True, "cursor": str(hasta), "mas": False, "cambios": []}
+
+    queryset = Cambio.objects.filter(id__gt=since, id__lte=hasta)
+    if recursos:
+        queryset = queryset.filter(recurso__in=recursos)
+    filas = list(queryset.order_by("id").values_list("id", "recurso", "objeto_id", "operacion")[:limite + 1])
+    mas = len(filas) > limite
+    filas = filas[:limite]
+
+    # Última operación de cada registro, en el orden de su último cambio
+    ultimas = {}
+    for _id, recurso, objeto_id, operacion in filas:
+        ultimas.pop((recurso, objeto_id), None)
+        ultimas[(recurso, objeto_id)] = operacion
+
+    guardados = {}
+    for (recurso, objeto_id), operacion in ultimas.items():
+        if operacion == Cambio.GUARDADO:
+            guardados.setdefault(recurso, []).append(objeto_id)
+    datos = {recurso: _cargar(recurso, pks) for recurso, pks in guardados.items()}
+
+    cambios = []
+    for (recurso, objeto_id), operacion in ultimas.items():
+        fila = datos.get(recurso, {}).get(objeto_id)
+        if fila is None:
+            # Eliminado, o guardado y eliminado después de esta página
+            cambios.append({"recurso": recurso, "id": objeto_id, "operacion": Cambio.ELIMINADO})
+        else:
+            cambios.append({"recurso": recurso, "id": objeto_id, "operacion": Cambio.GUARDADO, "datos": fila})
+
+    cursor = filas[-1][0] if mas else max(since, hasta)
+    return {"cursor": str(cursor), "mas": mas, "cambios": cambios}
@@ -0,0 +1,64 @@
+# core/condicional.py
+"""
+GET condicional (``ETag`` / ``Last-Modified``) para listados y detalles.
+
+Los validadores se calculan con ``MAX(updated_at)`` y ``COUNT(*)`` del
+queryset filtrado (una consulta sobre índices), sin serializar el cuerpo.
+El conteo hace que un ``DELETE`` también cambie el ETag; ``Last-Modified``
+sólo refleja la última creación o modificación, por eso los clientes
+deberían preferir ``If-None-Match``.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def _etag(*partes):
+    digest = hashlib.md5(":".join(str(p) for p in partes).encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def _agregados():
+    return {"ultimo": Max("updated_at"), "total": Count("pk")}
+
+
+def _validadores(request, model, datos):
+    ultimo = datos["ultimo"]
+    etag = _etag(
+        model._meta.label,
+        ultimo.isoformat() if ultimo else "",
+        datos["total"],
+        request.get_full_path(),
+    )
+    return etag, int(ultimo.timestamp()) if ultimo else None
+
+
+def validadores_listado(request, queryset):
+    """``(etag, timestamp)`` del queryset filtrado para la URL pedida."""
+    datos = queryset.order_by().aggregate(**_agregados())
+    return _validadores(request, queryset.model, datos)
+
+
+async def avalidadores_listado(request, queryset):
+    datos = await queryset.order_by().aaggregate(**_agregados())
+    return _validadores(request, queryset.model, datos)
+
+
+def validadores_objeto(request, obj):
+    """``(etag, timestamp)`` de un registro a partir de su ``updated_at``."""
+    etag = _etag(obj._meta.label, obj.pk, obj.updated_at.isoformat(), request.get_full_path())
+    return etag, int(obj.updated_at.timestamp())
+
+
+def no_modificado(request, etag, timestamp):
+    """Respuesta 304 (o 412) si el cliente ya tiene la versión vigente."""
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def agregar_validadores(response, etag, timestamp):
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    return response
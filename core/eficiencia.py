@@ -0,0 +1,251 @@
+# core/eficiencia.py
+"""
+Puntaje de eficiencia de todos los trabajadores en un mes.
+
+Las métricas por trabajador se leen en una sola consulta sobre los
+trabajadores con asistencias en el mes, con subconsultas correlacionadas
+para los totales de asistencia, los trabajos (el último
+``EficienciaTrabajador``), el sueldo del mes y los accidentes.
+Los indicadores, percentiles y el ranking se calculan sobre arreglos de
+numpy para toda la dotación a la vez.
+
+Indicadores:
+
+- ``horas_trabajadas``: suma de ``hora_salida - hora_entrada`` (un turno
+  que termina al día siguiente suma 24 h);
+- ``trabajos_por_hora``: ``trabajos_completados_en_1_mes`` / horas;
+- ``costo_por_trabajo``: sueldo del mes (``SueldoTrabajador`` o, si no hay,
+  ``sueldo_promedio_informado``) / trabajos;
+- ``tasa_asistencia``: días PRESENTE / días registrados;
+- ``atraso_por_dia``: minutos de atraso / días PRESENTE;
+- ``accidentes``: accidentes del mes con el RUT en ``trabajadores_involucrados``.
+
+Cada indicador se convierte en su percentil dentro de la dotación (invertido
+si menos es mejor) y el ``puntaje`` es el promedio ponderado con
+``API_EFFICIENCY_WEIGHTS``, de 0 a 100.
+"""
+from django.conf import settings
+from django.db.models import (
+    DurationField, ExpressionWrapper, F, Func, OuterRef, Subquery, TextField, Value,
+)
+from django.db.models.functions import Coalesce, Concat, Replace
+
+from . import resumen
+from .models import Accidente, Asistencia, EficienciaTrabajador, SueldoTrabajador, Trabajador
+from .nomina import requerir_numpy, validar_mes
+from .stats import PERCENTILES, entero
+
+# Indicador -> True si un valor mayor es mejor
+INDICADORES = {
+    "trabajos_por_hora": True,
+    "costo_por_trabajo": False,
+    "tasa_asistencia": True,
+    "atraso_por_dia": False,
+    "accidentes": False,
+}
+PESOS = {
+    "trabajos_por_hora": 0.35,
+    "costo_por_trabajo": 0.25,
+    "tasa_asistencia": 0.2,
+    "atraso_por_dia": 0.1,
+    "accidentes": 0.1,
+}
+COLUMNAS = (
+    "trabajador_rut", "trabajador_nombre", "area", "dias", "presentes", "minutos_atraso",
+    "duracion", "nocturnos", "trabajos", "sueldo", "accidentes",
+)
+
+
+# ---------------------- datos ---------------------- #
+def _total(queryset, expresion):
+    """Subconsulta escalar con un agregado de ``queryset``."""
+    return Subquery(queryset.annotate(total=expresion).values("total"))
+
+
+def _metricas(mes, area=None):
+    """
+    Una fila por trabajador con asistencias en ``mes``, en una consulta. Se
+    parte de ``Trabajador`` para que cada subconsulta se evalúe una vez por
+    trabajador (con el índice por RUT y fecha) y no una vez por asistencia.
+    """
+    inicio, fin = resumen.rango_mes(mes)
+    rut = OuterRef("rut")
+
+    del_mes = Asistencia.objects.filter(trabajador_rut=rut, fecha__range=(inicio, fin)).order_by()
+    ultima_eficiencia = EficienciaTrabajador.objects.filter(trabajador_rut=rut).order_by("-id")
+    sueldo_mes = SueldoTrabajador.objects.filter(trabajador_rut=rut, mes=mes).order_by("-id")
+    # trabajadores_involucrados es una lista separada por comas: se compara
+    # ",rut," contra ",lista," sin espacios para no confundir RUTs parecidos
+    accidentes = (
+        Accidente.objects.filter(fecha__range=(inicio, fin))
+        .annotate(lista=Concat(
+            Value(","), Replace(F("trabajadores_involucrados"), Value(" "), Value("")), Value(","),
+            output_field=TextField(),
+        ))
+        .filter(lista__contains=Concat(Value(","), rut, Value(",")))
+        .order_by()
+    )
+    duracion = ExpressionWrapper(F("hora_salida") - F("hora_entrada"), output_field=DurationField())
+    contar = Func(F("id"), function="COUNT")
+
+    trabajadores = Trabajador.objects.filter(
+        rut__in=Asistencia.objects.filter(fecha__range=(inicio, fin)).values("trabajador_rut"),
+    )
+    if area:
+        trabajadores = trabajadores.filter(area=area)
+    return list(
+        trabajadores
+        .annotate(
+            trabajador_rut=F("rut"),
+            trabajador_nombre=Concat("nombre", Value(" "), "apellido"),
+            dias=_total(del_mes, contar),
+            presentes=_total(del_mes.filter(estado="PRESENTE"), contar),
+            minutos_atraso=_total(del_mes, Func(F("minutos_atraso"), function="SUM")),
+            duracion=_total(del_mes, Func(duracion, function="SUM", output_field=DurationField())),
+            nocturnos=_total(del_mes.filter(hora_salida__lt=F("hora_entrada")), contar),
+            trabajos=Subquery(ultima_eficiencia.values("trabajos_completados_en_1_mes")[:1]),
+            sueldo=Coalesce(
+                Subquery(sueldo_mes.values("sueldo_total_mes")[:1]),
+                Subquery(ultima_eficiencia.values("sueldo_promedio_informado")[:1]),
+                output_field=SueldoTrabajador._meta.get_field("sueldo_total_mes"),
+            ),
+            accidentes=Coalesce(_total(accidentes, contar), 0),
+        )
+        .order_by("rut")
+        .values_list(*COLUMNAS)
+    )
+
+
+# ---------------------- cálculo ---------------------- #
+def _dividir(np, a, b):
+    """``a / b`` con ``nan`` donde ``b`` es 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(b > 0, a / np.where(b > 0, b, 1), np.nan)
+
+
+def _percentil(np, valores):
+    """Percentil de cada valor dentro del arreglo (empates al promedio); ``nan`` se ignora."""
+    validos = ~np.isnan(valores)
+    ordenados = np.sort(valores[validos])
+    n = len(ordenados)
+    resultado = np.full(len(valores), np.nan)
+    if n:
+        menores = np.searchsorted(ordenados, valores[validos], side="left")
+        hasta = np.searchsorted(ordenados, valores[validos], side="right")
+        resultado[validos] = (menores + hasta) / 2 / n * 100
+    return resultado
+
+
+def calcular(mes, area=None):
+    """
+    Indicadores, percentiles y ranking de ``mes``. Devuelve
+    ``(filas, columnas)``: las filas de ``_metricas`` y un dict de arreglos
+    alineados con ellas.
+    """
+    np = requerir_numpy()
+    validar_mes(mes)
+    filas = _metricas(mes, area)
+    n = len(filas)
+
+    def columna(i, dtype=np.float64):
+        return np.fromiter((0 if f[i] is None else f[i] for f in filas), dtype=dtype, count=n)
+
+    dias, presentes, atraso = columna(3), columna(4), columna(5)
+    segundos = np.fromiter(
+        (f[6].total_seconds() if f[6] is not None else 0 for f in filas), dtype=np.float64, count=n,
+    )
+    horas = (segundos + columna(7) * 86400) / 3600
+    trabajos = np.fromiter((np.nan if f[8] is None else f[8] for f in filas), dtype=np.float64, count=n)
+    sueldo = columna(9)
+    accidentes = columna(10)
+
+    indicadores = {
+        "trabajos_por_hora": _dividir(np, trabajos, horas),
+        "costo_por_trabajo": _dividir(np, sueldo, trabajos),
+        "tasa_asistencia": _dividir(np, presentes, dias),
+        "atraso_por_dia": _dividir(np, atraso, presentes),
+        "accidentes": accidentes,
+    }
+
+    pesos = dict(PESOS, **getattr(settings, "API_EFFICIENCY_WEIGHTS", {}))
+    suma = np.zeros(n)
+    peso_total = np.zeros(n)
+    for nombre, mayor_es_mejor in INDICADORES.items():
+        percentil = _percentil(np, indicadores[nombre])
+        if not mayor_es_mejor:
+            percentil = 100 - percentil
+        # Un indicador sin dato (p. ej. sin trabajos informados) no cuenta
+        presente = ~np.isnan(percentil)
+        suma += np.where(presente, percentil, 0) * pesos.get(nombre, 0)
+        peso_total += presente * pesos.get(nombre, 0)
+    puntaje = _dividir(np, suma, peso_total)
+
+    # Ranking 1..n por puntaje (sin puntaje al final); empate por RUT, ya ordenado
+    orden = np.lexsort((np.arange(n), np.nan_to_num(-puntaje, nan=np.inf)))
+    ranking = np.empty(n, dtype=np.int64)
+    ranking[orden] = np.arange(1, n + 1)
+
+    return filas, {
+        "horas_trabajadas": horas,
+        "trabajos": trabajos,
+        "sueldo": sueldo,
+        **indicadores,
+        "puntaje": puntaje,
+        "percentil": _percentil(np, puntaje),
+        "ranking": ranking,
+    }
+
+
+# ---------------------- consulta ---------------------- #
+def _numero(valor, decimales=4):
+    return None if valor != valor else round(float(valor), decimales)
+
+
+def consultar(params):
+    """
+    Ranking de ``?mes=AAAA-MM`` (por defecto el de la última asistencia),
+    opcionalmente dentro de ``?area=``. Devuelve los percentiles de cada
+    indicador en la dotación y los primeros ``?limite=`` trabajadores, o
+    sólo ``?trabajador_rut=``.
+    """
+    mes = params.get("mes")
+    if not mes:
+        ultima = Asistencia.objects.order_by("-fecha").values_list("fecha", flat=True).first()
+        mes = resumen.mes_de(ultima) if ultima else None
+    if mes is None:
+        return {"mes": None, "trabajadores": 0, "percentiles": {}, "results": []}
+    limite = entero(params, "limite", 50, 1000)
+
+    np = requerir_numpy()
+    filas, columnas = calcular(mes, params.get("area") or None)
+
+    percentiles = {}
+    for nombre in ("horas_trabajadas", *INDICADORES, "puntaje"):
+        valores = columnas[nombre][~np.isnan(columnas[nombre])]
+        percentiles[nombre] = {
+            str(p): (_numero(np.percentile(valores, p)) if len(valores) else None) for p in PERCENTILES
+        }
+
+    if params.get("trabajador_rut"):
+        indices = [i for i, fila in enumerate(filas) if fila[0] == params["trabajador_rut"]]
+    else:
+        indices = np.argsort(columnas["ranking"])[:limite].tolist()
+
+    resultados = []
+    for i in indices:
+        fila = filas[i]
+        resultados.append({
+            "trabajador_rut": fila[0],
+            "trabajador_nombre": fila[1],
+            "area": fila[2],
+            "ranking": int(columnas["ranking"][i]),
+            "puntaje": _numero(columnas["puntaje"][i], 2),
+            "percentil": _numero(columnas["percentil"][i], 2),
+            "dias_registrados": fila[3],
+            "horas_trabajadas": _numero(columnas["horas_trabajadas"][i], 2),
+            "trabajos": _numero(columnas["trabajos"][i], 0),
+            "minutos_atraso": fila[5] or 0,
+            **{nombre: _numero(columnas[nombre][i]) for nombre in INDICADORES},
+        })
+
+    return {"mes": mes, "trabajadores": len(filas), "percentiles": percentiles, "results": resultados}
@@ -0,0 +1,176 @@
+# core/eventos.py
+"""
+Eventos en vivo de altas, modificaciones y eliminaciones para
+``/api/events/`` (Server-Sent Events, ver ``core/views_async.py``).
+
+``core.cambios`` publica cada lote de cambios confirmado en el broker de
+``API_EVENTS_BROKER``:
+
+- ``MemoriaBroker`` reparte los eventos dentro del proceso. Sirve con un
+  solo worker, o cuando las escrituras y los clientes SSE están en el mismo
+  proceso.
+- ``RedisBroker`` publica en un canal de Redis y cada proceso mantiene una
+  sola suscripción que reparte los eventos entre sus clientes, así una
+  escritura en cualquier worker llega a todos.
+
+Un broker propio sólo necesita ``publicar(eventos)`` y el context manager
+async ``suscribir()`` que entrega una ``Suscripcion``.
+"""
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def _max_lote():
+    return getattr(settings, "API_EVENTS_MAX_BATCH", 100)
+
+
+def eventos_de(filas):
+    """
+    Eventos para ``[(cursor, recurso, id, operacion), ...]``. Si un recurso
+    cambia en más de ``API_EVENTS_MAX_BATCH`` filas (importaciones, lotes)
+    se publica un solo evento ``lote`` para que el cliente lea
+    ``/api/changes/`` en vez de recibir miles de eventos.
+    """
+    por_recurso = {}
+    for fila in filas:
+        por_recurso.setdefault(fila[1], []).append(fila)
+
+    eventos = []
+    for recurso, filas_recurso in por_recurso.items():
+        cursores = [c for c, *_ in filas_recurso if c is not None]
+        if len(filas_recurso) > _max_lote():
+            eventos.append({
+                "tipo": "lote", "recurso": recurso, "cantidad": len(filas_recurso),
+                "cursor": str(max(cursores)) if cursores else None,
+            })
+            continue
+        eventos += [
+            {"tipo": "cambio", "recurso": recurso, "id": pk, "operacion": operacion,
+             "cursor": str(cursor) if cursor is not None else None}
+            for cursor, _recurso, pk, operacion in filas_recurso
+        ]
+    return eventos
+
+
+# ---------------------- brokers ---------------------- #
+class Suscripcion:
+    """
+    Cola de eventos de un cliente. ``entregar`` puede llamarse desde
+    cualquier thread; si la cola se llena los eventos se descartan y
+    ``desbordada`` queda en ``True`` hasta que el cliente lo lea.
+    """
+
+    def __init__(self, loop, maximo):
+        self.loop = loop
+        self.cola = asyncio.Queue(maxsize=maximo)
+        self.desbordada = False
+
+    def entregar(self, eventos):
+        try:
+            self.loop.call_soon_threadsafe(self._poner, eventos)
+        except RuntimeError:  # el event loop del cliente ya terminó
+            pass
+
+    def _poner(self, eventos):
+        try:
+            self.cola.put_nowait(eventos)
+        except asyncio.QueueFull:
+            self.desbordada = True
+
+    async def recibir(self, timeout):
+        """Siguiente lista de eventos, o ``None`` si no llegó nada en ``timeout`` segundos."""
+        try:
+            return await asyncio.wait_for(self.cola.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MemoriaBroker:
+    def __init__(self):
+        self._suscripciones = set()
+        self._lock = threading.Lock()
+
+    def publicar(self, eventos):
+        with self._lock:
+            suscripciones = list(self._suscripciones)
+        for suscripcion in suscripciones:
+            suscripcion.entregar(eventos)
+
+    @asynccontextmanager
+    async def suscribir(self):
+        suscripcion = Suscripcion(asyncio.get_running_loop(), getattr(settings, "API_EVENTS_QUEUE_SIZE", 1000))
+        with self._lock:
+            self._suscripciones.add(suscripcion)
+        try:
+            yield suscripcion
+        finally:
+            with self._lock:
+                self._suscripciones.discard(suscripcion)
+
+
+class RedisBroker(MemoriaBroker):
+    """Requiere el paquete ``redis``; usa ``API_EVENTS_REDIS_URL``."""
+
+    canal = "api:eventos"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroker requiere el paquete redis (pip install redis).")
+        self.url = getattr(settings, "API_EVENTS_REDIS_URL", "redis://127.0.0.1:6379/0")
+        self._redis = redis.Redis.from_url(self.url)
+        self._tarea = None
+
+    def publicar(self, eventos):
+        self._redis.publish(self.canal, json.dumps(eventos))
+
+    @asynccontextmanager
+    async def suscribir(self):
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.get_running_loop().create_task(self._escuchar())
+        async with super().suscribir() as suscripcion:
+            yield suscripcion
+
+    async def _escuchar(self):
+        from redis import asyncio as aioredis
+
+        cliente = aioredis.from_url(self.url)
+        try:
+            async with cliente.pubsub() as pubsub:
+                await pubsub.subscribe(self.canal)
+                async for mensaje in pubsub.listen():
+                    if mensaje["type"] == "message":
+                        MemoriaBroker.publicar(self, json.loads(mensaje["data"]))
+        except Exception:
+            # La próxima suscripción vuelve a conectarse
+            logger.exception("Se perdió la suscripción a Redis de los eventos.")
+        finally:
+            await cliente.aclose()
+
+
+@lru_cache(maxsize=None)
+def broker():
+    return import_string(getattr(settings, "API_EVENTS_BROKER", "core.eventos.MemoriaBroker"))()
+
+
+def publicar(filas):
+    """Publica los cambios confirmados; un error del broker no afecta a la escritura."""
+    eventos = eventos_de(filas)
+    if not eventos:
+        return
+    try:
+        broker().publicar(eventos)
+    except Exception:
+        logger.exception("No se pudieron publicar %d eventos.", len(eventos))
@@ -0,0 +1,146 @@
+# core/fastpath.py
+"""
+Ruta rápida de lectura para los listados.
+
+En vez de instanciar modelos y recorrer los campos del ModelSerializer por
+cada fila, se piden las columnas con ``.values()`` y se convierten con una
+función generada una sola vez por (serializer, campos), que produce
+exactamente la misma salida que ``serializer.data``.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Conversiones equivalentes a ``to_representation`` de DRF para los valores
+# que entrega la base de datos (None se resuelve antes, igual que en DRF).
+_IDENTIDAD = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _iso(valor):
+    return valor.isoformat()
+
+
+def _decimal(campo):
+    quantize = campo.quantize
+
+    def convertir(valor):
+        return f"{quantize(valor):f}"
+    return convertir
+
+
+class _FechaHora:
+    """
+    ``DateTimeField`` en ISO 8601: la zona horaria se resuelve una vez por
+    lote (``zona()``) y no por fila como en ``DateTimeField.enforce_timezone``.
+    """
+
+    def __init__(self, campo):
+        self.campo = campo
+
+    def zona(self):
+        if hasattr(self.campo, "timezone"):
+            return self.campo.timezone
+        return self.campo.default_timezone()
+
+    def __call__(self, valor, zona):
+        if zona is None or isinstance(valor, str) or valor.tzinfo is None:
+            return self.campo.to_representation(valor)
+        texto = valor.astimezone(zona).isoformat()
+        return texto[:-6] + "Z" if texto.endswith("+00:00") else texto
+
+
+def _conversor(campo):
+    if isinstance(campo, _IDENTIDAD) and not isinstance(campo, serializers.ChoiceField):
+        return None
+    if isinstance(campo, serializers.DateTimeField):
+        if getattr(campo, "format", api_settings.DATETIME_FORMAT) == ISO_8601:
+            return _FechaHora(campo)
+        return campo.to_representation
+    if isinstance(campo, serializers.DateField) and getattr(campo, "format", api_settings.DATE_FORMAT) == ISO_8601:
+        return _iso
+    if isinstance(campo, serializers.TimeField) and getattr(campo, "format", api_settings.TIME_FORMAT) == ISO_8601:
+        return _iso
+    if (
+        isinstance(campo, serializers.DecimalField)
+        and getattr(campo, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        and not (campo.localize or campo.normalize_output)
+    ):
+        return _decimal(campo)
+    # Cualquier otro tipo usa el método de DRF ya resuelto (sin introspección por fila)
+    return campo.to_representation
+
+
+def soporta(serializer_class):
+    """True si todos los campos del serializer son columnas del modelo."""
+    return _plan(serializer_class, None) is not None
+
+
+def habilitada(serializer_class):
+    return getattr(settings, "API_FASTPATH_LISTADOS", True) and soporta(serializer_class)
+
+
+def valores(queryset, serializer_class, fields=None, extra=()):
+    """
+    ``(queryset.values(...), convertir)`` para ``serializer_class``.
+    ``extra`` agrega columnas necesarias fuera de la salida (p. ej. las del
+    ordering que usa el cursor).
+    """
+    columnas, convertir = compilar(serializer_class, tuple(fields) if fields is not None else None)
+    return queryset.values(*dict.fromkeys(columnas + tuple(extra))), convertir
+
+
+@lru_cache(maxsize=256)
+def _plan(serializer_class, fields):
+    model = serializer_class.Meta.model
+    concretos = {f.name for f in model._meta.concrete_fields}
+    serializer = serializer_class(fields=list(fields) if fields is not None else None)
+
+    plan = []
+    for nombre, campo in serializer.fields.items():
+        if campo.write_only:
+            continue
+        if campo.source not in concretos or campo.source_attrs != [campo.source]:
+            return None
+        plan.append((nombre, campo.source, _conversor(campo)))
+    return plan
+
+
+@lru_cache(maxsize=256)
+def compilar(serializer_class, fields=None):
+    """
+    Devuelve ``(columnas, convertir)``: las columnas a pedir con
+    ``.values()`` y la función que convierte una lista de filas (dicts) en
+    la misma lista que entregaría ``serializer.data``.
+    ``fields`` debe ser una tupla (o None) para poder cachear el resultado.
+    """
+    plan = _plan(serializer_class, fields)
+    if plan is None:
+        raise ValueError(f"{serializer_class.__name__} no es compatible con la ruta rápida.")
+
+    entorno, previas, partes = {}, [], []
+    for i, (nombre, columna, conversor) in enumerate(plan):
+        valor = f"r[{columna!r}]"
+        if isinstance(conversor, _FechaHora):
+            entorno[f"c{i}"] = conversor
+            previas.append(f"    z{i} = c{i}.zona()\n")
+            valor = f"(None if {valor} is None else c{i}({valor}, z{i}))"
+        elif conversor is not None:
+            entorno[f"c{i}"] = conversor
+            valor = f"(None if {valor} is None else c{i}({valor}))"
+        partes.append(f"{nombre!r}: {valor}")
+
+    codigo = (
+        "def convertir(filas):\n"
+        + "".join(previas)
+        + "    return [{" + ", ".join(partes) + "} for r in filas]\n"
+    )
+    exec(codigo, entorno)
+    columnas = tuple(dict.fromkeys(columna for _nombre, columna, _c in plan))
+    return columnas, entorno["convertir"]
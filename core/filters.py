@@ -0,0 +1,141 @@
+# core/filters.py
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from rest_framework.exceptions import ValidationError
+
+from .models import (
+    Trabajador, Asistencia, Accidente,
+    EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador, Trabajo
+)
+
+EXACTO = ("exact", "in")
+RANGO = ("exact", "in", "gte", "lte", "gt", "lt")
+
+# Campos filtrables por modelo y los lookups permitidos para cada uno:
+# ?estado=ACTIVO, ?fecha__gte=2025-01-01, ?gravedad__in=GRAVE,FATAL
+FILTROS = {
+    Trabajador: {
+        "rut": EXACTO,
+        "estado": EXACTO,
+        "area": EXACTO,
+        "turno": EXACTO,
+        "tipo_contrato": EXACTO,
+        "rol_cargo": EXACTO,
+        "fecha_ingreso": RANGO,
+    },
+    Asistencia: {
+        "trabajador": EXACTO,
+        "trabajador_rut": EXACTO,
+        "fecha": RANGO,
+        "estado": EXACTO,
+        "minutos_atraso": RANGO,
+    },
+    Accidente: {
+        "fecha": RANGO,
+        "gravedad": EXACTO,
+        "tipo": EXACTO,
+        "requiere_licencia": ("exact",),
+    },
+    EficienciaTrabajador: {
+        "trabajador": EXACTO,
+        "trabajador_rut": EXACTO,
+        "id_eficiencia": EXACTO,
+    },
+    DesempenoTrabajador: {
+        "trabajador": EXACTO,
+        "trabajador_rut": EXACTO,
+        "id_desempeno": EXACTO,
+    },
+    SueldoTrabajador: {
+        "trabajador": EXACTO,
+        "trabajador_rut": EXACTO,
+        "mes": RANGO,
+    },
+    Trabajo: {
+        "tarea": EXACTO,
+        "estado": EXACTO,
+        "creado": RANGO,
+    },
+}
+
+# Campos aceptados en ?ordering=. Sólo columnas NOT NULL, porque la
+# paginación por cursor compara contra el valor de la última fila.
+ORDENAMIENTOS = {
+    Trabajador: ("id", "rut", "nombre", "apellido", "fecha_ingreso", "sueldo_base"),
+    Asistencia: ("id", "fecha", "trabajador_rut", "minutos_atraso", "horas_extras"),
+    Accidente: ("id", "fecha", "gravedad", "dias_licencia"),
+    EficienciaTrabajador: ("id", "trabajador_rut", "id_eficiencia", "trabajos_completados_en_1_mes"),
+    DesempenoTrabajador: ("id", "trabajador_rut", "id_desempeno"),
+    SueldoTrabajador: ("id", "trabajador_rut", "mes", "sueldo_total_mes"),
+}
+
+
+def filtrar(queryset, params):
+    """
+    Aplica los filtros de ``FILTROS`` presentes en ``params``.
+
+    Los parámetros que no corresponden a un campo filtrable se ignoran
+    (cursor, page_size, parámetros anti-caché de los clientes, etc.).
+    """
+    model = queryset.model
+    permitidos = FILTROS.get(model, {})
+    condiciones = {}
+
+    for param, valor in params.items():
+        campo, _, lookup = param.partition("__")
+        if campo not in permitidos:
+            continue
+        lookup = lookup or "exact"
+        if lookup not in permitidos[campo]:
+            raise ValidationError({param: f"Filtro no permitido. Use uno de: {', '.join(permitidos[campo])}."})
+
+        field = model._meta.get_field(campo)
+        try:
+            if lookup == "in":
+                valor = [field.to_python(v) for v in valor.split(",") if v]
+            else:
+                valor = field.to_python(valor)
+        except DjangoValidationError as exc:
+            raise ValidationError({param: exc.messages})
+        condiciones[f"{campo}__{lookup}"] = valor
+
+    return queryset.filter(**condiciones) if condiciones else queryset
+
+
+def ordenamiento(params, model, default):
+    """Devuelve el ordering pedido en ``?ordering=`` terminado en ``id``."""
+    pedido = params.get("ordering")
+    if not pedido:
+        return tuple(default)
+
+    permitidos = ORDENAMIENTOS.get(model, ("id",))
+    campos = [c.strip() for c in pedido.split(",") if c.strip()]
+    for campo in campos:
+        if campo.lstrip("-") not in permitidos:
+            raise ValidationError({"ordering": f"Orden no permitido. Use uno de: {', '.join(permitidos)}."})
+
+    if not any(c.lstrip("-") == "id" for c in campos):
+        campos.append("id")
+    return tuple(campos)
+
+
+def campos_solicitados(params, serializer_class):
+    """Lista de campos pedidos en ``?fields=rut,nombre`` o ``None``."""
+    pedido = params.get("fields")
+    if not pedido:
+        return None
+
+    disponibles = serializer_class().fields
+    campos = [c.strip() for c in pedido.split(",") if c.strip()]
+    invalidos = [c for c in campos if c not in disponibles]
+    if invalidos:
+        raise ValidationError({"fields": f"Campos inexistentes: {', '.join(invalidos)}."})
+    return campos
+
+
+def columnas(model, campos, ordering):
+    """Columnas a cargar con ``.only()`` para servir ``campos`` y paginar."""
+    concretos = {f.name for f in model._meta.concrete_fields}
+    necesarias = [c for c in campos if c in concretos]
+    necesarias += [c.lstrip("-") for c in ordering if c.lstrip("-") in concretos]
+    return list(dict.fromkeys(necesarias))
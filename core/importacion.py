@@ -0,0 +1,197 @@
+# core/importacion.py
+"""
+Importación de planillas CSV / XLSX de asistencias y sueldos.
+
+El archivo se lee fila a fila y se procesa en bloques de
+``API_IMPORT_CHUNK_SIZE``: cada bloque se valida con el serializer del
+recurso (resolviendo los trabajadores del bloque en una sola consulta) y se
+inserta con ``bulk_create``. Todo ocurre en una transacción: si alguna fila
+es inválida no se guarda nada y se devuelve el informe de errores por fila.
+"""
+import codecs
+import csv
+import time
+from datetime import datetime
+from itertools import chain, islice
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from rest_framework.exceptions import ValidationError
+
+from . import cambios, resumen
+from .bulk import clave_upsert, contexto_trabajadores, duplicados, guardar_upsert, insertar
+from .serializers import AsistenciaSerializer, SueldoTrabajadorSerializer
+from .signals import registros_en_lote
+
+RECURSOS = {
+    "asistencias": AsistenciaSerializer,
+    "sueldos": SueldoTrabajadorSerializer,
+}
+FORMATOS = (".csv", ".xlsx")
+SEPARADORES = (",", ";", "\t")
+
+
+def _chunk_size():
+    return getattr(settings, "API_IMPORT_CHUNK_SIZE", 2000)
+
+
+def _max_errores():
+    return getattr(settings, "API_IMPORT_MAX_ERRORS", 1000)
+
+
+def _columna(nombre):
+    return str(nombre or "").strip().lower().replace(" ", "_")
+
+
+def _fila(columnas, valores):
+    # Las celdas vacías se omiten para que el serializer use los valores por defecto
+    return {c: v for c, v in zip(columnas, valores) if c and v not in ("", None)}
+
+
+# ---------------------- lectura ---------------------- #
+def filas_csv(archivo):
+    """
+    Filas de un CSV binario como diccionarios. Acepta UTF-8 (con o sin BOM)
+    y detecta el separador (``,``, ``;`` o tabulación) en el encabezado.
+    """
+    texto = codecs.iterdecode(archivo, "utf-8-sig")
+    try:
+        encabezado = next(texto, "")
+        separador = max(SEPARADORES, key=encabezado.count)
+        lector = csv.reader(chain([encabezado], texto), delimiter=separador)
+        columnas = [_columna(c) for c in next(lector, [])]
+        for valores in lector:
+            if any(valores):
+                yield _fila(columnas, (v.strip() for v in valores))
+            else:
+                yield None
+    except UnicodeDecodeError:
+        raise ValidationError({"archivo": "El CSV debe estar codificado en UTF-8."})
+
+
+def _celda(valor):
+    # Excel guarda las fechas como datetime a medianoche
+    if isinstance(valor, datetime) and not (valor.hour or valor.minute or valor.second):
+        return valor.date()
+    if isinstance(valor, str):
+        return valor.strip()
+    return valor
+
+
+def filas_xlsx(archivo):
+    """Filas de la primera hoja de un XLSX (requiere ``openpyxl``)."""
+    try:
+        import openpyxl
+    except ImportError:
+        raise ValidationError({"archivo": "Para importar XLSX instale openpyxl (o exporte la planilla a CSV)."})
+
+    libro = openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        hoja = libro.worksheets[0]
+        filas = hoja.iter_rows(values_only=True)
+        columnas = [_columna(c) for c in next(filas, ())]
+        for valores in filas:
+            if any(v not in ("", None) for v in valores):
+                yield _fila(columnas, (_celda(v) for v in valores))
+            else:
+                yield None
+    finally:
+        libro.close()
+
+
+def leer(archivo, nombre):
+    """Elige el lector según la extensión de ``nombre``."""
+    extension = Path(nombre or "").suffix.lower()
+    if extension == ".csv":
+        return filas_csv(archivo)
+    if extension == ".xlsx":
+        return filas_xlsx(archivo)
+    raise ValidationError({"archivo": f"Formato no soportado; use {' o '.join(FORMATOS)}."})
+
+
+def _bloques(filas, tamano):
+    """``(numeros_de_fila, filas)`` por bloque; la fila 1 es el encabezado."""
+    numeradas = ((numero, fila) for numero, fila in enumerate(filas, start=2) if fila is not None)
+    while True:
+        bloque = list(islice(numeradas, tamano))
+        if not bloque:
+            return
+        numeros, items = zip(*bloque)
+        yield numeros, list(items)
+
+
+# ---------------------- importación ---------------------- #
+def importar(filas, serializer_class, upsert=False, chunk_size=None, avance=None):
+    """
+    Valida e inserta ``filas`` (iterable de diccionarios). Devuelve el
+    informe ``{"filas", "guardados", "errores", "segundos"}``; si
+    ``errores`` no está vacío la transacción se revierte y ``guardados`` es 0.
+
+    Después del primer error se siguen validando las filas, sin escribir,
+    hasta juntar ``API_IMPORT_MAX_ERRORS`` errores (``"truncado": true``).
+    Con ``upsert`` las filas cuya ``unique_key`` ya existe se actualizan.
+    ``avance(filas_leidas)`` se llama al validar cada bloque.
+    """
+    unique_key = clave_upsert(serializer_class) if upsert else getattr(serializer_class, "unique_key", ())
+    model = serializer_class.Meta.model
+    max_errores = _max_errores()
+    inicio = time.perf_counter()
+    total, guardados, errores, truncado = 0, 0, [], False
+
+    try:
+        with transaction.atomic(), resumen.agrupar(), cambios.agrupar():
+            for numeros, items in _bloques(filas, chunk_size or _chunk_size()):
+                total += len(items)
+                contexto = contexto_trabajadores(items)
+                contexto["verificar_unicidad"] = False
+                # Un serializer por bloque, como el hijo de many=True, pero
+                # conservando las filas válidas para revisar sus duplicados.
+                serializer = serializer_class(context=contexto)
+                validos, validados = [], []
+                for numero, item in zip(numeros, items):
+                    try:
+                        validados.append(serializer.run_validation(item))
+                        validos.append(numero)
+                    except ValidationError as exc:
+                        errores.append({"fila": numero, "errores": exc.detail})
+
+                if unique_key and not upsert and validados:
+                    mensaje = f"Ya existe un registro con los mismos {', '.join(unique_key)}."
+                    errores += [
+                        {"fila": validos[i], "errores": {"non_field_errors": [mensaje]}}
+                        for i in duplicados(model, unique_key, validados)
+                    ]
+
+                if len(errores) >= max_errores:
+                    truncado = True
+                    break
+                if avance is not None:
+                    avance(total)
+                if errores:
+                    continue
+
+                objs = [model(**datos) for datos in validados]
+                if upsert:
+                    objs = guardar_upsert(model, objs, unique_key)
+                else:
+                    objs = insertar(model, objs, unique_key)
+                registros_en_lote.send(sender=model, instancias=objs)
+                guardados += len(objs)
+
+            if errores:
+                transaction.set_rollback(True)
+    except IntegrityError:
+        errores = [{"fila": None, "errores": {"non_field_errors": ["El archivo entra en conflicto con registros existentes."]}}]
+        truncado = False
+
+    informe = {
+        "filas": total,
+        "guardados": 0 if errores else guardados,
+        "errores": sorted(errores, key=lambda e: e["fila"] or 0)[:max_errores],
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+    if truncado:
+        informe["truncado"] = True
+    return informe
@@ -0,0 +1,192 @@
+import json
+import re
+import statistics
+import subprocess
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from core import cache
+from core.models import Accidente, Asistencia, SueldoTrabajador, Trabajador
+
+_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) consultas"')
+
+
+def percentil(valores, p):
+    """Percentil ``p`` (0-100) por interpolación lineal entre los valores ordenados."""
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * p / 100
+    i = int(posicion)
+    if i + 1 >= len(ordenados):
+        return ordenados[-1]
+    return ordenados[i] + (ordenados[i + 1] - ordenados[i]) * (posicion - i)
+
+
+def _commit():
+    try:
+        salida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+def endpoints():
+    """Peticiones de lectura que se miden, con ids y filtros tomados de los datos."""
+    asistencia = Asistencia.objects.order_by("-fecha", "id").first()
+    if asistencia is None:
+        raise CommandError("No hay asistencias; ejecute `generar_datos` antes de medir.")
+    trabajador = Trabajador.objects.order_by("id").first()
+    mes = f"{asistencia.fecha:%Y-%m}"
+
+    urls = {
+        "trabajadores": "/api/trabajadores/?page_size=100",
+        "trabajadores_filtro": "/api/trabajadores/?" + urlencode({"estado": "ACTIVO", "area": trabajador.area, "page_size": 100}),
+        "trabajador_detalle": f"/api/trabajadores/{trabajador.pk}/",
+        "asistencias": "/api/asistencias/?page_size=100",
+        "asistencias_trabajador": f"/api/asistencias/?trabajador_rut={asistencia.trabajador_rut}&page_size=100",
+        "asistencias_campos": "/api/asistencias/?fields=trabajador_rut,fecha,estado&page_size=500",
+        "asistencia_detalle": f"/api/asistencias/{asistencia.pk}/",
+        "asistencias_stream": f"/api/asistencias/?stream=ndjson&fecha__gte={asistencia.fecha}",
+        "accidentes": "/api/accidentes/?page_size=100",
+        "sueldos": f"/api/sueldos/?mes={mes}&page_size=100",
+        "resumen_mensual": "/api/resumen-mensual/?agrupar=mes,area",
+        "stats_asistencia": "/api/stats/asistencia/?agrupar=area,turno",
+        "stats_atrasos": "/api/stats/atrasos/?limite=50",
+        "stats_accidentes": "/api/stats/accidentes/?por_gravedad=1",
+        "stats_sueldos": f"/api/stats/sueldos/?desde={mes}&hasta={mes}",
+    }
+    if not Accidente.objects.exists():
+        del urls["accidentes"], urls["stats_accidentes"]
+    if not SueldoTrabajador.objects.exists():
+        del urls["sueldos"], urls["stats_sueldos"]
+    return urls
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide latencia (p50/p95/p99) y throughput de los endpoints de lectura "
+        "dentro del proceso con el Client de Django (sin red) y guarda el "
+        "resultado en JSON. Con --comparar muestra la diferencia contra una "
+        "medición anterior, por ejemplo la de otro commit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeticiones", type=int, default=50)
+        parser.add_argument("--calentamiento", type=int, default=5)
+        parser.add_argument("--solo", nargs="+", metavar="ENDPOINT", help="Medir sólo estos endpoints.")
+        parser.add_argument("--sin-cache", action="store_true", help="Desactivar la caché de listados.")
+        parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto benchmarks/resultados/<commit>.json).")
+        parser.add_argument("--comparar", help="JSON de una medición anterior.")
+
+    def handle(self, *args, **options):
+        urls = endpoints()
+        if options["solo"]:
+            desconocidos = set(options["solo"]) - set(urls)
+            if desconocidos:
+                raise CommandError(f"Endpoints desconocidos: {', '.join(sorted(desconocidos))}. Opciones: {', '.join(urls)}.")
+            urls = {nombre: url for nombre, url in urls.items() if nombre in options["solo"]}
+
+        cliente = Client(HTTP_HOST="localhost")
+        repeticiones = max(1, options["repeticiones"])
+        with override_settings(API_CACHE_LISTADOS=False) if options["sin_cache"] else nullcontext():
+            resultados = {
+                nombre: self._medir(cliente, url, options["calentamiento"], repeticiones)
+                for nombre, url in urls.items()
+            }
+
+        commit = _commit()
+        informe = {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "perfil": settings.PERFIL,
+            "base": connection.vendor,
+            "cache_listados": cache.habilitada() and not options["sin_cache"],
+            "fastpath": getattr(settings, "API_FASTPATH_LISTADOS", False),
+            "datos": {
+                model.__name__: model.objects.count()
+                for model in (Trabajador, Asistencia, Accidente, SueldoTrabajador)
+            },
+            "repeticiones": repeticiones,
+            "endpoints": resultados,
+        }
+
+        salida = Path(options["salida"] or settings.BASE_DIR / "benchmarks" / "resultados" / f"{commit or 'actual'}.json")
+        salida.parent.mkdir(parents=True, exist_ok=True)
+        salida.write_text(json.dumps(informe, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+        anterior = None
+        if options["comparar"]:
+            anterior = json.loads(Path(options["comparar"]).read_text(encoding="utf-8"))["endpoints"]
+        self._tabla(resultados, anterior)
+        self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {salida}"))
+
+    def _medir(self, cliente, url, calentamiento, repeticiones):
+        for _ in range(max(0, calentamiento)):
+            self._pedir(cliente, url)
+
+        tiempos, consultas, db = [], [], []
+        tamano = 0
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            segundos, respuesta, tamano = self._pedir(cliente, url)
+            tiempos.append(segundos * 1000)
+            # Server-Timing de MetricasMiddleware: tiempo y cantidad de SQL
+            medida = _DB.search(respuesta.get("Server-Timing", ""))
+            if medida:
+                db.append(float(medida.group(1)))
+                consultas.append(int(medida.group(2)))
+        total = time.perf_counter() - inicio
+
+        return {
+            "url": url,
+            "status": respuesta.status_code,
+            "p50_ms": round(percentil(tiempos, 50), 3),
+            "p95_ms": round(percentil(tiempos, 95), 3),
+            "p99_ms": round(percentil(tiempos, 99), 3),
+            "media_ms": round(statistics.fmean(tiempos), 3),
+            "max_ms": round(max(tiempos), 3),
+            "peticiones_por_segundo": round(repeticiones / total, 1),
+            "consultas": max(consultas) if consultas else None,
+            "db_ms": round(statistics.fmean(db), 3) if db else None,
+            "bytes": tamano,
+        }
+
+    def _pedir(self, cliente, url):
+        inicio = time.perf_counter()
+        respuesta = cliente.get(url)
+        if respuesta.streaming:
+            tamano = sum(len(parte) for parte in respuesta.streaming_content)
+        else:
+            tamano = len(respuesta.content)
+        segundos = time.perf_counter() - inicio
+        if respuesta.status_code >= 400:
+            raise CommandError(f"GET {url} respondió {respuesta.status_code}: {respuesta.content[:300]!r}")
+        return segundos, respuesta, tamano
+
+    def _tabla(self, resultados, anterior):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'endpoint':<24} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'SQL':>4} {'bytes':>10}"
+        ))
+        for nombre, r in resultados.items():
+            linea = (
+                f"{nombre:<24} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+                f"{r['peticiones_por_segundo']:>9.1f} {r['consultas'] if r['consultas'] is not None else '-':>4} "
+                f"{r['bytes']:>10,}"
+            )
+            previo = (anterior or {}).get(nombre)
+            if previo:
+                cambio = (r["p50_ms"] - previo["p50_ms"]) / previo["p50_ms"] * 100 if previo["p50_ms"] else 0
+                estilo = self.style.ERROR if cambio > 10 else self.style.SUCCESS if cambio < -10 else str
+                linea += "  " + estilo(f"p50 {cambio:+.0f}% (antes {previo['p50_ms']:.2f})")
+            self.stdout.write(linea)
+
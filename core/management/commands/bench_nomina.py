@@ -0,0 +1,121 @@
+import json
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q, Sum
+
+from core import nomina, resumen
+from core.management.commands.bench_api import _commit
+from core.models import Asistencia, Trabajador
+
+
+def por_trabajador(mes):
+    """
+    Referencia: la misma fórmula con una consulta y el cálculo por
+    trabajador, como se haría sin ``core.nomina``.
+    """
+    inicio, fin = resumen.rango_mes(mes)
+    no_pagados = tuple(settings.API_PAYROLL_UNPAID_STATES)
+    horas = settings.API_PAYROLL_WEEKLY_HOURS
+    factor = settings.API_PAYROLL_OVERTIME_FACTOR
+    ruts = Asistencia.objects.filter(fecha__range=(inicio, fin)).values("trabajador_rut")
+
+    sueldos = {}
+    for trabajador in Trabajador.objects.filter(rut__in=ruts).order_by("rut"):
+        t = Asistencia.objects.filter(trabajador_rut=trabajador.rut, fecha__range=(inicio, fin)).aggregate(
+            dias=Count("id"),
+            no_pagados=Count("id", filter=Q(estado__in=no_pagados)),
+            minutos_atraso=Sum("minutos_atraso"),
+            horas_extras=Sum("horas_extras"),
+        )
+        base = float(trabajador.sueldo_base)
+        valor_dia = base / nomina.DIAS_MES
+        valor_hora = base * 28 / (nomina.DIAS_MES * horas)
+        antes = min(max((trabajador.fecha_ingreso - inicio).days, 0), nomina.DIAS_MES)
+        descontados = min(t["no_pagados"] + antes, nomina.DIAS_MES)
+        total = (
+            base - descontados * valor_dia - t["minutos_atraso"] / 60 * valor_hora
+            + float(t["horas_extras"]) * valor_hora * factor
+        )
+        sueldos[trabajador.rut] = round(max(total, 0), 2) if t["dias"] > t["no_pagados"] else 0
+    return sueldos
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el cálculo de la nómina de un mes (core/nomina.py): sólo el "
+        "cálculo (SQL + numpy) y el cálculo con el upsert de los sueldos. "
+        "Con --por-trabajador lo compara con una consulta por trabajador y "
+        "verifica que los montos coincidan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mes", help="Mes a calcular (por defecto el de la última asistencia).")
+        parser.add_argument("--repeticiones", type=int, default=5)
+        parser.add_argument("--por-trabajador", action="store_true", help="Medir también el cálculo por trabajador.")
+        parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto benchmarks/resultados/nomina-<commit>.json).")
+
+    def handle(self, *args, **options):
+        mes = options["mes"]
+        if mes is None:
+            ultima = Asistencia.objects.order_by("-fecha").values_list("fecha", flat=True).first()
+            if ultima is None:
+                raise CommandError("No hay asistencias; ejecute `generar_datos` antes de medir.")
+            mes = resumen.mes_de(ultima)
+        nomina.validar_mes(mes)
+        repeticiones = max(1, options["repeticiones"])
+
+        trabajadores, arreglos = nomina.calcular(mes)
+        if not trabajadores:
+            raise CommandError(f"No hay asistencias en {mes}.")
+        resultados = {
+            "calculo": self._medir(lambda: nomina.calcular(mes), repeticiones),
+            "calculo_y_upsert": self._medir(lambda: nomina.generar(mes), repeticiones),
+        }
+        if options["por_trabajador"]:
+            inicio = time.perf_counter()
+            referencia = por_trabajador(mes)
+            resultados["por_trabajador"] = {"media_s": round(time.perf_counter() - inicio, 3), "repeticiones": 1}
+            diferencia = max(
+                abs(referencia[t[1]] - total)
+                for t, total in zip(trabajadores, arreglos["sueldo_total_mes"].tolist())
+            )
+            if diferencia > 0.01:
+                raise CommandError(f"El cálculo por trabajador difiere hasta en ${diferencia:.2f}.")
+
+        commit = _commit()
+        informe = {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "base": connection.vendor,
+            "mes": mes,
+            "trabajadores": len(trabajadores),
+            "asistencias": int(arreglos["dias"].sum()),
+            "resultados": resultados,
+        }
+        salida = Path(options["salida"] or settings.BASE_DIR / "benchmarks" / "resultados" / f"nomina-{commit or 'actual'}.json")
+        salida.parent.mkdir(parents=True, exist_ok=True)
+        salida.write_text(json.dumps(informe, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+        self.stdout.write(f"{mes}: {informe['trabajadores']:,} trabajadores, {informe['asistencias']:,} asistencias ({connection.vendor})")
+        for nombre, r in resultados.items():
+            self.stdout.write(f"  {nombre:<18} {r['media_s']:>8.3f} s")
+        self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {salida}"))
+
+    def _medir(self, funcion, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - inicio)
+        return {
+            "media_s": round(statistics.fmean(tiempos), 3),
+            "min_s": round(min(tiempos), 3),
+            "max_s": round(max(tiempos), 3),
+            "repeticiones": repeticiones,
+        }
@@ -0,0 +1,120 @@
+import json
+import time
+from datetime import date, datetime, time as hora, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core import fastpath
+from core.models import Asistencia, Trabajador
+from core.renderers import FastJSONRenderer
+from core.serializers import AsistenciaSerializer, TrabajadorSerializer
+
+MODELOS = {
+    "asistencia": (Asistencia, AsistenciaSerializer),
+    "trabajador": (Trabajador, TrabajadorSerializer),
+}
+
+
+def _trabajador(i, ahora):
+    return Trabajador(
+        id=i + 1,
+        rut=f"{10_000_000 + i}-{i % 10}",
+        nombre=f"Nombre {i}",
+        apellido="Apellido",
+        fecha_nacimiento=date(1980, 1, 1) + timedelta(days=i % 9000),
+        email=f"trabajador{i}@example.com",
+        telefono="+56900000000",
+        rol_cargo="Operario",
+        tipo_contrato="Indefinido",
+        area=f"Área {i % 12}",
+        turno="DIURNO",
+        fecha_ingreso=date(2015, 1, 1) + timedelta(days=i % 3000),
+        sueldo_base=Decimal(650_000 + i % 500_000).quantize(Decimal("0.01")),
+        estado="ACTIVO",
+        updated_at=ahora,
+    )
+
+
+def _asistencia(i, ahora):
+    return Asistencia(
+        id=i + 1,
+        trabajador_rut=f"{10_000_000 + i % 5000}-{i % 10}",
+        trabajador_nombre=f"Nombre {i % 5000} Apellido",
+        trabajador_id=i % 5000 + 1,
+        fecha=date(2020, 1, 1) + timedelta(days=i // 5000),
+        hora_entrada=hora(8, i % 60),
+        hora_salida=hora(17, 30),
+        minutos_atraso=i % 60,
+        horas_extras=Decimal(i % 400) / 100,
+        estado="PRESENTE",
+        updated_at=ahora,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el tiempo de serializar y renderizar un listado con el "
+        "ModelSerializer + JSONRenderer de DRF versus la ruta rápida "
+        "(core/fastpath.py + FastJSONRenderer). Por defecto usa filas "
+        "generadas en memoria; con --db las lee de la base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modelo", choices=sorted(MODELOS), default="asistencia")
+        parser.add_argument("--filas", type=int, default=100_000)
+        parser.add_argument("--db", action="store_true", help="Leer las filas desde la base de datos.")
+
+    def handle(self, *args, **options):
+        model, serializer_class = MODELOS[options["modelo"]]
+        n = max(1, options["filas"])
+        columnas, convertir = fastpath.compilar(serializer_class)
+
+        if options["db"]:
+            queryset = model.objects.order_by("id")[:n]
+            if not queryset.exists():
+                raise CommandError(f"No hay registros de {model.__name__} en la base.")
+
+            def drf():
+                return serializer_class(queryset.all(), many=True).data
+
+            def rapida():
+                return convertir(queryset.values(*columnas))
+        else:
+            ahora = timezone.now()
+            generar = _asistencia if model is Asistencia else _trabajador
+            instancias = [generar(i, ahora) for i in range(n)]
+            filas = [
+                {f.name: getattr(obj, f.attname) for f in model._meta.concrete_fields}
+                for obj in instancias
+            ]
+
+            def drf():
+                return serializer_class(instancias, many=True).data
+
+            def rapida():
+                return convertir(filas)
+
+        resultados = {}
+        for nombre, serializar, renderer in (
+            ("DRF ModelSerializer + JSONRenderer", drf, JSONRenderer()),
+            ("fastpath + FastJSONRenderer", rapida, FastJSONRenderer()),
+        ):
+            inicio = time.perf_counter()
+            datos = serializar()
+            medio = time.perf_counter()
+            cuerpo = renderer.render(datos)
+            fin = time.perf_counter()
+            resultados[nombre] = cuerpo
+            self.stdout.write(self.style.MIGRATE_HEADING(nombre))
+            self.stdout.write(
+                f"  serializar: {medio - inicio:.3f} s  renderizar: {fin - medio:.3f} s  "
+                f"total: {fin - inicio:.3f} s  ({len(datos) / (fin - inicio):,.0f} filas/s)"
+            )
+
+        drf_json, rapida_json = (json.loads(c) for c in resultados.values())
+        if drf_json != rapida_json:
+            raise CommandError("La ruta rápida no produjo la misma salida que el serializer.")
+        self.stdout.write(self.style.SUCCESS(f"Salidas idénticas ({len(drf_json)} filas)."))
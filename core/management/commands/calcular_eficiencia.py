@@ -0,0 +1,60 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from core import eficiencia
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula el puntaje de eficiencia de todos los trabajadores en un mes "
+        "(core/eficiencia.py) y muestra el ranking y los percentiles de cada "
+        "indicador. No modifica la base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("mes", nargs="?", metavar="MES", help="Mes en formato AAAA-MM (por defecto el de la última asistencia).")
+        parser.add_argument("--area", help="Calcular el ranking sólo dentro de un área.")
+        parser.add_argument("--trabajador", help="Mostrar sólo este RUT (con su posición en la dotación).")
+        parser.add_argument("--limite", type=int, default=20, help="Trabajadores a mostrar.")
+        parser.add_argument("--json", action="store_true", help="Imprimir el resultado completo en JSON.")
+
+    def handle(self, *args, **options):
+        params = {"limite": str(options["limite"])}
+        for opcion, param in (("mes", "mes"), ("area", "area"), ("trabajador", "trabajador_rut")):
+            if options[opcion]:
+                params[param] = options[opcion]
+
+        inicio = time.perf_counter()
+        try:
+            datos = eficiencia.consultar(params)
+        except ValidationError as exc:
+            raise CommandError(json.dumps(exc.detail, ensure_ascii=False))
+        segundos = time.perf_counter() - inicio
+
+        if options["json"]:
+            self.stdout.write(json.dumps(datos, ensure_ascii=False, indent=2, default=str))
+            return
+        if not datos["trabajadores"]:
+            raise CommandError("No hay asistencias para calcular la eficiencia.")
+
+        self.stdout.write(f"{datos['mes']}: {datos['trabajadores']:,} trabajadores en {segundos:.2f} s\n")
+        self.stdout.write(f"{'#':>6}  {'RUT':<12} {'Nombre':<28} {'Puntaje':>7} {'Trab/h':>7} {'$/trabajo':>11} {'Asist.':>6} {'Atraso/d':>8}")
+        for fila in datos["results"]:
+            costo = fila["costo_por_trabajo"]
+            self.stdout.write(
+                f"{fila['ranking']:>6}  {fila['trabajador_rut']:<12} {fila['trabajador_nombre'][:28]:<28} "
+                f"{_texto(fila['puntaje'], '.1f'):>7} {_texto(fila['trabajos_por_hora'], '.3f'):>7} "
+                f"{_texto(costo, ',.0f'):>11} {_texto(fila['tasa_asistencia'], '.0%'):>6} "
+                f"{_texto(fila['atraso_por_dia'], '.1f'):>8}"
+            )
+
+        self.stdout.write("\nPercentiles (10 / 25 / 50 / 75 / 90):")
+        for nombre, valores in datos["percentiles"].items():
+            self.stdout.write(f"  {nombre:<18} " + " / ".join(_texto(v, ",.0f" if v and abs(v) >= 1000 else ".4g") for v in valores.values()))
+
+
+def _texto(valor, formato):
+    return "-" if valor is None else format(valor, formato)
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from core import nomina
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula los sueldos de uno o más meses desde el sueldo base y las "
+        "asistencias (core/nomina.py) y los guarda en SueldoTrabajador, "
+        "reemplazando los del mismo trabajador y mes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("meses", nargs="+", metavar="MES", help="Mes en formato AAAA-MM.")
+        parser.add_argument("--json", action="store_true", help="Imprimir los informes en JSON.")
+
+    def handle(self, *args, **options):
+        for mes in options["meses"]:
+            try:
+                informe = nomina.generar(mes)
+            except ValidationError as exc:
+                raise CommandError(json.dumps(exc.detail, ensure_ascii=False))
+            if options["json"]:
+                self.stdout.write(json.dumps(informe, ensure_ascii=False))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{mes}: {informe['trabajadores']:,} sueldos, total ${informe['total']} "
+                    f"en {informe['segundos']:.2f} s (cálculo {informe['segundos_calculo']:.2f} s)."
+                ))
@@ -0,0 +1,223 @@
+import random
+import time
+from datetime import date, time as hora, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core import cache, resumen
+from core.models import (
+    Accidente, Asistencia, DesempenoTrabajador, EficienciaTrabajador,
+    ResumenMensual, SueldoTrabajador, Trabajador,
+)
+
+# Orden de borrado con --limpiar (primero los que apuntan a Trabajador)
+MODELOS = (
+    ResumenMensual, Asistencia, EficienciaTrabajador, DesempenoTrabajador,
+    SueldoTrabajador, Accidente, Trabajador,
+)
+
+AREAS = ("Bodega", "Despacho", "Transporte", "Mantención", "Administración", "Recepción", "Picking", "Calidad")
+CARGOS = ("Operario", "Grúa horquilla", "Conductor", "Supervisor", "Administrativo", "Jefe de turno")
+CONTRATOS = ("Indefinido", "Indefinido", "Indefinido", "Plazo fijo", "Honorarios")
+TURNOS = ("DIURNO", "DIURNO", "NOCTURNO", "ROTATIVO")
+NOMBRES = ("Juan", "María", "Pedro", "Camila", "José", "Valentina", "Luis", "Francisca", "Diego", "Javiera")
+APELLIDOS = ("González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez", "Sepúlveda")
+ESTADOS = ("PRESENTE", "AUSENTE", "LICENCIA", "VACACIONES")
+PESOS_ESTADO = (90, 4, 3, 3)
+TIPOS_ACCIDENTE = ("Caída", "Golpe", "Corte", "Atrapamiento", "Sobreesfuerzo")
+GRAVEDADES = ("LEVE", "MODERADA", "GRAVE", "FATAL")
+PESOS_GRAVEDAD = (70, 22, 7, 1)
+
+
+def digito_verificador(numero):
+    """Dígito verificador de un RUT chileno (módulo 11)."""
+    suma, factor = 0, 2
+    for digito in reversed(str(numero)):
+        suma += int(digito) * factor
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - suma % 11
+    return {11: "0", 10: "K"}.get(resto, str(resto))
+
+
+def _meses(desde, hasta):
+    mes = date(desde.year, desde.month, 1)
+    while mes <= hasta:
+        yield mes
+        mes = date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos a escala de producción (trabajadores, "
+        "asistencias por día hábil, sueldos mensuales, eficiencias, "
+        "desempeños y accidentes) con bulk_create por bloques. Con la misma "
+        "--semilla se obtienen los mismos datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--trabajadores", type=int, default=5000)
+        parser.add_argument("--desde", type=date.fromisoformat, default=date(2024, 1, 1))
+        parser.add_argument("--dias", type=int, default=365, help="Días de asistencia desde --desde.")
+        parser.add_argument("--accidentes-por-mes", type=int, default=40)
+        parser.add_argument("--bloque", type=int, default=10_000, help="Filas por bulk_create.")
+        parser.add_argument("--semilla", type=int, default=42)
+        parser.add_argument("--limpiar", action="store_true", help="Borrar los datos existentes antes de generar.")
+        parser.add_argument("--sin-resumen", action="store_true", help="No reconstruir ResumenMensual al final.")
+
+    def handle(self, *args, **options):
+        if options["limpiar"]:
+            self._limpiar()
+        elif Trabajador.objects.exists():
+            raise CommandError("Ya hay trabajadores en la base; use --limpiar para reemplazarlos.")
+
+        self.azar = random.Random(options["semilla"])
+        self.bloque = max(1, options["bloque"])
+        desde = options["desde"]
+        hasta = desde + timedelta(days=max(1, options["dias"]) - 1)
+
+        self._crear(Trabajador, self._trabajadores(max(1, options["trabajadores"])))
+        trabajadores = list(Trabajador.objects.order_by("id").values_list("id", "rut", "nombre", "apellido", "sueldo_base"))
+
+        self._crear(Asistencia, self._asistencias(trabajadores, desde, hasta))
+        self._crear(SueldoTrabajador, self._sueldos(trabajadores, desde, hasta))
+        self._crear(EficienciaTrabajador, self._eficiencias(trabajadores))
+        self._crear(DesempenoTrabajador, self._desempenos(trabajadores))
+        self._crear(Accidente, self._accidentes(desde, hasta, options["accidentes_por_mes"]))
+
+        if not options["sin_resumen"]:
+            inicio = time.perf_counter()
+            filas = resumen.reconstruir()
+            self.stdout.write(f"ResumenMensual: {filas:,} filas en {time.perf_counter() - inicio:.1f} s")
+
+        # bulk_create no envía señales: invalida a mano la caché de listados
+        for model in MODELOS:
+            cache.invalidar(model)
+        self.stdout.write(self.style.SUCCESS("Datos generados."))
+
+    # ---------------------- escritura ---------------------- #
+    def _limpiar(self):
+        # DELETE directo: con millones de filas el borrado del ORM cargaría
+        # cada objeto para enviar las señales.
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in MODELOS:
+                cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
+        self.stdout.write("Datos anteriores eliminados.")
+
+    def _crear(self, model, objetos):
+        inicio, total = time.perf_counter(), 0
+        while True:
+            lote = list(islice(objetos, self.bloque))
+            if not lote:
+                break
+            with transaction.atomic():
+                model.objects.bulk_create(lote, batch_size=self.bloque)
+            total += len(lote)
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(
+            f"{model.__name__}: {total:,} filas en {segundos:.1f} s ({total / max(segundos, 1e-9):,.0f} filas/s)"
+        )
+
+    # ---------------------- generadores ---------------------- #
+    def _trabajadores(self, cantidad):
+        azar = self.azar
+        for i in range(cantidad):
+            numero = 10_000_000 + i * 7
+            nacimiento = date(1965, 1, 1) + timedelta(days=azar.randrange(14_000))
+            yield Trabajador(
+                rut=f"{numero}-{digito_verificador(numero)}",
+                nombre=azar.choice(NOMBRES),
+                apellido=azar.choice(APELLIDOS),
+                fecha_nacimiento=nacimiento,
+                email=f"trabajador{i}@example.com",
+                telefono=f"+569{azar.randrange(10_000_000, 100_000_000)}",
+                rol_cargo=azar.choice(CARGOS),
+                tipo_contrato=azar.choice(CONTRATOS),
+                area=azar.choice(AREAS),
+                turno=azar.choice(TURNOS),
+                fecha_ingreso=date(2010, 1, 1) + timedelta(days=azar.randrange(5000)),
+                sueldo_base=Decimal(azar.randrange(500_000, 1_800_000, 1000)),
+                estado="ACTIVO" if azar.random() < 0.95 else "INACTIVO",
+            )
+
+    def _asistencias(self, trabajadores, desde, hasta):
+        azar = self.azar
+        dias = [desde + timedelta(days=d) for d in range((hasta - desde).days + 1)]
+        habiles = [dia for dia in dias if dia.weekday() < 5]
+        for id_, rut, nombre, apellido, _sueldo in trabajadores:
+            nombre_completo = f"{nombre} {apellido}"
+            for dia, estado in zip(habiles, azar.choices(ESTADOS, PESOS_ESTADO, k=len(habiles))):
+                presente = estado == "PRESENTE"
+                atraso = azar.choice((0, 0, 0, 0, 0, 0, 0, 5, 10, 25)) if presente else 0
+                yield Asistencia(
+                    trabajador_id=id_,
+                    trabajador_rut=rut,
+                    trabajador_nombre=nombre_completo,
+                    fecha=dia,
+                    hora_entrada=hora(8, atraso) if presente else None,
+                    hora_salida=hora(17, 30) if presente else None,
+                    minutos_atraso=atraso,
+                    horas_extras=Decimal(azar.choice((0, 0, 0, 0, 50, 100, 200))) / 100 if presente else Decimal(0),
+                    estado=estado,
+                )
+
+    def _sueldos(self, trabajadores, desde, hasta):
+        azar = self.azar
+        meses = list(_meses(desde, hasta))
+        for id_, rut, nombre, apellido, sueldo_base in trabajadores:
+            for mes in meses:
+                trabajos = azar.randrange(10, 60)
+                yield SueldoTrabajador(
+                    trabajador_id=id_,
+                    trabajador_rut=rut,
+                    trabajador_nombre=f"{nombre} {apellido}",
+                    mes=f"{mes:%Y-%m}",
+                    cantidad_trabajos_mes=trabajos,
+                    tipo_trabajos_mes="Operación",
+                    sueldo_total_mes=sueldo_base + Decimal(trabajos * 2500),
+                    id_eficiencia_asociada=id_,
+                )
+
+    def _eficiencias(self, trabajadores):
+        azar = self.azar
+        for id_, rut, nombre, apellido, sueldo_base in trabajadores:
+            yield EficienciaTrabajador(
+                trabajador_id=id_,
+                trabajador_rut=rut,
+                trabajador_nombre=f"{nombre} {apellido}",
+                id_eficiencia=id_,
+                trabajos_completados_en_1_mes=azar.randrange(10, 60),
+                sueldo_promedio_informado=int(sueldo_base),
+            )
+
+    def _desempenos(self, trabajadores):
+        azar = self.azar
+        for id_, rut, nombre, apellido, _sueldo in trabajadores:
+            yield DesempenoTrabajador(
+                trabajador_id=id_,
+                trabajador_rut=rut,
+                trabajador_nombre=f"{nombre} {apellido}",
+                id_desempeno=id_,
+                forma_de_hacer_trabajos=azar.choice(("Ordenada", "Rápida", "Cuidadosa", "Irregular")),
+                posibles_quejas="" if azar.random() < 0.9 else "Atrasos reiterados",
+            )
+
+    def _accidentes(self, desde, hasta, por_mes):
+        azar = self.azar
+        dias = (hasta - desde).days + 1
+        cantidad = max(0, por_mes) * len(list(_meses(desde, hasta)))
+        for _ in range(cantidad):
+            gravedad = azar.choices(GRAVEDADES, PESOS_GRAVEDAD)[0]
+            licencia = gravedad != "LEVE"
+            yield Accidente(
+                fecha=desde + timedelta(days=azar.randrange(dias)),
+                tipo=azar.choice(TIPOS_ACCIDENTE),
+                gravedad=gravedad,
+                lugar=azar.choice(AREAS),
+                hora_suceso=hora(azar.randrange(24), azar.randrange(60)),
+                requiere_licencia=licencia,
+                dias_licencia=azar.randrange(1, 60) if licencia else 0,
+                costo_estimado=Decimal(azar.randrange(50_000, 5_000_000, 1000)),
+            )
@@ -0,0 +1,53 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from core import importacion
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa una planilla CSV o XLSX de asistencias o sueldos validando "
+        "cada fila con el serializer del recurso. Si alguna fila es inválida "
+        "no se guarda nada y se muestran los errores por fila."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("recurso", choices=sorted(importacion.RECURSOS))
+        parser.add_argument("archivo")
+        parser.add_argument("--upsert", action="store_true", help="Actualizar los registros que ya existen.")
+        parser.add_argument("--bloque", type=int, help="Filas validadas e insertadas por bloque.")
+        parser.add_argument("--json", action="store_true", help="Imprimir el informe completo en JSON.")
+
+    def handle(self, *args, **options):
+        serializer_class = importacion.RECURSOS[options["recurso"]]
+        try:
+            with open(options["archivo"], "rb") as archivo:
+                informe = importacion.importar(
+                    importacion.leer(archivo, options["archivo"]),
+                    serializer_class,
+                    upsert=options["upsert"],
+                    chunk_size=options["bloque"],
+                )
+        except OSError as exc:
+            raise CommandError(f"No se pudo leer el archivo: {exc}")
+        except ValidationError as exc:
+            raise CommandError(json.dumps(exc.detail, ensure_ascii=False))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(informe, indent=2, ensure_ascii=False, default=str))
+        elif informe["errores"]:
+            for error in informe["errores"][:50]:
+                self.stderr.write(f"fila {error['fila']}: {json.dumps(error['errores'], ensure_ascii=False, default=str)}")
+            if len(informe["errores"]) > 50:
+                self.stderr.write(f"... y {len(informe['errores']) - 50} errores más (use --json para verlos todos)")
+
+        if informe["errores"]:
+            raise CommandError(
+                f"{len(informe['errores'])} errores en {informe['filas']:,} filas"
+                f"{' (informe truncado)' if informe.get('truncado') else ''}; no se importó nada."
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{informe['guardados']:,} registros importados de {informe['filas']:,} filas en {informe['segundos']:.1f} s."
+        ))
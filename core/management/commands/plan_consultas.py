@@ -0,0 +1,115 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.models import Accidente, Asistencia, SueldoTrabajador, Trabajador
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra el plan de ejecución (EXPLAIN) y el tiempo promedio de las "
+        "consultas más frecuentes de la API. Para comparar con y sin los "
+        "índices, ejecutarlo también con --sin-indices: las consultas se "
+        "repiten con una pista para que la base no use los índices de la "
+        "tabla, sin modificar el esquema ni los datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeticiones", type=int, default=20)
+        parser.add_argument("--sin-plan", action="store_true", help="Sólo mostrar tiempos.")
+        parser.add_argument(
+            "--sin-indices", action="store_true",
+            help=(
+                "Medir sin índices: NOT INDEXED en SQLite, IGNORE INDEX con los índices "
+                "del modelo en MySQL y sin index scans en PostgreSQL."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        asistencia = Asistencia.objects.order_by("-fecha").first()
+        if asistencia is None:
+            raise CommandError("No hay asistencias; genere datos antes de medir.")
+        accidente = Accidente.objects.order_by("-fecha").first()
+        sueldo = SueldoTrabajador.objects.order_by("-id").first()
+        trabajador = Trabajador.objects.order_by("-id").first()
+
+        consultas = {
+            "asistencia por trabajador y rango de fechas": Asistencia.objects.filter(
+                trabajador_rut=asistencia.trabajador_rut,
+                fecha__range=(asistencia.fecha - timedelta(days=30), asistencia.fecha),
+            ),
+            "página de asistencias (-fecha, id)": Asistencia.objects.filter(
+                fecha__lte=asistencia.fecha,
+            ).order_by("-fecha", "id")[:100],
+        }
+        if accidente is not None:
+            consultas["accidentes por fecha y gravedad"] = Accidente.objects.filter(
+                fecha__range=(accidente.fecha - timedelta(days=30), accidente.fecha),
+                gravedad=accidente.gravedad,
+            )
+        if sueldo is not None:
+            consultas["sueldo de un trabajador en un mes"] = SueldoTrabajador.objects.filter(
+                trabajador_rut=sueldo.trabajador_rut, mes=sueldo.mes,
+            )
+        if trabajador is not None:
+            consultas["trabajadores por estado y área"] = Trabajador.objects.filter(
+                estado=trabajador.estado, area=trabajador.area,
+            )
+
+        repeticiones = max(1, options["repeticiones"])
+        if not options["sin_indices"]:
+            for nombre, queryset in consultas.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(nombre))
+                if not options["sin_plan"]:
+                    self.stdout.write(queryset.explain())
+                self._medir(lambda: list(queryset.all()), repeticiones)
+            return
+
+        if connection.vendor not in ("sqlite", "mysql", "postgresql"):
+            raise CommandError(f"--sin-indices no está disponible para {connection.vendor}.")
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    for opcion in ("enable_indexscan", "enable_indexonlyscan", "enable_bitmapscan"):
+                        cursor.execute(f"SET LOCAL {opcion} = off")
+            for nombre, queryset in consultas.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{nombre} (sin índices)"))
+                sql, params = _sin_indices(queryset)
+                with connection.cursor() as cursor:
+                    if not options["sin_plan"]:
+                        prefijo = "EXPLAIN QUERY PLAN" if connection.vendor == "sqlite" else "EXPLAIN"
+                        cursor.execute(f"{prefijo} {sql}", params)
+                        for fila in cursor.fetchall():
+                            self.stdout.write(str(fila[-1]) if connection.vendor != "mysql" else " ".join(map(str, fila)))
+
+                    def consultar():
+                        cursor.execute(sql, params)
+                        cursor.fetchall()
+
+                    self._medir(consultar, repeticiones)
+
+    def _medir(self, consultar, repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            consultar()
+        promedio = (time.perf_counter() - inicio) / repeticiones * 1000
+        self.stdout.write(f"  promedio: {promedio:.2f} ms ({repeticiones} repeticiones)\n")
+
+
+def _sin_indices(queryset):
+    """SQL de ``queryset`` con la pista para no usar los índices de su tabla."""
+    sql, params = queryset.query.sql_with_params()
+    modelo = queryset.model
+    tabla = connection.ops.quote_name(modelo._meta.db_table)
+    if connection.vendor == "sqlite":
+        pista = "NOT INDEXED"
+    elif connection.vendor == "mysql":
+        nombres = [i.name for i in modelo._meta.indexes] + [c.name for c in modelo._meta.constraints]
+        pista = f"IGNORE INDEX ({', '.join(nombres)})" if nombres else ""
+    else:
+        # PostgreSQL no tiene pistas por consulta: los index scans se
+        # desactivan con SET LOCAL en la transacción
+        pista = ""
+    return sql.replace(f"FROM {tabla}", f"FROM {tabla} {pista}".rstrip(), 1), params
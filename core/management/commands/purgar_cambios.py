@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core import cambios
+
+
+class Command(BaseCommand):
+    help = (
+        "Elimina del registro de cambios (/api/changes/) las entradas más "
+        "antiguas. Los clientes con un cursor anterior reciben 410 y deben "
+        "descargar las tablas completas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int, default=30, help="Conservar los cambios de los últimos N días.")
+
+    def handle(self, *args, **options):
+        eliminados = cambios.purgar(max(0, options["dias"]))
+        self.stdout.write(self.style.SUCCESS(f"{eliminados:,} cambios eliminados."))
@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import resumen
+
+
+class Command(BaseCommand):
+    help = "Recalcula por completo la tabla ResumenMensual desde asistencias, accidentes y sueldos."
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        filas = resumen.reconstruir()
+        self.stdout.write(self.style.SUCCESS(
+            f"ResumenMensual reconstruido: {filas} filas en {time.perf_counter() - inicio:.2f} s."
+        ))
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import trabajos
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta los trabajos en segundo plano de la tabla Trabajo en un pool "
+        "de procesos (uno por núcleo por defecto). Se pueden iniciar varios "
+        "runworker contra la misma base. SIGTERM deja de tomar trabajos y "
+        "espera a que terminen los que están en curso; Ctrl+C también los "
+        "interrumpe y vuelven a la cola."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--procesos", type=int, default=None,
+            help="Trabajos en paralelo (por defecto API_JOBS_WORKERS). Con 0 se ejecutan en este proceso.",
+        )
+        parser.add_argument("--intervalo", type=float, default=None, help="Segundos entre consultas a la cola.")
+        parser.add_argument("--hasta-vaciar", action="store_true", help="Terminar cuando no queden trabajos disponibles.")
+
+    def handle(self, *args, **options):
+        procesos = options["procesos"]
+        if procesos is None:
+            procesos = getattr(settings, "API_JOBS_WORKERS", os.cpu_count() or 1)
+        self.intervalo = options["intervalo"] or getattr(settings, "API_JOBS_POLL_SECONDS", 1)
+        self.hasta_vaciar = options["hasta_vaciar"]
+        self.nombre = f"{socket.gethostname()}:{os.getpid()}"
+        self.parar = False
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(senal, self._detener)
+
+        recuperados = trabajos.recuperar()
+        if recuperados:
+            self.stdout.write(f"{recuperados} trabajos abandonados vuelven a la cola.")
+        self.stdout.write(f"runworker {self.nombre}: {procesos or 'sin'} procesos.")
+
+        if procesos <= 0:
+            self._en_este_proceso()
+            return
+        # spawn y no fork: los hijos abren sus propias conexiones en vez de
+        # heredar los sockets de la base del proceso principal.
+        contexto = multiprocessing.get_context("spawn")
+        while not self._con_pool(procesos, contexto) and not self.parar:
+            self.stderr.write("Un proceso del pool terminó de forma inesperada; se reinicia el pool.")
+
+    def _detener(self, *args):
+        if not self.parar:
+            self.stdout.write("Deteniendo: se esperan los trabajos en curso.")
+        self.parar = True
+
+    def _en_este_proceso(self):
+        while not self.parar:
+            reclamados = trabajos.reclamar(self.nombre, 1)
+            if reclamados:
+                trabajos.ejecutar(reclamados[0])
+            elif self.hasta_vaciar:
+                return
+            else:
+                time.sleep(self.intervalo)
+
+    def _con_pool(self, procesos, contexto):
+        """Procesa la cola hasta detenerse. Devuelve ``False`` si el pool se rompió."""
+        en_curso = {}
+        revision = time.monotonic()
+        with ProcessPoolExecutor(procesos, mp_context=contexto, initializer=django.setup) as pool:
+            while True:
+                if not self.parar and len(en_curso) < procesos:
+                    for pk in trabajos.reclamar(self.nombre, procesos - len(en_curso)):
+                        en_curso[pool.submit(trabajos.ejecutar, pk)] = pk
+                if not en_curso:
+                    if self.parar or self.hasta_vaciar:
+                        return True
+                    time.sleep(self.intervalo)
+                    continue
+
+                terminados, _ = wait(en_curso, timeout=self.intervalo, return_when=FIRST_COMPLETED)
+                roto = False
+                for futuro in terminados:
+                    pk = en_curso.pop(futuro)
+                    error = futuro.exception()
+                    if error is not None:
+                        # El proceso murió (memoria, señal) sin registrar el resultado
+                        trabajos.fallar(pk, f"{type(error).__name__}: {error}")
+                        roto = roto or isinstance(error, BrokenProcessPool)
+                if roto:
+                    for pk in en_curso.values():
+                        trabajos.fallar(pk, "El pool de procesos se interrumpió.")
+                    return False
+
+                trabajos.latir(en_curso.values())
+                if time.monotonic() - revision > getattr(settings, "API_JOBS_TIMEOUT_SECONDS", 600) / 2:
+                    trabajos.recuperar()
+                    revision = time.monotonic()
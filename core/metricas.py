@@ -0,0 +1,167 @@
+# core/metricas.py
+"""
+Métricas por petición: tiempo total, consultas SQL y su duración, tiempo
+de serialización/render y tamaño de la respuesta.
+
+La medición de la petición en curso vive en un ``ContextVar``; así las
+consultas hechas desde threads de ``sync_to_async`` (vistas async) también
+se atribuyen a la petición. Los acumulados son por proceso y se exponen en
+formato Prometheus con ``exportar()``.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from . import cache
+
+_actual = ContextVar("medicion_api", default=None)
+_lock = threading.Lock()
+
+# Límites (segundos) del histograma de duración
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Medicion:
+    __slots__ = ("inicio", "consultas", "db", "tiempos", "sql")
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.db = 0.0
+        self.tiempos = {}
+        self.sql = []
+
+    def total(self):
+        return time.perf_counter() - self.inicio
+
+
+def iniciar():
+    """Comienza a medir la petición actual; devuelve el token para ``terminar``."""
+    medicion = Medicion()
+    return medicion, _actual.set(medicion)
+
+
+def terminar(token):
+    _actual.reset(token)
+
+
+@contextmanager
+def medir(nombre):
+    """Suma el tiempo del bloque a ``nombre`` en la petición actual."""
+    medicion = _actual.get()
+    if medicion is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicion.tiempos[nombre] = medicion.tiempos.get(nombre, 0.0) + time.perf_counter() - inicio
+
+
+# ---------------------- SQL ---------------------- #
+def medir_sql(execute, sql, params, many, context):
+    """``execute_wrapper`` instalado en cada conexión (ver ``core/signals.py``)."""
+    medicion = _actual.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion = time.perf_counter() - inicio
+        medicion.consultas += 1
+        medicion.db += duracion
+        # Sólo el texto: los parámetros pueden traer tokens, contraseñas o RUTs
+        if len(medicion.sql) < getattr(settings, "API_SLOW_REQUEST_SQL_MAX", 50):
+            medicion.sql.append((duracion, sql))
+
+
+def instalar(connection):
+    if medir_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(medir_sql)
+
+
+# ---------------------- acumulados ---------------------- #
+_peticiones = {}
+
+
+def registrar(metodo, ruta, status, medicion, total, tamano):
+    clave = (metodo, ruta, str(status))
+    with _lock:
+        datos = _peticiones.get(clave)
+        if datos is None:
+            datos = _peticiones[clave] = {
+                "total": 0, "segundos": 0.0, "buckets": [0] * len(BUCKETS),
+                "consultas": 0, "db": 0.0, "serializacion": 0.0, "render": 0.0, "bytes": 0,
+            }
+        datos["total"] += 1
+        datos["segundos"] += total
+        for i, limite in enumerate(BUCKETS):
+            if total <= limite:
+                datos["buckets"][i] += 1
+        datos["consultas"] += medicion.consultas
+        datos["db"] += medicion.db
+        datos["serializacion"] += medicion.tiempos.get("serializacion", 0.0)
+        datos["render"] += medicion.tiempos.get("render", 0.0)
+        datos["bytes"] += tamano
+
+
+def _etiquetas(**valores):
+    partes = []
+    for nombre, valor in valores.items():
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        partes.append(f'{nombre}="{valor}"')
+    return "{" + ",".join(partes) + "}"
+
+
+SERIES = (
+    ("api_db_queries_total", "counter", "consultas", "Consultas SQL ejecutadas."),
+    ("api_db_seconds_total", "counter", "db", "Tiempo en consultas SQL."),
+    ("api_serializacion_seconds_total", "counter", "serializacion", "Tiempo serializando filas."),
+    ("api_render_seconds_total", "counter", "render", "Tiempo generando el JSON."),
+    ("api_response_bytes_total", "counter", "bytes", "Bytes de respuesta (sin streaming)."),
+)
+
+
+def exportar():
+    """Métricas acumuladas de este proceso en formato de texto Prometheus."""
+    with _lock:
+        peticiones = {clave: dict(datos, buckets=list(datos["buckets"])) for clave, datos in _peticiones.items()}
+
+    lineas = [
+        "# HELP api_requests_total Peticiones atendidas.",
+        "# TYPE api_requests_total counter",
+    ]
+    for (metodo, ruta, status), datos in sorted(peticiones.items()):
+        lineas.append(f"api_requests_total{_etiquetas(method=metodo, ruta=ruta, status=status)} {datos['total']}")
+
+    lineas += [
+        "# HELP api_request_duration_seconds Duración de las peticiones.",
+        "# TYPE api_request_duration_seconds histogram",
+    ]
+    for (metodo, ruta, status), datos in sorted(peticiones.items()):
+        for limite, cantidad in zip(BUCKETS, datos["buckets"]):
+            etiquetas = _etiquetas(method=metodo, ruta=ruta, status=status, le=limite)
+            lineas.append(f"api_request_duration_seconds_bucket{etiquetas} {cantidad}")
+        etiquetas = _etiquetas(method=metodo, ruta=ruta, status=status, le="+Inf")
+        lineas.append(f"api_request_duration_seconds_bucket{etiquetas} {datos['total']}")
+        etiquetas = _etiquetas(method=metodo, ruta=ruta, status=status)
+        lineas.append(f"api_request_duration_seconds_sum{etiquetas} {datos['segundos']:.6f}")
+        lineas.append(f"api_request_duration_seconds_count{etiquetas} {datos['total']}")
+
+    for nombre, tipo, campo, ayuda in SERIES:
+        lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+        for (metodo, ruta, status), datos in sorted(peticiones.items()):
+            lineas.append(f"{nombre}{_etiquetas(method=metodo, ruta=ruta, status=status)} {datos[campo]}")
+
+    for nombre, valor in cache.metricas().items():
+        lineas += [
+            f"# HELP api_cache_{nombre}_total Caché de listados: {nombre}.",
+            f"# TYPE api_cache_{nombre}_total counter",
+            f"api_cache_{nombre}_total {valor}",
+        ]
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,75 @@
+# core/middleware.py
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metricas
+
+logger = logging.getLogger("core.lentas")
+
+
+class MetricasMiddleware:
+    """
+    Mide cada petición (ver ``core/metricas.py``), agrega el header
+    ``Server-Timing`` y registra en el log ``core.lentas`` las peticiones que
+    superan ``API_SLOW_REQUEST_MS`` junto con su SQL (sin los parámetros).
+
+    En respuestas con streaming el tiempo llega hasta que la vista devuelve
+    la respuesta, no hasta enviar el último byte.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        medicion, token = metricas.iniciar()
+        try:
+            response = self.get_response(request)
+        finally:
+            metricas.terminar(token)
+        return self._finalizar(request, response, medicion)
+
+    async def __acall__(self, request):
+        medicion, token = metricas.iniciar()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metricas.terminar(token)
+        return self._finalizar(request, response, medicion)
+
+    def _finalizar(self, request, response, medicion):
+        total = medicion.total()
+        tamano = 0 if response.streaming else len(response.content)
+        match = getattr(request, "resolver_match", None)
+        ruta = match.route if match else "<sin ruta>"
+
+        tiempos = [
+            f"total;dur={total * 1000:.1f}",
+            f'db;dur={medicion.db * 1000:.1f};desc="{medicion.consultas} consultas"',
+        ]
+        for nombre in ("serializacion", "render"):
+            if nombre in medicion.tiempos:
+                tiempos.append(f"{nombre};dur={medicion.tiempos[nombre] * 1000:.1f}")
+        response["Server-Timing"] = ", ".join(tiempos)
+
+        metricas.registrar(request.method, ruta, response.status_code, medicion, total, tamano)
+
+        umbral = getattr(settings, "API_SLOW_REQUEST_MS", 500)
+        if umbral is not None and total * 1000 >= umbral:
+            sql = "\n".join(
+                f"  [{duracion * 1000:.1f} ms] {texto}" for duracion, texto in medicion.sql
+            )
+            logger.warning(
+                "%s %s -> %s en %.0f ms (%d consultas, %.0f ms SQL, %d bytes)\n%s",
+                request.method, request.get_full_path(), response.status_code, total * 1000,
+                medicion.consultas, medicion.db * 1000, tamano, sql,
+            )
+        return response
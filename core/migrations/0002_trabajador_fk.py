@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asistencia',
+            name='trabajador',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='asistencias', to='core.trabajador'),
+        ),
+        migrations.AddField(
+            model_name='desempenotrabajador',
+            name='trabajador',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='desempenos', to='core.trabajador'),
+        ),
+        migrations.AddField(
+            model_name='eficienciatrabajador',
+            name='trabajador',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eficiencias', to='core.trabajador'),
+        ),
+        migrations.AddField(
+            model_name='sueldotrabajador',
+            name='trabajador',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sueldos', to='core.trabajador'),
+        ),
+    ]
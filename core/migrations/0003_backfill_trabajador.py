@@ -0,0 +1,26 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+MODELOS = ["Asistencia", "EficienciaTrabajador", "DesempenoTrabajador", "SueldoTrabajador"]
+
+
+def vincular_por_rut(apps, schema_editor):
+    Trabajador = apps.get_model("core", "Trabajador")
+    trabajador_id = Subquery(
+        Trabajador.objects.filter(rut=OuterRef("trabajador_rut")).values("pk")[:1]
+    )
+    for nombre in MODELOS:
+        Modelo = apps.get_model("core", nombre)
+        Modelo.objects.filter(trabajador__isnull=True).update(trabajador=trabajador_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_trabajador_fk'),
+    ]
+
+    operations = [
+        migrations.RunPython(vincular_por_rut, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_backfill_trabajador'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accidente',
+            index=models.Index(fields=['fecha', 'gravedad'], name='accidente_fecha_gravedad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asistencia',
+            index=models.Index(fields=['trabajador_rut', 'fecha'], name='asistencia_rut_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asistencia',
+            index=models.Index(fields=['-fecha', 'id'], name='asistencia_fecha_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sueldotrabajador',
+            index=models.Index(fields=['trabajador_rut', 'mes'], name='sueldo_rut_mes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trabajador',
+            index=models.Index(fields=['estado', 'area'], name='trabajador_estado_area_idx'),
+        ),
+    ]
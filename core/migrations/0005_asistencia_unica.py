@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:26
+
+from django.core.management.base import CommandError
+from django.db import migrations, models
+from django.db.models import Count
+
+# Combinaciones duplicadas que se muestran en el error
+MOSTRAR = 50
+
+
+def verificar_duplicados(apps, schema_editor):
+    """
+    La restricción única no admite dos asistencias del mismo trabajador en
+    la misma fecha. No se eligen ni se borran asistencias automáticamente:
+    si hay duplicados la migración se detiene y los lista para corregirlos
+    a mano (p. ej. desde el admin).
+    """
+    Asistencia = apps.get_model("core", "Asistencia")
+    duplicados = list(
+        Asistencia.objects.values("trabajador_rut", "fecha")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .order_by("trabajador_rut", "fecha")
+    )
+    if not duplicados:
+        return
+
+    lineas = []
+    for fila in duplicados[:MOSTRAR]:
+        ids = Asistencia.objects.filter(
+            trabajador_rut=fila["trabajador_rut"], fecha=fila["fecha"],
+        ).order_by("id").values_list("id", flat=True)
+        lineas.append(f"  {fila['trabajador_rut']} {fila['fecha']}: ids {', '.join(map(str, ids))}")
+    if len(duplicados) > MOSTRAR:
+        lineas.append(f"  ... y {len(duplicados) - MOSTRAR} más")
+    raise CommandError(
+        f"Hay {len(duplicados)} combinaciones (trabajador_rut, fecha) con más de una "
+        "Asistencia. Deje una por combinación y vuelva a ejecutar migrate:\n"
+        + "\n".join(lineas)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='asistencia',
+            constraint=models.UniqueConstraint(fields=('trabajador_rut', 'fecha'), name='asistencia_rut_fecha_uniq'),
+        ),
+        migrations.RemoveIndex(
+            model_name='asistencia',
+            name='asistencia_rut_fecha_idx',
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_asistencia_unica'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenMensual',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.CharField(help_text='Mes, por ejemplo: 2025-11', max_length=20)),
+                ('trabajador_rut', models.CharField(blank=True, max_length=12)),
+                ('area', models.CharField(blank=True, max_length=60)),
+                ('dias_registrados', models.PositiveIntegerField(default=0)),
+                ('presentes', models.PositiveIntegerField(default=0)),
+                ('ausentes', models.PositiveIntegerField(default=0)),
+                ('licencias', models.PositiveIntegerField(default=0)),
+                ('vacaciones', models.PositiveIntegerField(default=0)),
+                ('minutos_atraso', models.PositiveIntegerField(default=0)),
+                ('horas_extras', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('accidentes_leve', models.PositiveIntegerField(default=0)),
+                ('accidentes_moderada', models.PositiveIntegerField(default=0)),
+                ('accidentes_grave', models.PositiveIntegerField(default=0)),
+                ('accidentes_fatal', models.PositiveIntegerField(default=0)),
+                ('sueldo_total_mes', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'ordering': ['mes', 'trabajador_rut'],
+                'indexes': [models.Index(fields=['area', 'mes'], name='resumen_area_mes_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mes', 'trabajador_rut'), name='resumen_mes_rut_uniq')],
+            },
+        ),
+    ]
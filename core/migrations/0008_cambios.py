@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cambio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recurso', models.CharField(help_text='Nombre del recurso en la API, por ejemplo: asistencias', max_length=20)),
+                ('objeto_id', models.BigIntegerField()),
+                ('operacion', models.CharField(help_text='guardado / eliminado', max_length=10)),
+                ('momento', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['recurso', 'id'], name='cambio_recurso_id_idx'), models.Index(fields=['momento'], name='cambio_momento_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_cambios'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Trabajo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarea', models.CharField(help_text='Tarea registrada en core.tareas, por ejemplo: reconstruir_resumen', max_length=50)),
+                ('parametros', models.JSONField(blank=True, default=dict)),
+                ('estado', models.CharField(default='PENDIENTE', help_text='PENDIENTE / EJECUTANDO / COMPLETADO / FALLIDO / CANCELADO', max_length=10)),
+                ('progreso', models.FloatField(default=0, help_text='Avance de 0 a 1')),
+                ('detalle', models.CharField(blank=True, max_length=200)),
+                ('resultado', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('max_intentos', models.PositiveSmallIntegerField(default=3)),
+                ('worker', models.CharField(blank=True, help_text='host:pid del runworker que lo ejecuta', max_length=100)),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+                ('disponible_desde', models.DateTimeField(default=django.utils.timezone.now, help_text='No se ejecuta antes (reintentos)')),
+                ('iniciado', models.DateTimeField(blank=True, null=True)),
+                ('terminado', models.DateTimeField(blank=True, null=True)),
+                ('latido', models.DateTimeField(blank=True, help_text='Última señal del worker', null=True)),
+            ],
+            options={
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['estado', 'disponible_desde'], name='trabajo_estado_idx')],
+            },
+        ),
+    ]
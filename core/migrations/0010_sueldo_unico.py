@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:06
+
+from django.core.management.base import CommandError
+from django.db import migrations, models
+from django.db.models import Count
+
+# Combinaciones duplicadas que se muestran en el error
+MOSTRAR = 50
+
+
+def verificar_duplicados(apps, schema_editor):
+    """
+    La restricción única que usa la nómina para el upsert no admite dos
+    sueldos del mismo trabajador en el mismo mes. No se eligen ni se borran
+    sueldos automáticamente: si hay duplicados la migración se detiene y
+    los lista para corregirlos a mano (p. ej. desde el admin).
+    """
+    SueldoTrabajador = apps.get_model("core", "SueldoTrabajador")
+    duplicados = list(
+        SueldoTrabajador.objects.values("trabajador_rut", "mes")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .order_by("trabajador_rut", "mes")
+    )
+    if not duplicados:
+        return
+
+    lineas = []
+    for fila in duplicados[:MOSTRAR]:
+        ids = SueldoTrabajador.objects.filter(
+            trabajador_rut=fila["trabajador_rut"], mes=fila["mes"],
+        ).order_by("id").values_list("id", flat=True)
+        lineas.append(f"  {fila['trabajador_rut']} {fila['mes']}: ids {', '.join(map(str, ids))}")
+    if len(duplicados) > MOSTRAR:
+        lineas.append(f"  ... y {len(duplicados) - MOSTRAR} más")
+    raise CommandError(
+        f"Hay {len(duplicados)} combinaciones (trabajador_rut, mes) con más de un "
+        "SueldoTrabajador. Deje uno por combinación y vuelva a ejecutar migrate:\n"
+        + "\n".join(lineas)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_trabajos'),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='sueldotrabajador',
+            constraint=models.UniqueConstraint(fields=('trabajador_rut', 'mes'), name='sueldo_rut_mes_uniq'),
+        ),
+        migrations.RemoveIndex(
+            model_name='sueldotrabajador',
+            name='sueldo_rut_mes_idx',
+        ),
+    ]
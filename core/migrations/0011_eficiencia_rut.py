@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_sueldo_unico'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eficienciatrabajador',
+            index=models.Index(fields=['trabajador_rut', 'id'], name='eficiencia_rut_id_idx'),
+        ),
+    ]
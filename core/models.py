@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
@@ -12,7 +13,24 @@ def __str__(self):
 
 
 
-class Trabajador(models.Model):
+class RegistroAPI(models.Model):
+    """
+    Modelo expuesto por la API: ``save()`` se ejecuta en una transacción
+    junto con sus señales ``post_save``, así la fila de ``Cambio`` que
+    agrega ``core/cambios.py`` se confirma con el dato o no se confirma.
+    (``delete()`` ya envía sus señales dentro de la transacción.)
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class Trabajador(RegistroAPI):
       rut = models.CharField(max_length=12, unique=True)
       nombre = models.CharField(max_length=60)
       apellido = models.CharField(max_length=60)
@@ -36,11 +54,18 @@ class Trabajador(models.Model):
       contacto_emergencia = models.CharField(max_length=100, blank=True)
       telefono_emergencia = models.CharField(max_length=20, blank=True)
 
+      updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+      class Meta:
+        indexes = [
+            models.Index(fields=["estado", "area"], name="trabajador_estado_area_idx"),
+        ]
+
       def __str__(self):
         return f"{self.nombre} {self.apellido} ({self.rut})"    
 
 
-class Accidente(models.Model):
+class Accidente(RegistroAPI):
      fecha = models.DateField()
      tipo = models.CharField(max_length=60)
      gravedad = models.CharField(max_length=10)  # LEVE / MODERADA / GRAVE / FATAL
@@ -68,14 +93,28 @@ class Accidente(models.Model):
         help_text="Lista de RUTs o nombres de trabajadores involucrados, separados por coma."
     )
      
+     updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+     class Meta:
+        indexes = [
+            models.Index(fields=["fecha", "gravedad"], name="accidente_fecha_gravedad_idx"),
+        ]
+
      def __str__(self):
         return f"{self.fecha} - {self.tipo} ({self.gravedad})"
      
 
-class Asistencia(models.Model):
+class Asistencia(RegistroAPI):
     
     trabajador_rut = models.CharField(max_length=12)
     trabajador_nombre = models.CharField(max_length=120)
+    trabajador = models.ForeignKey(
+        Trabajador,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="asistencias",
+    )
 
     fecha = models.DateField()
     hora_entrada = models.TimeField(null=True, blank=True)
@@ -93,40 +132,82 @@ class Asistencia(models.Model):
     )
     observaciones = models.CharField(max_length=255, blank=True)   
 
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
     class Meta:
         ordering = ['-fecha']
+        indexes = [
+            # Soporta la paginación por cursor (-fecha, id) de los listados
+            models.Index(fields=["-fecha", "id"], name="asistencia_fecha_id_idx"),
+        ]
+        constraints = [
+            # Una asistencia por trabajador y día; también es el índice de
+            # las consultas por trabajador y rango de fechas.
+            models.UniqueConstraint(fields=["trabajador_rut", "fecha"], name="asistencia_rut_fecha_uniq"),
+        ]
 
     def __str__(self):
         return f"{self.trabajador_nombre} ({self.trabajador_rut}) - {self.fecha} ({self.estado})"
 
-class EficienciaTrabajador(models.Model):
+class EficienciaTrabajador(RegistroAPI):
    
     trabajador_rut = models.CharField(max_length=12)
     trabajador_nombre = models.CharField(max_length=120)
+    trabajador = models.ForeignKey(
+        Trabajador,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="eficiencias",
+    )
 
     id_eficiencia = models.IntegerField()
     trabajos_completados_en_1_mes = models.IntegerField(default=0)
     sueldo_promedio_informado = models.IntegerField(default=0)
 
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Última eficiencia de cada trabajador (core/eficiencia.py)
+            models.Index(fields=["trabajador_rut", "id"], name="eficiencia_rut_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.trabajador_nombre} ({self.trabajador_rut}) - efic {self.id_eficiencia}"
 
-class DesempenoTrabajador(models.Model):
+class DesempenoTrabajador(RegistroAPI):
    
     trabajador_rut = models.CharField(max_length=12)
     trabajador_nombre = models.CharField(max_length=120)
+    trabajador = models.ForeignKey(
+        Trabajador,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="desempenos",
+    )
 
     id_desempeno = models.IntegerField()
     forma_de_hacer_trabajos = models.CharField(max_length=255, blank=True)
     posibles_quejas = models.CharField(max_length=255, blank=True)    
 
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
     def __str__(self):
         return f"{self.trabajador_nombre} ({self.trabajador_rut}) - desp {self.id_desempeno}"
     
-class SueldoTrabajador(models.Model):
+class SueldoTrabajador(RegistroAPI):
    
     trabajador_rut = models.CharField(max_length=12)
     trabajador_nombre = models.CharField(max_length=120)   
+    trabajador = models.ForeignKey(
+        Trabajador,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="sueldos",
+    )
     mes = models.CharField(max_length=20, help_text="Mes de cálculo, por ejemplo: 2025-11")
     cantidad_trabajos_mes = models.PositiveIntegerField(default=0)
     tipo_trabajos_mes = models.CharField(max_length=255)
@@ -137,5 +218,118 @@ class SueldoTrabajador(models.Model):
         help_text="ID de eficiencia asociada (si aplica)."
     )
 
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            # Un sueldo por trabajador y mes: la clave del upsert de la
+            # nómina (core/nomina.py) y el índice de las consultas por mes.
+            models.UniqueConstraint(fields=["trabajador_rut", "mes"], name="sueldo_rut_mes_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.trabajador_nombre} ({self.trabajador_rut}) - {self.mes} (${self.sueldo_total_mes})"
+
+
+class ResumenMensual(models.Model):
+    """
+    Totales mensuales por trabajador, mantenidos por ``core.resumen`` al
+    escribir asistencias, accidentes y sueldos. La fila con
+    ``trabajador_rut=""`` guarda los accidentes del mes, que no están
+    asociados a un trabajador en particular.
+    """
+
+    mes = models.CharField(max_length=20, help_text="Mes, por ejemplo: 2025-11")
+    trabajador_rut = models.CharField(max_length=12, blank=True)
+    area = models.CharField(max_length=60, blank=True)
+
+    dias_registrados = models.PositiveIntegerField(default=0)
+    presentes = models.PositiveIntegerField(default=0)
+    ausentes = models.PositiveIntegerField(default=0)
+    licencias = models.PositiveIntegerField(default=0)
+    vacaciones = models.PositiveIntegerField(default=0)
+    minutos_atraso = models.PositiveIntegerField(default=0)
+    horas_extras = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+
+    accidentes_leve = models.PositiveIntegerField(default=0)
+    accidentes_moderada = models.PositiveIntegerField(default=0)
+    accidentes_grave = models.PositiveIntegerField(default=0)
+    accidentes_fatal = models.PositiveIntegerField(default=0)
+
+    sueldo_total_mes = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["mes", "trabajador_rut"]
+        constraints = [
+            models.UniqueConstraint(fields=["mes", "trabajador_rut"], name="resumen_mes_rut_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["area", "mes"], name="resumen_area_mes_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.mes} - {self.trabajador_rut or 'accidentes'}"
+
+
+class Cambio(models.Model):
+    """
+    Altas, modificaciones y eliminaciones de los modelos de la API, para la
+    sincronización incremental de ``/api/changes/``. Lo mantiene
+    ``core.cambios`` al confirmar cada transacción; ``id`` es el cursor.
+    """
+
+    GUARDADO = "guardado"
+    ELIMINADO = "eliminado"
+
+    recurso = models.CharField(max_length=20, help_text="Nombre del recurso en la API, por ejemplo: asistencias")
+    objeto_id = models.BigIntegerField()
+    operacion = models.CharField(max_length=10, help_text="guardado / eliminado")
+    momento = models.DateTimeField()
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["recurso", "id"], name="cambio_recurso_id_idx"),
+            models.Index(fields=["momento"], name="cambio_momento_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.recurso} {self.objeto_id} {self.operacion}"
+
+
+class Trabajo(models.Model):
+    """
+    Trabajo en segundo plano (recálculos, importaciones, reportes). Lo crea
+    ``core.trabajos.encolar`` y lo ejecuta ``manage.py runworker``.
+    """
+
+    PENDIENTE = "PENDIENTE"
+    EJECUTANDO = "EJECUTANDO"
+    COMPLETADO = "COMPLETADO"
+    FALLIDO = "FALLIDO"
+    CANCELADO = "CANCELADO"
+
+    tarea = models.CharField(max_length=50, help_text="Tarea registrada en core.tareas, por ejemplo: reconstruir_resumen")
+    parametros = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(max_length=10, default=PENDIENTE, help_text="PENDIENTE / EJECUTANDO / COMPLETADO / FALLIDO / CANCELADO")
+    progreso = models.FloatField(default=0, help_text="Avance de 0 a 1")
+    detalle = models.CharField(max_length=200, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    max_intentos = models.PositiveSmallIntegerField(default=3)
+    worker = models.CharField(max_length=100, blank=True, help_text="host:pid del runworker que lo ejecuta")
+    creado = models.DateTimeField(auto_now_add=True)
+    disponible_desde = models.DateTimeField(default=timezone.now, help_text="No se ejecuta antes (reintentos)")
+    iniciado = models.DateTimeField(null=True, blank=True)
+    terminado = models.DateTimeField(null=True, blank=True)
+    latido = models.DateTimeField(null=True, blank=True, help_text="Última señal del worker")
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["estado", "disponible_desde"], name="trabajo_estado_idx"),
+        ]
+
     def __str__(self):
-        return f"{self.trabajador_nombre} ({self.trabajador_rut}) - {self.mes} (${self.sueldo_total_mes})"
\ No newline at end of file
+        return f"#{self.id} {self.tarea} {self.estado}"
@@ -0,0 +1,175 @@
+# core/nomina.py
+"""
+Cálculo de la nómina mensual: genera ``SueldoTrabajador`` a partir de
+``Trabajador.sueldo_base`` y las asistencias del mes.
+
+El mes completo se calcula en una pasada: un GROUP BY por trabajador sobre
+las asistencias del mes, una consulta de los trabajadores y la aritmética
+sobre arreglos de numpy (sin consultas ni cálculos por trabajador). El
+resultado se guarda con el upsert de ``core.bulk`` sobre
+``(trabajador_rut, mes)``.
+
+Para cada trabajador con asistencias registradas en el mes (mes comercial
+de 30 días):
+
+- valor día = sueldo base / 30
+- valor hora = sueldo base × 28 / (30 × ``API_PAYROLL_WEEKLY_HOURS``)
+- se descuentan los días en ``API_PAYROLL_UNPAID_STATES`` y los anteriores
+  a la fecha de ingreso, a valor día;
+- se descuentan los minutos de atraso a valor hora;
+- se pagan las horas extras a valor hora × ``API_PAYROLL_OVERTIME_FACTOR``.
+
+Si hay 0 días pagados con asistencia el sueldo del mes es 0. Al crear un
+sueldo, ``cantidad_trabajos_mes`` parte con los días pagados y
+``tipo_trabajos_mes`` con el cargo; en un sueldo que ya existe sólo se
+actualiza el monto.
+"""
+import re
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from rest_framework.exceptions import ValidationError
+
+from . import cambios, resumen
+from .bulk import guardar_upsert
+from .models import Asistencia, SueldoTrabajador, Trabajador
+from .serializers import SueldoTrabajadorSerializer
+from .signals import registros_en_lote
+
+MES = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+DIAS_MES = 30
+# Campos que actualiza la nómina en un sueldo existente. Los trabajos del mes
+# (cantidad_trabajos_mes, tipo_trabajos_mes) e id_eficiencia_asociada se
+# ingresan a mano y se conservan; sólo se completan al crear la fila.
+CAMPOS = ("trabajador", "trabajador_nombre", "sueldo_total_mes", "updated_at")
+
+
+def requerir_numpy():
+    """``numpy``, o 400 si no está instalado (es una dependencia opcional)."""
+    try:
+        import numpy
+    except ImportError:
+        raise ValidationError({"detail": "Este cálculo requiere numpy (pip install numpy)."})
+    return numpy
+
+
+def validar_mes(mes):
+    if not isinstance(mes, str) or not MES.match(mes):
+        raise ValidationError({"mes": "Use el formato AAAA-MM, por ejemplo: 2025-11."})
+    return mes
+
+
+# ---------------------- datos ---------------------- #
+def _asistencias(mes):
+    return Asistencia.objects.filter(fecha__range=resumen.rango_mes(mes)).order_by()
+
+
+def _totales(mes):
+    """Totales del mes por trabajador, en una consulta."""
+    no_pagados = tuple(getattr(settings, "API_PAYROLL_UNPAID_STATES", ("AUSENTE",)))
+    return list(
+        _asistencias(mes)
+        .values("trabajador_rut")
+        .annotate(
+            dias=Count("id"),
+            no_pagados=Count("id", filter=Q(estado__in=no_pagados)),
+            minutos_atraso=Sum("minutos_atraso"),
+            horas_extras=Sum("horas_extras"),
+        )
+        .values_list("trabajador_rut", "dias", "no_pagados", "minutos_atraso", "horas_extras")
+    )
+
+
+def calcular(mes):
+    """
+    Sueldos de ``mes`` sin guardarlos: ``(trabajadores, arreglos)`` donde
+    ``trabajadores`` son las filas ``(id, rut, nombre, apellido, rol_cargo)``
+    y ``arreglos`` las columnas calculadas, alineadas con ellas.
+    """
+    np = requerir_numpy()
+    validar_mes(mes)
+    inicio, _fin = resumen.rango_mes(mes)
+
+    totales = {fila[0]: fila[1:] for fila in _totales(mes)}
+    trabajadores = list(
+        Trabajador.objects.filter(rut__in=_asistencias(mes).values("trabajador_rut"))
+        .order_by("rut")
+        .values_list("id", "rut", "nombre", "apellido", "rol_cargo", "sueldo_base", "fecha_ingreso")
+    )
+    n = len(trabajadores)
+
+    base = np.fromiter((t[5] for t in trabajadores), dtype=np.float64, count=n)
+    ingreso = np.array([t[6] for t in trabajadores], dtype="datetime64[D]")
+    dias, no_pagados, atraso, extras = (
+        np.array([totales[t[1]] for t in trabajadores], dtype=np.float64).reshape(n, 4).T
+    )
+
+    horas_semanales = getattr(settings, "API_PAYROLL_WEEKLY_HOURS", 44)
+    factor = getattr(settings, "API_PAYROLL_OVERTIME_FACTOR", 1.5)
+    valor_dia = base / DIAS_MES
+    valor_hora = base * 28 / (DIAS_MES * horas_semanales)
+
+    antes_del_ingreso = np.clip((ingreso - np.datetime64(inicio, "D")).astype(np.int64), 0, DIAS_MES)
+    descontados = np.minimum(no_pagados + antes_del_ingreso, DIAS_MES).astype(np.int64)
+    pagados = (dias - no_pagados).astype(np.int64)
+
+    total = base - descontados * valor_dia - atraso / 60 * valor_hora + extras * valor_hora * factor
+    total = np.where(pagados > 0, np.maximum(total, 0), 0).round(2)
+
+    return trabajadores, {
+        "dias": dias.astype(np.int64),
+        "pagados": pagados,
+        "descontados": descontados,
+        "minutos_atraso": atraso,
+        "horas_extras": extras,
+        "sueldo_total_mes": total,
+    }
+
+
+# ---------------------- escritura ---------------------- #
+def generar(mes, avance=None):
+    """
+    Calcula y guarda la nómina de ``mes``. Devuelve el informe
+    ``{"mes", "trabajadores", "total", "segundos_calculo", "segundos"}``.
+    ``avance(guardados, total)`` se llama después de cada bloque.
+    """
+    inicio = time.perf_counter()
+    trabajadores, arreglos = calcular(mes)
+    calculo = time.perf_counter() - inicio
+
+    objs = [
+        SueldoTrabajador(
+            trabajador_id=id_,
+            trabajador_rut=rut,
+            trabajador_nombre=f"{nombre} {apellido}",
+            mes=mes,
+            cantidad_trabajos_mes=pagados,
+            tipo_trabajos_mes=rol_cargo,
+            sueldo_total_mes=Decimal(f"{total:.2f}"),
+        )
+        for (id_, rut, nombre, apellido, rol_cargo, *_), pagados, total in zip(
+            trabajadores, arreglos["pagados"].tolist(), arreglos["sueldo_total_mes"].tolist(),
+        )
+    ]
+
+    bloque = getattr(settings, "API_IMPORT_CHUNK_SIZE", 2000)
+    with transaction.atomic(), resumen.agrupar(), cambios.agrupar():
+        for desde in range(0, len(objs), bloque):
+            guardados = guardar_upsert(
+                SueldoTrabajador, objs[desde:desde + bloque], SueldoTrabajadorSerializer.unique_key, campos=CAMPOS,
+            )
+            registros_en_lote.send(sender=SueldoTrabajador, instancias=guardados)
+            if avance is not None:
+                avance(desde + len(guardados), len(objs))
+
+    return {
+        "mes": mes,
+        "trabajadores": len(objs),
+        "total": str(sum((obj.sueldo_total_mes for obj in objs), Decimal(0))),
+        "segundos_calculo": round(calculo, 3),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
@@ -0,0 +1,140 @@
+# core/pagination.py
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor opaco (keyset / "seek method").
+
+    En vez de OFFSET, cada página filtra por los valores de la última fila
+    entregada, así el costo de pedir la página N es el mismo que el de la
+    primera. El ``ordering`` debe terminar en un campo único (normalmente
+    ``id``) para que el orden sea total.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def __init__(self, ordering=("id",)):
+        self.ordering = tuple(ordering)
+        self.page_size = api_settings.PAGE_SIZE or 100
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 1000)
+        self.next_position = None
+
+    # ---------------------- cursor ---------------------- #
+    def encode_cursor(self, position):
+        raw = json.dumps(position, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            position = json.loads(raw)
+        except (TypeError, ValueError):
+            raise NotFound("Cursor inválido.")
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound("Cursor inválido.")
+        return position
+
+    # ---------------------- keyset ---------------------- #
+    def _fields(self, model):
+        return [
+            (name.lstrip("-"), name.startswith("-"), model._meta.get_field(name.lstrip("-")))
+            for name in self.ordering
+        ]
+
+    def _after(self, model, position):
+        """
+        Construye ``(a > x) OR (a = x AND b > y) OR ...`` respetando el
+        sentido de cada campo del ordering.
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending, field), value in zip(self._fields(model), position):
+            try:
+                value = field.to_python(value)
+            except ValidationError:
+                raise NotFound("Cursor inválido.")
+            lookup = "lt" if descending else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _position(self, row, model):
+        position = []
+        for name, _descending, field in self._fields(model):
+            position.append(row[name] if isinstance(row, dict) else getattr(row, field.attname))
+        return position
+
+    # ---------------------- API DRF ---------------------- #
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def _consulta(self, queryset, request):
+        self.request = request
+        self._size = self.get_page_size(request)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self._after(queryset.model, position))
+        return queryset.order_by(*self.ordering)[: self._size + 1]
+
+    def _pagina(self, rows, model):
+        if len(rows) > self._size:
+            rows = rows[: self._size]
+            self.next_position = self._position(rows[-1], model)
+        else:
+            self.next_position = None
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self._pagina(list(self._consulta(queryset, request)), queryset.model)
+
+    async def apaginate_queryset(self, queryset, request):
+        """Igual que ``paginate_queryset`` pero con iteración async del ORM."""
+        rows = [row async for row in self._consulta(queryset, request)]
+        return self._pagina(rows, queryset.model)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
@@ -0,0 +1,252 @@
+# core/resumen.py
+"""
+Mantenimiento de ``ResumenMensual``.
+
+Cada escritura en Asistencia, Accidente o SueldoTrabajador marca las
+claves ``(mes, trabajador_rut)`` afectadas y, al confirmar la transacción,
+sólo esas claves se recalculan con GROUP BY sobre los índices por
+trabajador y fecha. Una escritura de una fila cuesta tres consultas: el
+GROUP BY de asistencias, el de sueldos (o el de accidentes) y el upsert.
+``reconstruir()`` recalcula la tabla completa.
+"""
+import threading
+from calendar import monthrange
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncMonth
+
+from rest_framework.exceptions import ValidationError
+
+from .models import Accidente, Asistencia, ResumenMensual, SueldoTrabajador, Trabajador
+
+ESTADOS = {
+    "PRESENTE": "presentes",
+    "AUSENTE": "ausentes",
+    "LICENCIA": "licencias",
+    "VACACIONES": "vacaciones",
+}
+GRAVEDADES = {
+    "LEVE": "accidentes_leve",
+    "MODERADA": "accidentes_moderada",
+    "GRAVE": "accidentes_grave",
+    "FATAL": "accidentes_fatal",
+}
+CLAVE = ("mes", "trabajador_rut")
+
+_local = threading.local()
+
+
+def mes_de(fecha):
+    if isinstance(fecha, str):
+        return fecha[:7]
+    return f"{fecha:%Y-%m}"
+
+
+def rango_mes(mes):
+    anio, numero = (int(x) for x in mes[:7].split("-"))
+    return date(anio, numero, 1), date(anio, numero, monthrange(anio, numero)[1])
+
+
+# ---------------------- agregación ---------------------- #
+def _agregar(asistencias, accidentes, sueldos):
+    """Agrupa los tres querysets por (mes, trabajador_rut) en SQL."""
+    filas = {}
+
+    def fila(mes, rut):
+        return filas.setdefault((mes, rut), {})
+
+    por_estado = {
+        campo: Count("id", filter=Q(estado=estado)) for estado, campo in ESTADOS.items()
+    }
+    # El área se lee con una subconsulta por grupo en vez de otra consulta
+    area = Subquery(Trabajador.objects.filter(rut=OuterRef("trabajador_rut")).values("area")[:1])
+    asistencias = (
+        asistencias.order_by()
+        .annotate(periodo=TruncMonth("fecha"))
+        .values("periodo", "trabajador_rut")
+        .annotate(
+            dias_registrados=Count("id"),
+            minutos_atraso=Sum("minutos_atraso"),
+            horas_extras=Sum("horas_extras"),
+            area=area,
+            **por_estado,
+        )
+    )
+    for r in asistencias:
+        fila(mes_de(r.pop("periodo")), r.pop("trabajador_rut")).update(r)
+
+    por_gravedad = {
+        campo: Count("id", filter=Q(gravedad=gravedad)) for gravedad, campo in GRAVEDADES.items()
+    }
+    accidentes = (
+        accidentes.order_by()
+        .annotate(periodo=TruncMonth("fecha"))
+        .values("periodo")
+        .annotate(**por_gravedad)
+    )
+    for r in accidentes:
+        fila(mes_de(r.pop("periodo")), "").update(r)
+
+    sueldos = (
+        sueldos.order_by()
+        .values("mes", "trabajador_rut")
+        .annotate(sueldo_total_mes=Sum("sueldo_total_mes"), area=area)
+    )
+    for r in sueldos:
+        fila(r.pop("mes"), r.pop("trabajador_rut")).update(r)
+
+    return [
+        ResumenMensual(
+            mes=mes,
+            trabajador_rut=rut,
+            **{k: (v if v is not None else ("" if k == "area" else 0)) for k, v in valores.items()},
+        )
+        for (mes, rut), valores in filas.items()
+    ]
+
+
+def _vacia(obj):
+    campos = [f.name for f in ResumenMensual._meta.concrete_fields if f.name not in ("id", "mes", "trabajador_rut", "area")]
+    return all(getattr(obj, c) in (0, Decimal(0), None) for c in campos)
+
+
+def recalcular(claves):
+    """
+    Recalcula las filas de ``ResumenMensual`` para ``{(mes, rut), ...}``:
+    un GROUP BY por tabla de origen y mes, y un solo upsert sin relectura
+    (las filas que quedan vacías se eliminan con un DELETE).
+    """
+    from .bulk import guardar_upsert
+
+    claves = {c for c in claves if c and c[0]}
+    por_mes = {}
+    for mes, rut in claves:
+        por_mes.setdefault(mes, set()).add(rut)
+
+    nuevas = []
+    for mes, ruts in por_mes.items():
+        try:
+            inicio, fin = rango_mes(mes)
+        except ValueError:
+            continue
+        con_rut = ruts - {""}
+        nuevas += _agregar(
+            Asistencia.objects.filter(trabajador_rut__in=con_rut, fecha__range=(inicio, fin)) if con_rut else Asistencia.objects.none(),
+            Accidente.objects.filter(fecha__range=(inicio, fin)) if "" in ruts else Accidente.objects.none(),
+            SueldoTrabajador.objects.filter(trabajador_rut__in=con_rut, mes=mes) if con_rut else SueldoTrabajador.objects.none(),
+        )
+
+    guardar = [obj for obj in nuevas if not _vacia(obj)]
+    vacias = claves - {(obj.mes, obj.trabajador_rut) for obj in guardar}
+    if vacias:
+        condicion = Q()
+        for mes, rut in vacias:
+            condicion |= Q(mes=mes, trabajador_rut=rut)
+        ResumenMensual.objects.filter(condicion).delete()
+    if guardar:
+        guardar_upsert(ResumenMensual, guardar, CLAVE, releer=False)
+
+
+def reconstruir(batch_size=1000):
+    """Recalcula la tabla completa. Devuelve la cantidad de filas generadas."""
+    filas = _agregar(Asistencia.objects.all(), Accidente.objects.all(), SueldoTrabajador.objects.all())
+    with transaction.atomic():
+        ResumenMensual.objects.all().delete()
+        ResumenMensual.objects.bulk_create(filas, batch_size=batch_size)
+    return len(filas)
+
+
+AGRUPACIONES = {"mes": "mes", "area": "area", "trabajador": "trabajador_rut"}
+METRICAS = (
+    "dias_registrados", "presentes", "ausentes", "licencias", "vacaciones",
+    "minutos_atraso", "horas_extras",
+    "accidentes_leve", "accidentes_moderada", "accidentes_grave", "accidentes_fatal",
+    "sueldo_total_mes",
+)
+
+
+def consultar(params):
+    """
+    Totales de ``ResumenMensual`` agrupados según ``?agrupar=mes,area,trabajador``
+    (por defecto ``mes``), filtrados por ``?desde=``/``?hasta=`` (AAAA-MM),
+    ``?area=`` y ``?trabajador_rut=``.
+    """
+    agrupar = [a.strip() for a in params.get("agrupar", "mes").split(",") if a.strip()]
+    invalidos = [a for a in agrupar if a not in AGRUPACIONES]
+    if invalidos or not agrupar:
+        raise ValidationError({"agrupar": f"Use uno o más de: {', '.join(AGRUPACIONES)}."})
+    columnas = [AGRUPACIONES[a] for a in agrupar]
+
+    queryset = ResumenMensual.objects.all()
+    for param, lookup in (("desde", "mes__gte"), ("hasta", "mes__lte")):
+        valor = params.get(param)
+        if valor:
+            try:
+                rango_mes(valor)
+            except ValueError:
+                raise ValidationError({param: "Use el formato AAAA-MM."})
+            queryset = queryset.filter(**{lookup: valor[:7]})
+    for campo in ("area", "trabajador_rut"):
+        if params.get(campo):
+            queryset = queryset.filter(**{campo: params[campo]})
+
+    return list(
+        queryset.order_by()
+        .values(*columnas)
+        .annotate(**{m: Sum(m) for m in METRICAS})
+        .order_by(*columnas)
+    )
+
+
+# ---------------------- marcado de cambios ---------------------- #
+def marcar(claves):
+    """
+    Programa el recálculo de ``claves`` al confirmar la transacción actual.
+    Dentro de ``agrupar()`` las claves se acumulan y se recalculan una vez.
+    """
+    claves = {c for c in claves if c}
+    if not claves:
+        return
+    lote = getattr(_local, "lote", None)
+    if lote is not None:
+        lote |= claves
+    else:
+        transaction.on_commit(partial(recalcular, claves))
+
+
+@contextmanager
+def agrupar():
+    """Acumula las claves marcadas en el bloque y las recalcula juntas."""
+    if getattr(_local, "lote", None) is not None:
+        yield
+        return
+    _local.lote = set()
+    try:
+        yield
+    finally:
+        claves, _local.lote = _local.lote, None
+        marcar(claves)
+
+
+def clave(instancia):
+    """
+    Clave ``(mes, trabajador_rut)`` de una instancia, o ``None`` si los
+    campos necesarios no están cargados (p. ej. con ``.only()``).
+    """
+    datos = instancia.__dict__
+    if isinstance(instancia, Accidente):
+        return (mes_de(datos["fecha"]), "") if datos.get("fecha") else None
+    if isinstance(instancia, Asistencia):
+        if datos.get("fecha") and "trabajador_rut" in datos:
+            return (mes_de(datos["fecha"]), datos["trabajador_rut"])
+        return None
+    if isinstance(instancia, SueldoTrabajador):
+        if datos.get("mes") and "trabajador_rut" in datos:
+            return (datos["mes"], datos["trabajador_rut"])
+        return None
+    return None
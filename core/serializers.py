@@ -1,7 +1,24 @@
 # core/serializers.py
 from rest_framework import serializers
 from .models import ( Trabajador, TipoTrabajador, Asistencia,  Accidente,  EficienciaTrabajador,  DesempenoTrabajador,  SueldoTrabajador,
+    Trabajo,
 )
+from .trabajos import TAREAS
+
+# ------------------------- Base ---------------------------- #
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer que acepta ``fields=[...]`` para entregar sólo un
+    subconjunto de campos (``?fields=`` en los listados).
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for nombre in set(self.fields) - set(fields):
+                self.fields.pop(nombre)
+
 
 # ---------------------- TipoTrabajador ---------------------- #
 class TipoTrabajadorSerializer(serializers.ModelSerializer):
@@ -21,7 +38,7 @@ class TipoTrabajadorSerializer(serializers.ModelSerializer):
 
 
 # ------------------------ Trabajador ------------------------ #
-class TrabajadorSerializer(serializers.ModelSerializer):
+class TrabajadorSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Trabajador
         fields = "__all__"
@@ -72,11 +89,118 @@ class TrabajadorSerializer(serializers.ModelSerializer):
         return attrs
 
 
+# ------------------- Registros por trabajador ------------------- #
+class TrabajadorRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    FK a Trabajador que usa ``context["trabajadores_por_id"]`` cuando existe,
+    para que validar un lote no haga una consulta por fila.
+    """
+
+    def to_internal_value(self, data):
+        por_id = self.context.get("trabajadores_por_id")
+        if por_id is None:
+            return super().to_internal_value(data)
+        try:
+            return por_id[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class RegistroTrabajadorSerializer(DynamicFieldsModelSerializer):
+    """
+    Base de los registros históricos que apuntan a un Trabajador
+    (asistencia, eficiencia, desempeño y sueldo).
+
+    Acepta ``trabajador`` (id) o ``trabajador_rut``: si llega sólo el RUT se
+    vincula la FK buscando el trabajador; si llega sólo la FK se completan
+    ``trabajador_rut`` y ``trabajador_nombre``. Para cargas masivas se puede
+    pasar ``context["trabajadores_por_rut"]`` ya resuelto y evitar una
+    consulta por fila.
+
+    ``unique_key`` indica las columnas que identifican un registro (p. ej.
+    ``("trabajador_rut", "fecha")``). La unicidad se valida en ``validate``
+    porque el RUT puede venir de la FK; las subclases que lo usan deben
+    declarar ``Meta.validators = []`` para desactivar el validador
+    automático de DRF. Con ``context["verificar_unicidad"] = False`` (lotes
+    y upserts) se deja a la restricción de la base de datos.
+    """
+
+    serializer_related_field = TrabajadorRelatedField
+    unique_key = ()
+
+    def get_extra_kwargs(self):
+        extra_kwargs = super().get_extra_kwargs()
+        for campo in ("trabajador_rut", "trabajador_nombre"):
+            extra_kwargs.setdefault(campo, {}).setdefault("required", False)
+        return extra_kwargs
+
+    def _buscar_trabajador(self, rut):
+        por_rut = self.context.get("trabajadores_por_rut")
+        if por_rut is not None:
+            return por_rut.get(rut)
+        return Trabajador.objects.filter(rut=rut).first()
+
+    def validate(self, attrs):
+        trabajador = attrs.get("trabajador")
+        rut = attrs.get("trabajador_rut")
+
+        if trabajador is not None:
+            if rut and rut != trabajador.rut:
+                raise serializers.ValidationError(
+                    "El RUT no coincide con el trabajador indicado."
+                )
+            attrs["trabajador_rut"] = trabajador.rut
+            if not attrs.get("trabajador_nombre"):
+                attrs["trabajador_nombre"] = f"{trabajador.nombre} {trabajador.apellido}"
+        elif rut:
+            if "trabajador" not in attrs:
+                attrs["trabajador"] = self._buscar_trabajador(rut)
+        elif self.instance is None:
+            raise serializers.ValidationError(
+                "Debe indicar el trabajador o su RUT."
+            )
+
+        if self.instance is None and not attrs.get("trabajador_nombre"):
+            if attrs.get("trabajador") is None:
+                raise serializers.ValidationError(
+                    {"trabajador_nombre": "Este campo es requerido."}
+                )
+            t = attrs["trabajador"]
+            attrs["trabajador_nombre"] = f"{t.nombre} {t.apellido}"
+
+        if self.unique_key and self.context.get("verificar_unicidad", True):
+            self._validar_unicidad(attrs)
+        return attrs
+
+    def _validar_unicidad(self, attrs):
+        clave = {}
+        for campo in self.unique_key:
+            if campo in attrs:
+                clave[campo] = attrs[campo]
+            elif self.instance is not None:
+                clave[campo] = getattr(self.instance, campo)
+            else:
+                return
+
+        existentes = self.Meta.model.objects.filter(**clave)
+        if self.instance is not None:
+            existentes = existentes.exclude(pk=self.instance.pk)
+        if existentes.exists():
+            raise serializers.ValidationError(
+                f"Ya existe un registro con los mismos {', '.join(self.unique_key)}."
+            )
+
+
 # ------------------------ Asistencia ------------------------ #
-class AsistenciaSerializer(serializers.ModelSerializer):
+class AsistenciaSerializer(RegistroTrabajadorSerializer):
+    unique_key = ("trabajador_rut", "fecha")
+
     class Meta:
         model = Asistencia
         fields = "__all__"
+        validators = []
 
     def validate_estado(self, value):
         estados_validos = ["PRESENTE", "AUSENTE", "LICENCIA", "VACACIONES"]
@@ -106,6 +230,7 @@ class AsistenciaSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, attrs):
+        attrs = super().validate(attrs)
         entrada = attrs.get("hora_entrada")
         salida = attrs.get("hora_salida")
 
@@ -117,7 +242,7 @@ class AsistenciaSerializer(serializers.ModelSerializer):
 
 
 # ------------------------ Accidente ------------------------- #
-class AccidenteSerializer(serializers.ModelSerializer):
+class AccidenteSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Accidente
         fields = "__all__"
@@ -153,7 +278,7 @@ class AccidenteSerializer(serializers.ModelSerializer):
 
 
 # ------------------ EficienciaTrabajador -------------------- #
-class EficienciaTrabajadorSerializer(serializers.ModelSerializer):
+class EficienciaTrabajadorSerializer(RegistroTrabajadorSerializer):
     class Meta:
         model = EficienciaTrabajador
         fields = "__all__"
@@ -179,7 +304,7 @@ class EficienciaTrabajadorSerializer(serializers.ModelSerializer):
 
 
 # ------------------ DesempenoTrabajador --------------------- #
-class DesempenoTrabajadorSerializer(serializers.ModelSerializer):
+class DesempenoTrabajadorSerializer(RegistroTrabajadorSerializer):
     class Meta:
         model = DesempenoTrabajador
         fields = "__all__"
@@ -191,10 +316,13 @@ class DesempenoTrabajadorSerializer(serializers.ModelSerializer):
 
 
 # --------------------- SueldoTrabajador --------------------- #
-class SueldoTrabajadorSerializer(serializers.ModelSerializer):
+class SueldoTrabajadorSerializer(RegistroTrabajadorSerializer):
+    unique_key = ("trabajador_rut", "mes")
+
     class Meta:
         model = SueldoTrabajador
         fields = "__all__"
+        validators = []
 
     def validate_mes(self, value):
        
@@ -219,10 +347,31 @@ class SueldoTrabajadorSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, attrs):
-   
+        attrs = super().validate(attrs)
         trabajos = attrs.get("cantidad_trabajos_mes", 0)
         if trabajos == 0 and attrs.get("sueldo_total_mes", 0) > 0:
             raise serializers.ValidationError(
                 "Si no hay trabajos en el mes, el sueldo total debería ser 0."
             )
         return attrs
+
+
+# ------------------------- Trabajo ------------------------- #
+class TrabajoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Trabajo
+        fields = "__all__"
+        read_only_fields = [
+            "estado", "progreso", "detalle", "resultado", "error", "intentos", "worker",
+            "creado", "disponible_desde", "iniciado", "terminado", "latido",
+        ]
+
+    def validate_tarea(self, value):
+        if value not in TAREAS:
+            raise serializers.ValidationError(f"Use una de: {', '.join(sorted(TAREAS))}.")
+        return value
+
+    def validate_parametros(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Los parámetros deben ser un objeto JSON.")
+        return value
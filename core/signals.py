@@ -0,0 +1,149 @@
+# core/signals.py
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from . import cache, cambios, metricas, resumen
+from .authentication import olvidar_tokens
+from .models import (
+    Trabajador, Asistencia, Accidente,
+    EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador, ResumenMensual, Cambio
+)
+
+# Enviada por las escrituras en lote (bulk_create / bulk_update / upsert),
+# que no disparan post_save. Argumentos: ``instancias``.
+registros_en_lote = Signal()
+
+MODELOS_API = (
+    Trabajador, Asistencia, Accidente,
+    EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador,
+)
+MODELOS_RESUMEN = (Asistencia, Accidente, SueldoTrabajador)
+# Al eliminar un Trabajador, la FK de estos modelos pasa a NULL con un
+# UPDATE que no emite señales.
+MODELOS_CON_TRABAJADOR = (Asistencia, EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador)
+
+
+# ---------------------- caché de respuestas ---------------------- #
+def _invalidar_cache(sender, **kwargs):
+    # También al confirmar: una lectura concurrente pudo guardar en caché
+    # datos previos al commit bajo la versión recién creada.
+    cache.invalidar(sender)
+    transaction.on_commit(partial(cache.invalidar, sender))
+
+
+for _modelo in MODELOS_API:
+    post_save.connect(_invalidar_cache, sender=_modelo)
+    post_delete.connect(_invalidar_cache, sender=_modelo)
+    registros_en_lote.connect(_invalidar_cache, sender=_modelo)
+
+
+@receiver(post_delete, sender=Trabajador)
+def _invalidar_cache_relacionados(sender, **kwargs):
+    for modelo in MODELOS_CON_TRABAJADOR:
+        cache.invalidar(modelo)
+
+
+@receiver(pre_delete, sender=Trabajador)
+def _tocar_relacionados(sender, instance, **kwargs):
+    # El UPDATE que deja la FK en NULL no cambia updated_at: sin esto el
+    # ETag de los listados (MAX(updated_at), COUNT) seguiría igual.
+    ahora = timezone.now()
+    for modelo in MODELOS_CON_TRABAJADOR:
+        modelo.objects.filter(trabajador=instance).update(updated_at=ahora)
+
+
+# ---------------------- ResumenMensual ---------------------- #
+def _recordar_clave(sender, instance, **kwargs):
+    instance._clave_resumen = resumen.clave(instance)
+
+
+def _resumen_guardado(sender, instance, **kwargs):
+    nueva = resumen.clave(instance)
+    resumen.marcar({getattr(instance, "_clave_resumen", None), nueva})
+    instance._clave_resumen = nueva
+
+
+def _resumen_eliminado(sender, instance, **kwargs):
+    resumen.marcar({resumen.clave(instance)})
+
+
+def _resumen_en_lote(sender, instancias, **kwargs):
+    claves = set()
+    for instance in instancias:
+        nueva = resumen.clave(instance)
+        claves |= {getattr(instance, "_clave_resumen", None), nueva}
+        instance._clave_resumen = nueva
+    resumen.marcar(claves)
+
+
+for _modelo in MODELOS_RESUMEN:
+    post_init.connect(_recordar_clave, sender=_modelo)
+    post_save.connect(_resumen_guardado, sender=_modelo)
+    post_delete.connect(_resumen_eliminado, sender=_modelo)
+    registros_en_lote.connect(_resumen_en_lote, sender=_modelo)
+
+
+@receiver(post_init, sender=Trabajador)
+def _recordar_area(sender, instance, **kwargs):
+    instance._area_original = instance.__dict__.get("area")
+
+
+@receiver(post_save, sender=Trabajador)
+def _actualizar_area_resumen(sender, instance, created, **kwargs):
+    if not created and instance._area_original != instance.area:
+        ResumenMensual.objects.filter(trabajador_rut=instance.rut).update(area=instance.area)
+    instance._area_original = instance.area
+
+
+# ---------------------- registro de cambios ---------------------- #
+def _cambio_guardado(sender, instance, **kwargs):
+    cambios.marcar(sender, [instance.pk], Cambio.GUARDADO)
+
+
+def _cambio_eliminado(sender, instance, **kwargs):
+    cambios.marcar(sender, [instance.pk], Cambio.ELIMINADO)
+
+
+def _cambios_en_lote(sender, instancias, **kwargs):
+    cambios.marcar(sender, [instance.pk for instance in instancias], Cambio.GUARDADO)
+
+
+for _modelo in MODELOS_API:
+    post_save.connect(_cambio_guardado, sender=_modelo)
+    post_delete.connect(_cambio_eliminado, sender=_modelo)
+    registros_en_lote.connect(_cambios_en_lote, sender=_modelo)
+
+
+@receiver(pre_delete, sender=Trabajador)
+def _cambios_relacionados(sender, instance, **kwargs):
+    # El UPDATE que deja la FK en NULL no emite señales: se registran antes
+    for modelo in MODELOS_CON_TRABAJADOR:
+        pks = list(modelo.objects.filter(trabajador=instance).values_list("pk", flat=True))
+        cambios.marcar(modelo, pks, Cambio.GUARDADO)
+
+
+# ---------------------- caché de autenticación ---------------------- #
+@receiver(post_delete, sender=Token)
+def _olvidar_token(sender, instance, **kwargs):
+    olvidar_tokens(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def _olvidar_tokens_usuario(sender, instance, **kwargs):
+    keys = list(Token.objects.filter(user=instance).values_list("key", flat=True))
+    if keys:
+        olvidar_tokens(*keys)
+
+
+# ---------------------- métricas ---------------------- #
+@receiver(connection_created)
+def _medir_consultas(sender, connection, **kwargs):
+    metricas.instalar(connection)
@@ -0,0 +1,157 @@
+# core/stats.py
+"""
+Estadísticas calculadas en la base de datos con ``annotate``/``aggregate``:
+la API devuelve sólo los totales agrupados, nunca las filas.
+"""
+import math
+from datetime import date
+
+from django.db.models import Avg, Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from rest_framework.exceptions import ValidationError
+
+from .models import Accidente, Asistencia, SueldoTrabajador
+from .nomina import MES
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _fecha(params, nombre):
+    valor = params.get(nombre)
+    if not valor:
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise ValidationError({nombre: "Use el formato AAAA-MM-DD."})
+
+
+def _mes(params, nombre):
+    valor = params.get(nombre)
+    if not valor:
+        return None
+    if not MES.match(valor):
+        raise ValidationError({nombre: "Use el formato AAAA-MM, por ejemplo: 2025-11."})
+    return valor
+
+
+def _rango(queryset, params, campo="fecha"):
+    desde, hasta = _fecha(params, "desde"), _fecha(params, "hasta")
+    if desde:
+        queryset = queryset.filter(**{f"{campo}__gte": desde})
+    if hasta:
+        queryset = queryset.filter(**{f"{campo}__lte": hasta})
+    return queryset
+
+
+def entero(params, nombre, default, maximo):
+    """``params[nombre]`` como entero entre 1 y ``maximo``; 400 si no es un número."""
+    try:
+        valor = int(params.get(nombre, default))
+    except ValueError:
+        raise ValidationError({nombre: "Debe ser un número entero."})
+    return max(1, min(valor, maximo))
+
+
+def asistencia_por_grupo(params):
+    """Tasa de asistencia agrupada por ``?agrupar=area,turno`` del trabajador."""
+    columnas = {"area": F("trabajador__area"), "turno": F("trabajador__turno")}
+    agrupar = [a.strip() for a in params.get("agrupar", "area,turno").split(",") if a.strip()]
+    if not agrupar or any(a not in columnas for a in agrupar):
+        raise ValidationError({"agrupar": f"Use uno o más de: {', '.join(columnas)}."})
+
+    filas = (
+        _rango(Asistencia.objects.order_by(), params)
+        .values(**{a: columnas[a] for a in agrupar})
+        .annotate(
+            registros=Count("id"),
+            presentes=Count("id", filter=Q(estado="PRESENTE")),
+            ausentes=Count("id", filter=Q(estado="AUSENTE")),
+            licencias=Count("id", filter=Q(estado="LICENCIA")),
+            vacaciones=Count("id", filter=Q(estado="VACACIONES")),
+        )
+        .order_by(*agrupar)
+    )
+    resultados = []
+    for fila in filas:
+        fila["tasa_asistencia"] = round(fila["presentes"] / fila["registros"], 4) if fila["registros"] else None
+        resultados.append(fila)
+    return resultados
+
+
+def atraso_por_trabajador(params):
+    """Promedio de minutos de atraso por trabajador, de mayor a menor."""
+    limite = entero(params, "limite", 50, 1000)
+    return list(
+        _rango(Asistencia.objects.order_by(), params)
+        .values("trabajador_rut")
+        .annotate(
+            trabajador_nombre=Max("trabajador_nombre"),
+            registros=Count("id"),
+            minutos_atraso_total=Sum("minutos_atraso"),
+            minutos_atraso_promedio=Avg("minutos_atraso"),
+        )
+        .order_by("-minutos_atraso_promedio", "trabajador_rut")[:limite]
+    )
+
+
+def accidentes_por_mes(params):
+    """Cantidad, costo y días de licencia de accidentes por mes (y gravedad)."""
+    columnas = ["mes"]
+    if params.get("por_gravedad"):
+        columnas.append("gravedad")
+    filas = (
+        _rango(Accidente.objects.order_by(), params)
+        .annotate(mes=TruncMonth("fecha"))
+        .values(*columnas)
+        .annotate(
+            accidentes=Count("id"),
+            costo_total=Sum("costo_estimado"),
+            costo_promedio=Avg("costo_estimado"),
+            dias_licencia=Sum("dias_licencia"),
+        )
+        .order_by(*columnas)
+    )
+    return [dict(fila, mes=f"{fila['mes']:%Y-%m}") for fila in filas]
+
+
+def distribucion_sueldos(params):
+    """
+    Mínimo, máximo, promedio y percentiles de ``sueldo_total_mes``.
+
+    Los percentiles usan el método del rango más cercano: el percentil ``p``
+    de ``n`` sueldos es el de la posición ``ceil(p/100 * n)`` en orden
+    ascendente (el mínimo para ``p=0``). Cada uno se obtiene con una consulta
+    ``ORDER BY ... LIMIT 1 OFFSET k``, sin traer las filas.
+    ``?desde=``/``?hasta=`` filtran por mes (AAAA-MM) y ``?area=`` por el
+    área del trabajador.
+    """
+    queryset = SueldoTrabajador.objects.order_by()
+    for nombre, lookup in (("desde", "mes__gte"), ("hasta", "mes__lte")):
+        mes = _mes(params, nombre)
+        if mes:
+            queryset = queryset.filter(**{lookup: mes})
+    if params.get("area"):
+        queryset = queryset.filter(trabajador__area=params["area"])
+
+    try:
+        percentiles = [int(p) for p in params.get("percentiles", "").split(",") if p] or PERCENTILES
+    except ValueError:
+        raise ValidationError({"percentiles": "Use una lista de enteros, por ejemplo 10,50,90."})
+    if any(not 0 <= p <= 100 for p in percentiles):
+        raise ValidationError({"percentiles": "Los percentiles deben estar entre 0 y 100."})
+
+    resumen = queryset.aggregate(
+        registros=Count("id"),
+        minimo=Min("sueldo_total_mes"),
+        maximo=Max("sueldo_total_mes"),
+        promedio=Avg("sueldo_total_mes"),
+        total=Sum("sueldo_total_mes"),
+    )
+    n = resumen["registros"]
+    ordenados = queryset.order_by("sueldo_total_mes").values_list("sueldo_total_mes", flat=True)
+    resumen["percentiles"] = {
+        str(p): (ordenados[max(math.ceil(p / 100 * n), 1) - 1] if n else None) for p in percentiles
+    }
+    return resumen
@@ -0,0 +1,144 @@
+# core/streaming.py
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import fastpath
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+def _siguiente(lote):
+    return lote[-1]["id"] if isinstance(lote[-1], dict) else lote[-1].pk
+
+
+def iterar_por_lotes(queryset, chunk_size):
+    """
+    Recorre el queryset en lotes ordenados por ``pk`` usando ``pk > último``.
+
+    Cada lote es una consulta acotada, así la memoria no depende del tamaño
+    de la tabla aunque el driver (p. ej. mysqlclient) cargue el resultado
+    completo de cada consulta en el cliente.
+    """
+    queryset = queryset.order_by("pk")
+    ultimo = None
+    while True:
+        lote = queryset if ultimo is None else queryset.filter(pk__gt=ultimo)
+        lote = list(lote[:chunk_size])
+        if not lote:
+            return
+        yield lote
+        if len(lote) < chunk_size:
+            return
+        ultimo = _siguiente(lote)
+
+
+async def aiterar_por_lotes(queryset, chunk_size):
+    """Versión async de ``iterar_por_lotes``."""
+    queryset = queryset.order_by("pk")
+    ultimo = None
+    while True:
+        lote = queryset if ultimo is None else queryset.filter(pk__gt=ultimo)
+        lote = [fila async for fila in lote[:chunk_size]]
+        if not lote:
+            return
+        yield lote
+        if len(lote) < chunk_size:
+            return
+        ultimo = _siguiente(lote)
+
+
+def _serializador(queryset, serializer_class, fields):
+    """``(queryset, serializar)`` donde ``serializar`` convierte un lote en dicts."""
+    if fastpath.habilitada(serializer_class):
+        return fastpath.valores(queryset, serializer_class, fields, extra=("id",))
+    return queryset, lambda lote: serializer_class(lote, many=True, fields=fields).data
+
+
+def _filas(queryset, serializer_class, chunk_size, fields):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    queryset, serializar = _serializador(queryset, serializer_class, fields)
+    for lote in iterar_por_lotes(queryset, chunk_size):
+        for fila in serializar(lote):
+            yield encoder.encode(fila)
+
+
+async def _afilas(queryset, serializer_class, chunk_size, fields):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    queryset, serializar = _serializador(queryset, serializer_class, fields)
+    async for lote in aiterar_por_lotes(queryset, chunk_size):
+        for fila in serializar(lote):
+            yield encoder.encode(fila)
+
+
+def _ndjson(filas):
+    for fila in filas:
+        yield fila + "\n"
+
+
+def _json_array(filas):
+    yield "["
+    primero = True
+    for fila in filas:
+        yield fila if primero else "," + fila
+        primero = False
+    yield "]"
+
+
+async def _andjson(filas):
+    async for fila in filas:
+        yield fila + "\n"
+
+
+async def _ajson_array(filas):
+    yield "["
+    primero = True
+    async for fila in filas:
+        yield fila if primero else "," + fila
+        primero = False
+    yield "]"
+
+
+def _parametros(request):
+    formato = request.query_params.get("stream")
+    if formato in ("1", "true"):
+        formato = "ndjson"
+    if formato not in FORMATOS:
+        raise ValidationError({"stream": f"Formato inválido. Use uno de: {', '.join(FORMATOS)}."})
+
+    chunk_size = getattr(settings, "API_STREAM_CHUNK_SIZE", 2000)
+    try:
+        chunk_size = max(1, min(int(request.query_params.get("chunk_size", chunk_size)), 10000))
+    except ValueError:
+        raise ValidationError({"chunk_size": "Debe ser un número entero."})
+    return formato, chunk_size
+
+
+def respuesta_stream(request, queryset, serializer_class, fields=None):
+    """
+    Exporta el queryset completo fila a fila.
+
+    ``?stream=ndjson`` (o ``?stream=1``) emite una fila JSON por línea;
+    ``?stream=json`` emite un arreglo JSON. ``?chunk_size=`` ajusta el tamaño
+    de cada lote leído de la base de datos.
+    """
+    formato, chunk_size = _parametros(request)
+    filas = _filas(queryset, serializer_class, chunk_size, fields)
+    cuerpo = _ndjson(filas) if formato == "ndjson" else _json_array(filas)
+    return StreamingHttpResponse(cuerpo, content_type=FORMATOS[formato])
+
+
+def arespuesta_stream(request, queryset, serializer_class, fields=None):
+    """
+    ``respuesta_stream`` con un iterador async: bajo ASGI Django consume los
+    iteradores síncronos completos en memoria antes de enviarlos.
+    """
+    formato, chunk_size = _parametros(request)
+    filas = _afilas(queryset, serializer_class, chunk_size, fields)
+    cuerpo = _andjson(filas) if formato == "ndjson" else _ajson_array(filas)
+    return StreamingHttpResponse(cuerpo, content_type=FORMATOS[formato])
@@ -0,0 +1,60 @@
+# core/tareas.py
+"""
+Tareas que ``manage.py runworker`` ejecuta en segundo plano (ver
+``core/trabajos.py``). Se registran al cargar la app (``CoreConfig.ready``).
+"""
+import os
+from pathlib import Path
+
+from rest_framework.exceptions import ValidationError
+
+from django.conf import settings
+
+from . import cambios, importacion, nomina, resumen
+from .trabajos import avanzar, tarea
+
+
+@tarea("reconstruir_resumen")
+def reconstruir_resumen(trabajo):
+    return {"filas": resumen.reconstruir()}
+
+
+@tarea("calcular_nomina")
+def calcular_nomina(trabajo, mes):
+    return nomina.generar(
+        mes, avance=lambda guardados, total: avanzar(trabajo, guardados, total, f"{guardados:,} de {total:,} sueldos"),
+    )
+
+
+@tarea("purgar_cambios")
+def purgar_cambios(trabajo, dias=30):
+    return {"eliminados": cambios.purgar(max(0, int(dias)))}
+
+
+@tarea("importar")
+def importar(trabajo, recurso, archivo, nombre=None, upsert=False):
+    """
+    Importa un archivo que la vista guardó en ``API_JOBS_DIR``. El archivo
+    se elimina al terminar o al agotar los intentos.
+    """
+    # Sólo el nombre: los parámetros llegan por la API y no pueden apuntar fuera del directorio
+    ruta = Path(settings.API_JOBS_DIR) / Path(archivo).name
+    try:
+        with ruta.open("rb") as contenido:
+            tamano = os.fstat(contenido.fileno()).st_size
+            informe = importacion.importar(
+                importacion.leer(contenido, nombre or ruta.name),
+                importacion.RECURSOS[recurso],
+                upsert=upsert,
+                # Posición en el archivo: aproximada, pero no requiere contar las filas
+                avance=lambda filas: avanzar(trabajo, contenido.tell(), tamano, f"{filas:,} filas leídas"),
+            )
+    except ValidationError as exc:
+        # Archivo ilegible: reintentar no cambia nada
+        informe = {"filas": 0, "guardados": 0, "errores": [{"fila": None, "errores": exc.detail}]}
+    except Exception:
+        if trabajo.intentos >= trabajo.max_intentos:
+            ruta.unlink(missing_ok=True)
+        raise
+    ruta.unlink(missing_ok=True)
+    return informe
@@ -1,3 +1,1599 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import date, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from . import cambios, eficiencia, eventos, fastpath, nomina, resumen, stats, trabajos, views_async
+from .models import (
+    Trabajador, Asistencia, Accidente,
+    EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador, Cambio, ResumenMensual, Trabajo
+)
+from .pagination import KeysetPagination
+from .serializers import (
+    TrabajadorSerializer, AsistenciaSerializer, AccidenteSerializer,
+    EficienciaTrabajadorSerializer, DesempenoTrabajadorSerializer, SueldoTrabajadorSerializer,
+)
+
+# Tamaños de datos con los que se repite cada petición; el número de
+# consultas debe ser el mismo en ambos.
+ESCALAS = (5, 50)
+INICIO = date(2025, 1, 1)
+
+# Recalcular el resumen mensual al confirmar una escritura: GROUP BY de
+# asistencias y de sueldos (con el área en subconsulta) + un upsert.
+RESUMEN = 3
+# Registro de cambios de /api/changes/: un INSERT al confirmar
+CAMBIOS = 1
+
+
+@override_settings(API_CACHE_LISTADOS=False)
+class PresupuestoConsultasTests(TestCase):
+    """
+    Presupuesto de consultas SQL por endpoint.
+
+    Cada petición se ejecuta con pocos datos y con diez veces más: si la
+    cantidad de consultas cambia (p. ej. un campo relacionado en un
+    serializer que produce N+1) o supera el máximo, la prueba falla y
+    muestra el SQL ejecutado.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("presupuesto", password="x")
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.secuencia = 0
+
+    # ---------------------- datos ---------------------- #
+    def poblar(self, n):
+        """Completa hasta ``n`` trabajadores, cada uno con sus registros."""
+        existentes = Trabajador.objects.count()
+        trabajadores = Trabajador.objects.bulk_create([
+            Trabajador(
+                rut=f"{10_000_000 + i}-{i % 10}", nombre=f"Nombre{i}", apellido="Apellido",
+                fecha_nacimiento=date(1990, 1, 1), email=f"t{i}@example.com",
+                rol_cargo="Operario", tipo_contrato="Indefinido", area=f"Área {i % 3}",
+                turno="DIURNO", fecha_ingreso=date(2020, 1, 1), sueldo_base=Decimal("650000"),
+                estado="ACTIVO",
+            )
+            for i in range(existentes, n)
+        ])
+        comunes = lambda t: {"trabajador": t, "trabajador_rut": t.rut, "trabajador_nombre": t.nombre}  # noqa: E731
+        Asistencia.objects.bulk_create([
+            Asistencia(**comunes(t), fecha=INICIO + timedelta(days=d), estado="PRESENTE", minutos_atraso=d)
+            for t in trabajadores for d in range(3)
+        ])
+        SueldoTrabajador.objects.bulk_create([
+            SueldoTrabajador(**comunes(t), mes="2025-01", tipo_trabajos_mes="x", sueldo_total_mes=Decimal("700000"))
+            for t in trabajadores
+        ])
+        EficienciaTrabajador.objects.bulk_create([
+            EficienciaTrabajador(**comunes(t), id_eficiencia=t.id) for t in trabajadores
+        ])
+        DesempenoTrabajador.objects.bulk_create([
+            DesempenoTrabajador(**comunes(t), id_desempeno=t.id) for t in trabajadores
+        ])
+        Accidente.objects.bulk_create([
+            Accidente(fecha=INICIO, tipo="Caída", gravedad="LEVE", lugar="Bodega") for _t in trabajadores
+        ])
+        resumen.reconstruir()
+
+    def siguiente(self):
+        self.secuencia += 1
+        return self.secuencia
+
+    # ---------------------- medición ---------------------- #
+    def contar(self, peticion):
+        with CaptureQueriesContext(connection) as consultas:
+            with self.captureOnCommitCallbacks(execute=True):
+                respuesta = peticion()
+        self.assertLess(respuesta.status_code, 400, getattr(respuesta, "content", b"")[:500])
+        if respuesta.streaming:
+            b"".join(respuesta.streaming_content)
+        return [q["sql"] for q in consultas.captured_queries]
+
+    def assertPresupuesto(self, peticion, maximo, preparar=dict):
+        """
+        ``peticion(**preparar())`` usa el mismo número de consultas
+        (≤ ``maximo``) en cada escala. ``preparar`` busca los datos de la
+        petición fuera de la medición.
+        """
+        resultados = []
+        for n in ESCALAS:
+            self.poblar(n)
+            argumentos = preparar()
+            resultados.append(self.contar(lambda: peticion(**argumentos)))
+
+        conteos = [len(r) for r in resultados]
+        sql = "\n".join(resultados[-1])
+        self.assertEqual(
+            len(set(conteos)), 1,
+            f"La cantidad de consultas crece con los datos {dict(zip(ESCALAS, conteos))}:\n{sql}",
+        )
+        self.assertLessEqual(conteos[-1], maximo, f"Se esperaban a lo más {maximo} consultas:\n{sql}")
+
+    # ---------------------- lecturas ---------------------- #
+    LISTADOS = (
+        "/api/trabajadores/", "/api/asistencias/", "/api/accidentes/",
+        "/api/eficiencias/", "/api/desempenos/", "/api/sueldos/",
+    )
+
+    def test_listados(self):
+        # MAX/COUNT del ETag + página
+        for url in self.LISTADOS:
+            for fastpath in (True, False):
+                with self.subTest(url=url, fastpath=fastpath), self.settings(API_FASTPATH_LISTADOS=fastpath):
+                    self.assertPresupuesto(lambda: self.client.get(url, {"page_size": 20}), 2)
+
+    def test_listado_con_filtros_y_cursor(self):
+        def peticion():
+            primera = self.client.get("/api/asistencias/", {"page_size": 5, "estado": "PRESENTE", "fields": "fecha,trabajador"})
+            return self.client.get(primera.json()["next"])
+        self.assertPresupuesto(peticion, 4)
+
+    def test_stream(self):
+        # MAX/COUNT + un SELECT por lote (chunk_size mayor que los datos)
+        self.assertPresupuesto(lambda: self.client.get("/api/asistencias/", {"stream": "ndjson", "chunk_size": 10000}), 2)
+
+    def test_detalles(self):
+        modelos = {
+            "/api/trabajadores/": Trabajador, "/api/asistencias/": Asistencia, "/api/accidentes/": Accidente,
+            "/api/eficiencias/": EficienciaTrabajador, "/api/desempenos/": DesempenoTrabajador,
+            "/api/sueldos/": SueldoTrabajador,
+        }
+        for url, model in modelos.items():
+            with self.subTest(url=url):
+                self.assertPresupuesto(
+                    lambda pk: self.client.get(f"{url}{pk}/"), 1,
+                    preparar=lambda: {"pk": model.objects.earliest("id").pk},
+                )
+
+    def test_agregados(self):
+        urls = {
+            "/api/resumen-mensual/": 1,
+            "/api/stats/asistencia/": 1,
+            "/api/stats/atrasos/": 1,
+            "/api/stats/accidentes/": 1,
+            "/api/stats/sueldos/": 1 + 5,  # resumen + un OFFSET por percentil
+        }
+        for url, maximo in urls.items():
+            with self.subTest(url=url):
+                self.assertPresupuesto(lambda: self.client.get(url), maximo)
+
+    @override_settings(API_CHANGES_LAG_SECONDS=0)
+    def test_cambios(self):
+        # cursor visible + primer cambio + página + un SELECT por recurso guardado
+        def preparar():
+            anterior = Cambio.objects.order_by("-id").values_list("id", flat=True).first()
+            ahora = timezone.now()
+            Cambio.objects.bulk_create(
+                [Cambio(recurso="asistencias", objeto_id=pk, operacion=Cambio.GUARDADO, momento=ahora)
+                 for pk in Asistencia.objects.values_list("pk", flat=True)]
+                + [Cambio(recurso="trabajadores", objeto_id=pk, operacion=Cambio.GUARDADO, momento=ahora)
+                   for pk in Trabajador.objects.values_list("pk", flat=True)]
+                + [Cambio(recurso="accidentes", objeto_id=10_000 + i, operacion=Cambio.ELIMINADO, momento=ahora)
+                   for i in range(self.siguiente() * 10)]
+            )
+            return {"since": anterior or Cambio.objects.earliest("id").id - 1}
+        self.assertPresupuesto(lambda since: self.client.get("/api/changes/", {"since": since, "page_size": 1000}), 5, preparar=preparar)
+
+    # ---------------------- escrituras ---------------------- #
+    def test_crear_asistencia(self):
+        def peticion(trabajador):
+            return self.client.post("/api/asistencias/", {
+                "trabajador": trabajador,
+                "fecha": str(INICIO + timedelta(days=10 + self.siguiente())),
+                "estado": "PRESENTE",
+            }, format="json")
+        # trabajador + unicidad + INSERT en savepoint
+        self.assertPresupuesto(
+            peticion, 3 + RESUMEN + CAMBIOS, preparar=lambda: {"trabajador": Trabajador.objects.earliest("id").id},
+        )
+
+    def test_crear_trabajador(self):
+        def peticion():
+            i = 90_000 + self.siguiente()
+            return self.client.post("/api/trabajadores/", {
+                "rut": f"{i}000-1", "nombre": "Nuevo", "apellido": "Trabajador",
+                "fecha_nacimiento": "1990-01-01", "email": f"nuevo{i}@example.com",
+                "rol_cargo": "Operario", "tipo_contrato": "Indefinido", "turno": "DIURNO",
+                "fecha_ingreso": "2020-01-01", "estado": "ACTIVO",
+            }, format="json")
+        self.assertPresupuesto(peticion, 3 + CAMBIOS)
+
+    def test_actualizar_asistencia(self):
+        def peticion(asistencia):
+            return self.client.put(f"/api/asistencias/{asistencia.id}/", {
+                "trabajador": asistencia.trabajador_id,
+                "fecha": str(asistencia.fecha),
+                "estado": "AUSENTE",
+            }, format="json")
+        # registro + trabajador + unicidad + UPDATE en savepoint
+        self.assertPresupuesto(
+            peticion, 4 + RESUMEN + CAMBIOS, preparar=lambda: {"asistencia": Asistencia.objects.earliest("id")},
+        )
+
+    def _lote(self, cantidad=5):
+        dia = str(INICIO + timedelta(days=20 + self.siguiente()))
+        trabajadores = Trabajador.objects.order_by("id")[:cantidad]
+        return {"lote": [{"trabajador": t.id, "fecha": dia, "estado": "PRESENTE"} for t in trabajadores]}
+
+    def test_bulk_crear(self):
+        # trabajadores + duplicados + INSERT en savepoint
+        self.assertPresupuesto(
+            lambda lote: self.client.post("/api/asistencias/bulk/", lote, format="json"), 5 + RESUMEN + CAMBIOS,
+            preparar=self._lote,
+        )
+
+    def assertNoDependeDelLote(self, peticion, preparar):
+        """``peticion(lote)`` usa las mismas consultas con 5 y con 50 filas."""
+        self.poblar(ESCALAS[-1])
+        conteos = {}
+        for cantidad in (5, 50):
+            lote = preparar(cantidad)
+            conteos[cantidad] = len(self.contar(lambda: peticion(lote)))
+        self.assertEqual(len(set(conteos.values())), 1, f"Consultas por tamaño de lote: {conteos}")
+
+    def test_bulk_crear_no_depende_del_tamano_del_lote(self):
+        self.assertNoDependeDelLote(
+            lambda lote: self.client.post("/api/asistencias/bulk/", lote, format="json"),
+            lambda cantidad: self._lote(cantidad)["lote"],
+        )
+
+    def test_bulk_upsert(self):
+        # trabajadores + INSERT ... ON CONFLICT y relectura en savepoint
+        self.assertPresupuesto(
+            lambda lote: self.client.post("/api/asistencias/bulk/?upsert=1", lote, format="json"), 5 + RESUMEN + CAMBIOS,
+            preparar=self._lote,
+        )
+
+    def _actualizaciones(self, cantidad=5):
+        filas = Asistencia.objects.order_by("id")[:cantidad]
+        return [
+            {"id": a.id, "trabajador": a.trabajador_id, "fecha": str(a.fecha), "estado": "AUSENTE"} for a in filas
+        ]
+
+    def test_bulk_actualizar(self):
+        # registros + trabajadores + duplicados + UPDATE ... CASE en savepoint
+        self.assertPresupuesto(
+            lambda lote: self.client.put("/api/asistencias/bulk/", lote, format="json"), 6 + RESUMEN + CAMBIOS,
+            preparar=lambda: {"lote": self._actualizaciones()},
+        )
+
+    def test_bulk_actualizar_no_depende_del_tamano_del_lote(self):
+        self.assertNoDependeDelLote(
+            lambda lote: self.client.put("/api/asistencias/bulk/", lote, format="json"), self._actualizaciones,
+        )
+
+    def test_bulk_eliminar(self):
+        # filas afectadas + DELETE en savepoint
+        def preparar():
+            return {"ids": list(Asistencia.objects.order_by("-id").values_list("id", flat=True)[:5])}
+        self.assertPresupuesto(
+            lambda ids: self.client.delete("/api/asistencias/bulk/", {"ids": ids}, format="json"), 4 + RESUMEN + CAMBIOS,
+            preparar=preparar,
+        )
+
+    def test_importar_csv_no_depende_del_tamano_del_archivo(self):
+        def preparar(cantidad):
+            dia = INICIO + timedelta(days=40 + self.siguiente())
+            filas = [f"{t.rut};{dia};PRESENTE" for t in Trabajador.objects.order_by("id")[:cantidad]]
+            return "\n".join(["Trabajador RUT;Fecha;Estado", *filas]).encode()
+
+        def peticion(contenido):
+            archivo = SimpleUploadedFile("asistencias.csv", contenido, content_type="text/csv")
+            return self.client.post("/api/asistencias/importar/", {"archivo": archivo}, format="multipart")
+
+        self.assertNoDependeDelLote(peticion, preparar)
+
+    def test_importar_csv_informa_errores_por_fila(self):
+        self.poblar(ESCALAS[0])
+        rut = Trabajador.objects.earliest("id").rut
+        contenido = f"trabajador_rut,fecha,estado\n{rut},{INICIO},PRESENTE\n{rut},2025-02-30,PRESENTE\n".encode()
+        respuesta = self.client.post(
+            "/api/asistencias/importar/",
+            {"archivo": SimpleUploadedFile("asistencias.csv", contenido)}, format="multipart",
+        )
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual([e["fila"] for e in respuesta.json()["errores"]], [2, 3])
+        self.assertEqual(Asistencia.objects.count(), 3 * ESCALAS[0])
+
+    # ---------------------- autenticación ---------------------- #
+    def cliente_con_token(self):
+        self.poblar(ESCALAS[0])
+        cliente = APIClient()
+        cliente.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        return cliente, f"/api/trabajadores/{Trabajador.objects.earliest('id').pk}/"
+
+    @override_settings(API_WEB_WORKERS=1)
+    def test_token_cacheado(self):
+        cliente, url = self.cliente_con_token()
+        # Token + usuario en la primera petición; después sólo el detalle
+        self.assertEqual(len(self.contar(lambda: cliente.get(url))), 2)
+        self.assertEqual(len(self.contar(lambda: cliente.get(url))), 1)
+
+    @override_settings(API_WEB_WORKERS=3)
+    def test_token_sin_cache_compartida(self):
+        cliente, url = self.cliente_con_token()
+        # Cada worker tendría su copia: un token eliminado seguiría valiendo
+        self.assertEqual(len(self.contar(lambda: cliente.get(url))), 2)
+        self.assertEqual(len(self.contar(lambda: cliente.get(url))), 2)
+        self.token.delete()
+        self.assertEqual(cliente.get(url).status_code, 401)
+
+
+@override_settings(API_CACHE_LISTADOS=False)
+class CondicionalTests(TestCase):
+    """``ETag`` / ``If-None-Match`` de listados y detalles."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ana = Trabajador.objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+        )
+        Asistencia.objects.bulk_create([
+            Asistencia(trabajador=cls.ana, trabajador_rut=cls.ana.rut, trabajador_nombre="Ana",
+                       fecha=INICIO + timedelta(days=d), estado="PRESENTE")
+            for d in range(3)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("condicional", password="x"))
+
+    def condicional(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_listado(self):
+        respuesta = self.client.get("/api/asistencias/")
+        etag = respuesta["ETag"]
+        self.assertIn("Last-Modified", respuesta)
+        self.assertEqual(self.condicional("/api/asistencias/", etag).status_code, 304)
+        # Otra URL (filtros, página) tiene su propio ETag
+        self.assertEqual(self.condicional("/api/asistencias/?estado=PRESENTE", etag).status_code, 200)
+
+        asistencia = Asistencia.objects.earliest("id")
+        asistencia.estado = "AUSENTE"
+        asistencia.save()
+        respuesta = self.condicional("/api/asistencias/", etag)
+        self.assertEqual(respuesta.status_code, 200)
+        etag = respuesta["ETag"]
+
+        self.client.delete(f"/api/asistencias/{asistencia.pk}/")
+        respuesta = self.condicional("/api/asistencias/", etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(self.condicional("/api/asistencias/", respuesta["ETag"]).status_code, 304)
+
+    def test_eliminar_trabajador_cambia_el_etag_de_los_relacionados(self):
+        etag = self.client.get("/api/asistencias/")["ETag"]
+        self.client.delete(f"/api/trabajadores/{self.ana.pk}/")
+        respuesta = self.condicional("/api/asistencias/", etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual({fila["trabajador"] for fila in respuesta.json()["results"]}, {None})
+
+    def test_detalle(self):
+        url = f"/api/trabajadores/{self.ana.pk}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.condicional(url, etag).status_code, 304)
+        self.ana.telefono = "123"
+        self.ana.save()
+        self.assertEqual(self.condicional(url, etag).status_code, 200)
+
+
+class CacheListadosTests(TestCase):
+    """
+    La caché de listados sólo se usa si todos los workers la comparten, y
+    cualquier escritura del modelo deja de servir las respuestas anteriores.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("cache", password="x"))
+
+    def cabeceras(self):
+        return [self.client.get("/api/trabajadores/").get("X-Cache") for _ in range(2)]
+
+    @override_settings(API_WEB_WORKERS=1)
+    def test_un_worker_usa_la_cache_en_memoria(self):
+        self.assertEqual(self.cabeceras(), ["MISS", "HIT"])
+
+    @override_settings(API_WEB_WORKERS=3)
+    def test_varios_workers_sin_cache_compartida(self):
+        self.assertEqual(self.cabeceras(), [None, None])
+
+    @override_settings(API_WEB_WORKERS=3, API_CACHE_LISTADOS=False)
+    def test_desactivada(self):
+        self.assertEqual(self.cabeceras(), [None, None])
+
+    @override_settings(API_WEB_WORKERS=1)
+    def test_escrituras_invalidan_el_listado(self):
+        ana = Trabajador.objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+        )
+
+        def asistencia(dia, estado="PRESENTE"):
+            return {"trabajador": ana.pk, "fecha": str(INICIO + timedelta(days=dia)), "estado": estado}
+
+        def listado():
+            return [self.client.get("/api/asistencias/") for _ in range(2)]
+
+        def escribir(peticion):
+            with self.captureOnCommitCallbacks(execute=True):
+                respuesta = peticion()
+            self.assertLess(respuesta.status_code, 300, respuesta.content)
+            return respuesta
+
+        def assertRenovado(esperado):
+            # La primera lectura tras la escritura no usa la respuesta anterior
+            primera, segunda = listado()
+            self.assertEqual([primera["X-Cache"], segunda["X-Cache"]], ["MISS", "HIT"])
+            self.assertEqual([(a["fecha"], a["estado"]) for a in primera.json()["results"]], esperado)
+
+        assertRenovado([])
+        pk = escribir(lambda: self.client.post("/api/asistencias/", asistencia(0), format="json")).json()["id"]
+        assertRenovado([("2025-01-01", "PRESENTE")])
+        escribir(lambda: self.client.put(f"/api/asistencias/{pk}/", asistencia(0, "AUSENTE"), format="json"))
+        assertRenovado([("2025-01-01", "AUSENTE")])
+        escribir(lambda: self.client.post("/api/asistencias/bulk/", [asistencia(1), asistencia(2)], format="json"))
+        assertRenovado([("2025-01-03", "PRESENTE"), ("2025-01-02", "PRESENTE"), ("2025-01-01", "AUSENTE")])
+        escribir(lambda: self.client.delete(f"/api/asistencias/{pk}/"))
+        assertRenovado([("2025-01-03", "PRESENTE"), ("2025-01-02", "PRESENTE")])
+
+
+class FastpathTests(TestCase):
+    """``fastpath.compilar`` entrega lo mismo que ``serializer.data``."""
+
+    @classmethod
+    def setUpTestData(cls):
+        ana = Trabajador.objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), sueldo_base=Decimal("650000.5"), estado="ACTIVO",
+        )
+        comunes = {"trabajador_rut": ana.rut, "trabajador_nombre": "Ana"}
+        for trabajador, dia in ((ana, 1), (None, 2)):
+            Asistencia.objects.create(
+                **comunes, trabajador=trabajador, fecha=date(2025, 1, dia), estado="PRESENTE",
+                hora_entrada=time(8, 0, 0, 123456), hora_salida=time(17, 30), horas_extras=Decimal("1.5"),
+            )
+            EficienciaTrabajador.objects.create(**comunes, trabajador=trabajador, id_eficiencia=dia)
+            DesempenoTrabajador.objects.create(**comunes, trabajador=trabajador, id_desempeno=dia)
+            SueldoTrabajador.objects.create(
+                **comunes, trabajador=trabajador, mes=f"2025-0{dia}", tipo_trabajos_mes="x",
+                sueldo_total_mes=Decimal("700000.1"),
+            )
+        Accidente.objects.create(
+            fecha=date(2025, 1, 1), tipo="Caída", gravedad="LEVE", lugar="Bodega",
+            hora_suceso=time(10, 15, 30, 5), costo_estimado=Decimal("12.3"),
+        )
+        Accidente.objects.create(fecha=date(2025, 1, 2), tipo="Corte", gravedad="GRAVE", lugar="Taller")
+
+    def assertIgualAlSerializer(self, serializer_class, fields=None):
+        queryset = serializer_class.Meta.model.objects.order_by("id")
+        columnas, convertir = fastpath.compilar(serializer_class, fields)
+        esperado = serializer_class(queryset, many=True, fields=fields).data
+        obtenido = convertir(list(queryset.values(*columnas)))
+        self.assertEqual(obtenido, esperado)
+        self.assertEqual([list(fila) for fila in obtenido], [list(fila) for fila in esperado])
+
+    def test_todos_los_serializers(self):
+        for serializer_class in (
+            TrabajadorSerializer, AsistenciaSerializer, AccidenteSerializer,
+            EficienciaTrabajadorSerializer, DesempenoTrabajadorSerializer, SueldoTrabajadorSerializer,
+        ):
+            for zona in ("UTC", "America/Santiago"):
+                with self.subTest(serializer_class.__name__, zona=zona), override_settings(TIME_ZONE=zona):
+                    self.assertIgualAlSerializer(serializer_class)
+
+    def test_fields(self):
+        self.assertIgualAlSerializer(
+            AsistenciaSerializer, ("id", "trabajador", "hora_entrada", "horas_extras", "updated_at"),
+        )
+        self.assertIgualAlSerializer(AccidenteSerializer, ("costo_estimado", "hora_suceso"))
+
+    def test_listado(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("fastpath", password="x"))
+        for url in ("/api/asistencias/", "/api/accidentes/?fields=id,costo_estimado,hora_suceso,updated_at"):
+            with self.subTest(url), override_settings(API_CACHE_LISTADOS=False):
+                with override_settings(API_FASTPATH_LISTADOS=False):
+                    esperado = self.client.get(url).content
+                self.assertEqual(self.client.get(url).content, esperado)
+
+
+@override_settings(API_CACHE_LISTADOS=False, API_SLOW_REQUEST_MS=0, API_WEB_WORKERS=3)
+class PeticionesLentasTests(TestCase):
+    """Log ``core.lentas`` de ``MetricasMiddleware``."""
+
+    def test_no_registra_los_parametros_sql(self):
+        token = Token.objects.create(user=User.objects.create_user("lentas", password="x"))
+        Trabajador.objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+        )
+        with self.assertLogs("core.lentas", "WARNING") as logs:
+            respuesta = self.client.get(
+                "/api/trabajadores/?rut=12345678-5", headers={"Authorization": f"Token {token.key}"},
+            )
+        self.assertEqual(respuesta.status_code, 200)
+        salida = "\n".join(logs.output)
+        self.assertIn("authtoken_token", salida)
+        self.assertNotIn(token.key, salida)
+        self.assertNotIn("'12345678-5'", salida)
+
+
+class ResumenTests(TestCase):
+    """
+    Valores de ``ResumenMensual`` después de cada tipo de escritura; la
+    tabla mantenida debe ser igual a ``resumen.reconstruir()``.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ana = Trabajador.objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido", area="Bodega",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("resumen", password="x"))
+
+    def escribir(self, funcion):
+        with self.captureOnCommitCallbacks(execute=True):
+            return funcion()
+
+    def tabla(self):
+        campos = ("area", "dias_registrados", "presentes", "ausentes", "minutos_atraso", "horas_extras",
+                  "accidentes_leve", "sueldo_total_mes")
+        return {
+            (fila["mes"], fila["trabajador_rut"]): {c: fila[c] for c in campos}
+            for fila in ResumenMensual.objects.values("mes", "trabajador_rut", *campos)
+        }
+
+    def fila(self, mes, rut="12345678-5"):
+        return self.tabla().get((mes, rut))
+
+    def assertIgualAReconstruir(self):
+        mantenida = self.tabla()
+        resumen.reconstruir()
+        self.assertEqual(mantenida, self.tabla())
+
+    def asistencia(self, fecha, estado="PRESENTE", **campos):
+        return self.escribir(lambda: Asistencia.objects.create(
+            trabajador=self.ana, trabajador_rut=self.ana.rut, trabajador_nombre="Ana", fecha=fecha, estado=estado, **campos,
+        ))
+
+    def test_crear_actualizar_y_eliminar(self):
+        presente = self.asistencia(INICIO, minutos_atraso=5, horas_extras=Decimal("1.5"))
+        self.asistencia(INICIO + timedelta(days=1), estado="AUSENTE")
+        self.assertEqual(self.fila("2025-01"), {
+            "area": "Bodega", "dias_registrados": 2, "presentes": 1, "ausentes": 1, "minutos_atraso": 5,
+            "horas_extras": Decimal("1.5"), "accidentes_leve": 0, "sueldo_total_mes": 0,
+        })
+        self.assertIgualAReconstruir()
+
+        # Cambiar de mes descuenta del anterior y suma al nuevo
+        presente.fecha = date(2025, 2, 3)
+        presente.minutos_atraso = 8
+        self.escribir(presente.save)
+        self.assertEqual((self.fila("2025-01")["dias_registrados"], self.fila("2025-01")["minutos_atraso"]), (1, 0))
+        self.assertEqual((self.fila("2025-02")["presentes"], self.fila("2025-02")["minutos_atraso"]), (1, 8))
+        self.assertIgualAReconstruir()
+
+        self.escribir(lambda: SueldoTrabajador.objects.create(
+            trabajador_rut=self.ana.rut, mes="2025-02", tipo_trabajos_mes="x", sueldo_total_mes=Decimal("700000"),
+        ))
+        self.escribir(lambda: Accidente.objects.create(fecha=INICIO, tipo="Caída", gravedad="LEVE", lugar="Bodega"))
+        self.assertEqual(self.fila("2025-02")["sueldo_total_mes"], Decimal("700000"))
+        self.assertEqual(self.fila("2025-01", "")["accidentes_leve"], 1)
+        self.assertIgualAReconstruir()
+
+        # Sin registros en el mes la fila desaparece
+        self.escribir(presente.delete)
+        self.escribir(SueldoTrabajador.objects.get().delete)
+        self.assertIsNone(self.fila("2025-02"))
+        self.assertIgualAReconstruir()
+
+    def test_lotes(self):
+        lote = [
+            {"trabajador": self.ana.pk, "fecha": str(INICIO + timedelta(days=d)), "estado": "PRESENTE", "minutos_atraso": d}
+            for d in range(4)
+        ]
+        creadas = self.escribir(lambda: self.client.post("/api/asistencias/bulk/", lote, format="json")).json()["resultados"]
+        self.assertEqual((self.fila("2025-01")["dias_registrados"], self.fila("2025-01")["minutos_atraso"]), (4, 6))
+
+        movidas = [dict(fila, fecha=f"2025-03-0{i + 1}", estado="AUSENTE") for i, fila in enumerate(creadas[:2])]
+        respuesta = self.escribir(lambda: self.client.put("/api/asistencias/bulk/", movidas, format="json"))
+        self.assertEqual(respuesta.status_code, 200, respuesta.content[:500])
+        self.assertEqual(self.fila("2025-01")["dias_registrados"], 2)
+        self.assertEqual(self.fila("2025-03")["ausentes"], 2)
+        self.assertIgualAReconstruir()
+
+        ids = [fila["id"] for fila in creadas[:2]]
+        self.escribir(lambda: self.client.delete("/api/asistencias/bulk/", {"ids": ids}, format="json"))
+        self.assertIsNone(self.fila("2025-03"))
+        self.assertIgualAReconstruir()
+
+    def test_cambio_de_area(self):
+        self.asistencia(INICIO)
+        self.ana.area = "Despacho"
+        self.escribir(self.ana.save)
+        self.assertEqual(self.fila("2025-01")["area"], "Despacho")
+        self.assertIgualAReconstruir()
+
+
+class LotesSinReturningTests(TestCase):
+    """
+    Escrituras en lote en una base sin ``RETURNING`` (MySQL): ``bulk_create``
+    no asigna los ids y las filas se releen por ``unique_key``.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.trabajador = Trabajador.objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("lotes", password="x"))
+        features = type(connection.features)
+        self.enterContext(mock.patch.object(features, "can_return_rows_from_bulk_insert", False))
+
+    def test_bulk_devuelve_los_ids(self):
+        lote = [
+            {"trabajador": self.trabajador.pk, "fecha": str(INICIO + timedelta(days=d)), "estado": "PRESENTE"}
+            for d in (2, 0, 1)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = self.client.post("/api/asistencias/bulk/", lote, format="json")
+        self.assertEqual(respuesta.status_code, 201, respuesta.content[:500])
+        resultados = respuesta.json()["resultados"]
+        esperado = {a.fecha.isoformat(): a.pk for a in Asistencia.objects.all()}
+        self.assertEqual([(r["fecha"], r["id"]) for r in resultados], [(f["fecha"], esperado[f["fecha"]]) for f in lote])
+
+    @override_settings(API_CHANGES_LAG_SECONDS=0)
+    def test_lote_e_importacion_llegan_al_registro_de_cambios(self):
+        cursor = self.client.get("/api/changes/").json()["cursor"]
+        lote = [{"trabajador": self.trabajador.pk, "fecha": str(INICIO), "estado": "PRESENTE"}]
+        contenido = f"trabajador_rut,fecha,estado\n{self.trabajador.rut},{INICIO + timedelta(days=1)},PRESENTE\n"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/asistencias/bulk/", lote, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = self.client.post(
+                "/api/asistencias/importar/",
+                {"archivo": SimpleUploadedFile("asistencias.csv", contenido.encode())}, format="multipart",
+            )
+        self.assertEqual(respuesta.status_code, 201, respuesta.content[:500])
+
+        pagina = self.client.get("/api/changes/", {"since": cursor}).json()
+        self.assertEqual(
+            sorted(c["id"] for c in pagina["cambios"] if c["recurso"] == "asistencias"),
+            sorted(Asistencia.objects.values_list("id", flat=True)),
+        )
+        self.assertEqual(len(pagina["cambios"]), 2)
+
+
+@override_settings(API_CACHE_LISTADOS=False)
+class PaginacionTests(TestCase):
+    """Recorrido de los listados con ``KeysetPagination``."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Cinco asistencias por día: el orden (-fecha, id) tiene empates en fecha
+        Asistencia.objects.bulk_create([
+            Asistencia(
+                trabajador_rut=f"1000000{t}-{t}", trabajador_nombre="Nombre", fecha=INICIO + timedelta(days=d),
+                estado="PRESENTE", minutos_atraso=(t * 7 + d) % 4,
+            )
+            for d in range(5) for t in range(5)
+        ])
+
+    def recorrer(self, url, **params):
+        ids = []
+        respuesta = self.client.get(url, params)
+        while True:
+            datos = respuesta.json()
+            ids += [fila["id"] for fila in datos["results"]]
+            if not datos["next"]:
+                return ids
+            respuesta = self.client.get(datos["next"])
+
+    def test_recorrido_sin_duplicados_ni_huecos(self):
+        esperado = list(Asistencia.objects.order_by("-fecha", "id").values_list("id", flat=True))
+        self.assertEqual(self.recorrer("/api/asistencias/", page_size=4), esperado)
+
+    def test_orden_descendente(self):
+        esperado = list(Asistencia.objects.order_by("-minutos_atraso", "fecha", "id").values_list("id", flat=True))
+        self.assertEqual(
+            self.recorrer("/api/asistencias/", page_size=3, ordering="-minutos_atraso,fecha"), esperado,
+        )
+        esperado = list(Asistencia.objects.order_by("-id").values_list("id", flat=True))
+        self.assertEqual(self.recorrer("/api/asistencias/", page_size=7, ordering="-id"), esperado)
+
+    def test_cursor_invalido(self):
+        paginador = KeysetPagination(ordering=("-fecha", "id"))
+        for cursor in (
+            "no-es-base64!",
+            paginador.encode_cursor({"fecha": "2025-01-01"}),
+            paginador.encode_cursor(["2025-01-01"]),
+            paginador.encode_cursor(["2025-02-30", 1]),
+            paginador.encode_cursor(["2025-01-01", "uno"]),
+        ):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get("/api/asistencias/", {"cursor": cursor}).status_code, 404)
+
+    @override_settings(API_MAX_PAGE_SIZE=10)
+    def test_page_size_acotado(self):
+        # Un page_size inválido usa el de REST_FRAMEWORK["PAGE_SIZE"] (100)
+        for page_size, esperado in (("50", 10), ("3", 3), ("0", 25), ("x", 25)):
+            with self.subTest(page_size=page_size):
+                datos = self.client.get("/api/asistencias/", {"page_size": page_size}).json()
+                self.assertEqual(len(datos["results"]), esperado)
+        with override_settings(REST_FRAMEWORK={"PAGE_SIZE": 4}):
+            self.assertEqual(len(self.client.get("/api/asistencias/").json()["results"]), 4)
+
+
+@override_settings(API_CACHE_LISTADOS=False)
+class FiltrosTests(TestCase):
+    """``?filtro=``, ``?ordering=`` y ``?fields=`` de ``core/filters.py`` en los listados."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i, (nombre, area, turno, estado, sueldo) in enumerate((
+            ("Ana", "Bodega", "DIURNO", "ACTIVO", 500000),
+            ("Beto", "Bodega", "NOCHE", "ACTIVO", 700000),
+            ("Carla", "Taller", "DIURNO", "INACTIVO", 700000),
+            ("Diego", "Taller", "MIXTO", "ACTIVO", 600000),
+        )):
+            Trabajador.objects.create(
+                rut=f"1111111{i}-{i}", nombre=nombre, apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+                email=f"{nombre}@example.com", rol_cargo="Operario", tipo_contrato="Indefinido", area=area,
+                turno=turno, fecha_ingreso=date(2020 + i, 1, 1), estado=estado, sueldo_base=sueldo,
+            )
+        for dia, gravedad, licencia in ((0, "LEVE", False), (1, "GRAVE", True), (2, "FATAL", True), (3, "GRAVE", False)):
+            Accidente.objects.create(
+                fecha=INICIO + timedelta(days=dia), tipo="Caída", gravedad=gravedad, lugar="Bodega",
+                requiere_licencia=licencia,
+            )
+
+    def listar(self, url, **params):
+        respuesta = self.client.get(url, params)
+        self.assertEqual(respuesta.status_code, 200, respuesta.content)
+        return respuesta.json()["results"]
+
+    def nombres(self, **params):
+        return [t["nombre"] for t in self.listar("/api/trabajadores/", **params)]
+
+    def test_filtros(self):
+        self.assertEqual(self.nombres(estado="ACTIVO", area="Bodega"), ["Ana", "Beto"])
+        self.assertEqual(self.nombres(turno__in="NOCHE,MIXTO"), ["Beto", "Diego"])
+        self.assertEqual(self.nombres(fecha_ingreso__gte="2021-01-01", fecha_ingreso__lt="2023-01-01"), ["Beto", "Carla"])
+        # Los parámetros que no son filtros se ignoran
+        self.assertEqual(self.nombres(area="Taller", _="123"), ["Carla", "Diego"])
+
+        accidentes = self.listar("/api/accidentes/", gravedad__in="GRAVE,FATAL", requiere_licencia="1")
+        self.assertEqual([a["fecha"] for a in accidentes], ["2025-01-02", "2025-01-03"])
+
+    def test_filtros_invalidos(self):
+        for url, params in (
+            ("/api/trabajadores/", {"estado__gte": "A"}),
+            ("/api/trabajadores/", {"fecha_ingreso": "2020-13-01"}),
+            ("/api/trabajadores/", {"fecha_ingreso__in": "2020-01-01,ayer"}),
+            ("/api/accidentes/", {"requiere_licencia": "quizas"}),
+        ):
+            with self.subTest(params=params):
+                respuesta = self.client.get(url, params)
+                self.assertEqual(respuesta.status_code, 400)
+                self.assertEqual(list(respuesta.json()), list(params))
+
+    def test_ordering(self):
+        # Los empates se resuelven por id
+        self.assertEqual(self.nombres(ordering="-sueldo_base"), ["Beto", "Carla", "Diego", "Ana"])
+        self.assertEqual(self.nombres(ordering="-sueldo_base,-id"), ["Carla", "Beto", "Diego", "Ana"])
+        self.assertEqual(self.nombres(ordering="-fecha_ingreso", estado="ACTIVO"), ["Diego", "Beto", "Ana"])
+
+        for ordering in ("email", "-telefono", "sueldo_base,area"):
+            with self.subTest(ordering=ordering):
+                respuesta = self.client.get("/api/trabajadores/", {"ordering": ordering})
+                self.assertEqual(respuesta.status_code, 400)
+                self.assertIn("Orden no permitido", respuesta.json()["ordering"])
+
+    def test_fields(self):
+        filas = self.listar("/api/trabajadores/", fields="rut, nombre", ordering="-sueldo_base")
+        self.assertEqual(filas[0], {"rut": "11111111-1", "nombre": "Beto"})
+        self.assertEqual({tuple(fila) for fila in filas}, {("rut", "nombre")})
+
+        respuesta = self.client.get("/api/trabajadores/", {"fields": "rut,clave,sueldo"})
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual(respuesta.json(), {"fields": "Campos inexistentes: clave, sueldo."})
+
+
+@override_settings(API_CACHE_LISTADOS=False, API_CHANGES_LAG_SECONDS=0)
+class CambiosTests(TestCase):
+    """Registro de cambios y sincronización incremental de ``/api/changes/``."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("cambios", password="x"))
+
+    def escribir(self, peticion):
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = peticion()
+        self.assertLess(respuesta.status_code, 400, respuesta.content[:500])
+        return respuesta
+
+    def cambios(self, since, **params):
+        respuesta = self.client.get("/api/changes/", {"since": since, **params})
+        self.assertEqual(respuesta.status_code, 200, respuesta.content[:500])
+        return respuesta.json()
+
+    def crear_trabajador(self):
+        return self.escribir(lambda: self.client.post("/api/trabajadores/", {
+            "rut": "12345678-5", "nombre": "Ana", "apellido": "Pérez", "fecha_nacimiento": "1990-01-01",
+            "email": "ana@example.com", "rol_cargo": "Operario", "tipo_contrato": "Indefinido",
+            "turno": "DIURNO", "fecha_ingreso": "2020-01-01", "estado": "ACTIVO",
+        }, format="json")).json()
+
+    def test_deltas_compactados_y_eliminaciones(self):
+        cursor = self.client.get("/api/changes/").json()["cursor"]
+        trabajador = self.crear_trabajador()
+        asistencia = self.escribir(lambda: self.client.post("/api/asistencias/", {
+            "trabajador": trabajador["id"], "fecha": str(INICIO), "estado": "PRESENTE",
+        }, format="json")).json()
+        self.escribir(lambda: self.client.put(f"/api/asistencias/{asistencia['id']}/", {
+            "trabajador": trabajador["id"], "fecha": str(INICIO), "estado": "AUSENTE",
+        }, format="json"))
+
+        pagina = self.cambios(cursor)
+        self.assertFalse(pagina["mas"])
+        self.assertEqual(
+            [(c["recurso"], c["id"], c["operacion"]) for c in pagina["cambios"]],
+            [("trabajadores", trabajador["id"], "guardado"), ("asistencias", asistencia["id"], "guardado")],
+        )
+        self.assertEqual(pagina["cambios"][1]["datos"]["estado"], "AUSENTE")
+
+        self.escribir(lambda: self.client.delete("/api/asistencias/bulk/", {"ids": [asistencia["id"]]}, format="json"))
+        siguiente = self.cambios(pagina["cursor"])
+        self.assertEqual(siguiente["cambios"], [{"recurso": "asistencias", "id": asistencia["id"], "operacion": "eliminado"}])
+        self.assertEqual(self.cambios(siguiente["cursor"])["cambios"], [])
+
+    def test_se_registra_en_la_transaccion_de_los_datos(self):
+        accidente = {"fecha": INICIO, "tipo": "Caída", "gravedad": "LEVE", "lugar": "Bodega"}
+        with mock.patch.object(eventos, "publicar") as publicar:
+            with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+                creado = Accidente.objects.create(**accidente)
+                # Antes del COMMIT la fila ya existe; el evento espera al COMMIT
+                self.assertTrue(Cambio.objects.filter(recurso="accidentes", objeto_id=creado.pk).exists())
+                publicar.assert_not_called()
+            publicar.assert_called_once()
+
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Accidente.objects.create(**accidente)
+                raise RuntimeError
+            with self.assertRaises(RuntimeError), transaction.atomic(), cambios.agrupar():
+                Accidente.objects.create(**accidente)
+                raise RuntimeError
+        self.assertEqual(Cambio.objects.count(), 1)
+        publicar.assert_called_once()
+
+    def test_eliminar_trabajador_registra_los_relacionados(self):
+        trabajador = self.crear_trabajador()
+        asistencia = self.escribir(lambda: self.client.post("/api/asistencias/", {
+            "trabajador": trabajador["id"], "fecha": str(INICIO), "estado": "PRESENTE",
+        }, format="json")).json()
+        cursor = self.client.get("/api/changes/").json()["cursor"]
+
+        self.escribir(lambda: self.client.delete(f"/api/trabajadores/{trabajador['id']}/"))
+        cambios = {(c["recurso"], c["operacion"]): c for c in self.cambios(cursor)["cambios"]}
+        self.assertIn(("trabajadores", "eliminado"), cambios)
+        self.assertIsNone(cambios[("asistencias", "guardado")]["datos"]["trabajador"])
+        self.assertEqual(cambios[("asistencias", "guardado")]["id"], asistencia["id"])
+
+    def test_paginas_acotadas_y_filtro_por_recurso(self):
+        ahora = timezone.now()
+        Cambio.objects.bulk_create([
+            Cambio(recurso="accidentes", objeto_id=i, operacion=Cambio.ELIMINADO, momento=ahora) for i in range(1, 6)
+        ])
+        since = Cambio.objects.earliest("id").id - 1
+        pagina = self.cambios(since, page_size=2)
+        self.assertTrue(pagina["mas"])
+        self.assertEqual([c["id"] for c in pagina["cambios"]], [1, 2])
+        pagina = self.cambios(pagina["cursor"], page_size=10)
+        self.assertFalse(pagina["mas"])
+        self.assertEqual([c["id"] for c in pagina["cambios"]], [3, 4, 5])
+        self.assertEqual(self.cambios(since, recursos="asistencias")["cambios"], [])
+
+    def test_cursor_purgado(self):
+        Cambio.objects.bulk_create([
+            Cambio(recurso="accidentes", objeto_id=i, operacion=Cambio.ELIMINADO, momento=timezone.now() - timedelta(days=60 - i))
+            for i in range(1, 4)
+        ])
+        cambios.purgar(58)
+        self.assertEqual(Cambio.objects.count(), 1)
+        respuesta = self.client.get("/api/changes/", {"since": 0})
+        self.assertEqual(respuesta.status_code, 410)
+        self.assertEqual(respuesta.json()["cursor"], str(Cambio.objects.get().id))
+
+
+@override_settings(API_CHANGES_LAG_SECONDS=0, API_EVENTS_BROKER="core.eventos.MemoriaBroker")
+class EventosTests(TransactionTestCase):
+    """
+    Eventos en vivo de ``/api/events/``. La vista consulta la base desde
+    otro thread, por eso los datos deben estar confirmados.
+    """
+
+    def setUp(self):
+        eventos.broker.cache_clear()
+        self.addCleanup(eventos.broker.cache_clear)
+
+    @asynccontextmanager
+    async def abrir(self, url, headers=None):
+        respuesta = await AsyncClient().get(url, headers=headers)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta["Content-Type"], "text/event-stream")
+        try:
+            contenido = aiter(respuesta.streaming_content)
+            self.assertEqual(await anext(contenido), b"retry: 3000\n\n")
+            yield contenido
+        finally:
+            # Como al desconectarse el cliente: libera la suscripción
+            await respuesta._iterator.aclose()
+
+    @override_settings(API_EVENTS_MAX_BATCH=2)
+    def test_lotes_grandes_se_resumen(self):
+        filas = [(i, "asistencias", i, Cambio.GUARDADO) for i in range(1, 4)] + [(4, "accidentes", 7, Cambio.ELIMINADO)]
+        self.assertEqual(eventos.eventos_de(filas), [
+            {"tipo": "lote", "recurso": "asistencias", "cantidad": 3, "cursor": "3"},
+            {"tipo": "cambio", "recurso": "accidentes", "id": 7, "operacion": Cambio.ELIMINADO, "cursor": "4"},
+        ])
+
+    def test_requiere_asgi(self):
+        self.assertEqual(self.client.get("/api/events/").status_code, 501)
+
+    async def test_reenvia_los_eventos_del_recurso(self):
+        async with self.abrir("/api/events/?recursos=accidentes") as contenido:
+            eventos.publicar([(8, "asistencias", 3, Cambio.GUARDADO), (9, "accidentes", 5, Cambio.GUARDADO)])
+            evento = await anext(contenido)
+        self.assertTrue(evento.startswith(b"event: cambio\nid: 9\ndata: "))
+        self.assertIn(b'"recurso":"accidentes","id":5', evento.replace(b" ", b""))
+
+    async def test_reconexion_reproduce_desde_last_event_id(self):
+        await Cambio.objects.abulk_create([
+            Cambio(recurso="accidentes", objeto_id=i, operacion=Cambio.ELIMINADO, momento=timezone.now()) for i in (1, 2)
+        ])
+        primero = (await Cambio.objects.aearliest("id")).id
+        async with self.abrir("/api/events/", headers={"Last-Event-ID": str(primero)}) as contenido:
+            evento = await anext(contenido)
+            self.assertTrue(evento.startswith(f"event: cambio\nid: {primero + 1}\n".encode()))
+            # Lo ya reproducido no se repite al llegar en vivo
+            eventos.publicar([(primero + 1, "accidentes", 2, Cambio.ELIMINADO), (primero + 2, "accidentes", 3, Cambio.ELIMINADO)])
+            self.assertIn(f"id: {primero + 2}\n".encode(), await anext(contenido))
+
+
+# Rutas CRUD con las vistas async, como backend/urls.py con API_ASYNC_VIEWS=1
+urlpatterns = [
+    path("api/trabajadores/", views_async.trabajador_list),
+    path("api/trabajadores/<int:pk>/", views_async.trabajador_detail),
+    path("api/asistencias/", views_async.asistencia_list),
+    path("api/asistencias/<int:pk>/", views_async.asistencia_detail),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__, API_CACHE_LISTADOS=False)
+class VistasAsyncTests(TestCase):
+    """Vistas de ``core/views_async.py`` servidas con ``AsyncClient``."""
+
+    TRABAJADOR = {
+        "rut": "12345678-5", "nombre": "Ana", "apellido": "Pérez", "fecha_nacimiento": "1990-01-01",
+        "email": "ana@example.com", "rol_cargo": "Operario", "tipo_contrato": "Indefinido",
+        "turno": "DIURNO", "fecha_ingreso": "2020-01-01", "estado": "ACTIVO",
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.token = Token.objects.create(user=User.objects.create_user("async", password="x"))
+
+    def pedir(self, metodo, url, datos=None, token=True, headers=None):
+        # AsyncClient sólo acepta los headers por petición (no HTTP_* en el constructor)
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = f"Token {self.token.key if token is True else token}"
+        extra = {"content_type": "application/json"} if datos is not None else {}
+        return getattr(self.async_client, metodo)(url, datos, headers=headers, **extra)
+
+    async def poblar(self, n, campos):
+        trabajador = await Trabajador.objects.acreate(**self.TRABAJADOR)
+        await Asistencia.objects.abulk_create([
+            Asistencia(**{
+                "trabajador": trabajador, "trabajador_rut": trabajador.rut, "trabajador_nombre": "Ana",
+                "fecha": INICIO + timedelta(days=d), "estado": "PRESENTE", **campos(d),
+            })
+            for d in range(n)
+        ])
+
+    async def test_autenticacion(self):
+        self.assertEqual((await self.pedir("get", "/api/trabajadores/", token=False)).status_code, 200)
+        respuesta = await self.pedir("post", "/api/trabajadores/", self.TRABAJADOR, token=False)
+        self.assertEqual(respuesta.status_code, 401)
+        self.assertEqual(respuesta["WWW-Authenticate"], "Token")
+        self.assertEqual((await self.pedir("get", "/api/trabajadores/", token="no-existe")).status_code, 401)
+        self.assertEqual(await Trabajador.objects.acount(), 0)
+
+    async def test_crear_modificar_eliminar(self):
+        respuesta = await self.pedir("post", "/api/trabajadores/", self.TRABAJADOR)
+        self.assertEqual(respuesta.status_code, 201)
+        url = f"/api/trabajadores/{respuesta.json()['id']}/"
+
+        respuesta = await self.pedir("get", url)
+        self.assertEqual(respuesta.json()["nombre"], "Ana")
+        self.assertEqual((await self.pedir("get", url, headers={"If-None-Match": respuesta["ETag"]})).status_code, 304)
+
+        datos = dict(self.TRABAJADOR, nombre="Ana María")
+        self.assertEqual((await self.pedir("put", url, datos)).status_code, 200)
+        self.assertEqual((await Trabajador.objects.aget()).nombre, "Ana María")
+        respuesta = await self.pedir("put", url, dict(datos, email="sin-arroba"))
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("email", respuesta.json())
+
+        self.assertEqual((await self.pedir("delete", url, token=False)).status_code, 401)
+        self.assertEqual((await self.pedir("delete", url)).status_code, 204)
+        respuesta = await self.pedir("get", url)
+        self.assertEqual(respuesta.status_code, 404)
+        self.assertEqual(respuesta.json(), {"detail": "Trabajador no encontrado"})
+
+    async def test_guarda_con_el_serializer(self):
+        with mock.patch.object(TrabajadorSerializer, "create", autospec=True, side_effect=TrabajadorSerializer.create) as crear:
+            respuesta = await self.pedir("post", "/api/trabajadores/", self.TRABAJADOR)
+        self.assertEqual(respuesta.status_code, 201)
+        crear.assert_called_once()
+        url = f"/api/trabajadores/{respuesta.json()['id']}/"
+        with mock.patch.object(TrabajadorSerializer, "update", autospec=True, side_effect=TrabajadorSerializer.update) as actualizar:
+            respuesta = await self.pedir("put", url, dict(self.TRABAJADOR, nombre="Ana María"))
+        self.assertEqual(respuesta.json()["nombre"], "Ana María")
+        actualizar.assert_called_once()
+
+    async def test_metodo_no_permitido(self):
+        respuesta = await self.pedir("patch", "/api/trabajadores/", {})
+        self.assertEqual(respuesta.status_code, 405)
+        self.assertEqual(respuesta["Allow"], "GET, POST")
+        respuesta = await self.pedir("post", "/api/trabajadores/1/", {})
+        self.assertEqual(respuesta["Allow"], "GET, PUT, DELETE")
+
+    async def test_upsert(self):
+        await Trabajador.objects.acreate(**self.TRABAJADOR)
+        asistencia = {"trabajador_rut": "12345678-5", "fecha": "2025-01-01", "estado": "PRESENTE"}
+        primera = await self.pedir("post", "/api/asistencias/?upsert=1", asistencia)
+        self.assertEqual(primera.status_code, 200)
+        segunda = await self.pedir("post", "/api/asistencias/?upsert=1", dict(asistencia, estado="AUSENTE"))
+        self.assertEqual(segunda.status_code, 200)
+        self.assertEqual(segunda.json()["id"], primera.json()["id"])
+        self.assertEqual([a.estado async for a in Asistencia.objects.all()], ["AUSENTE"])
+
+    async def test_paginacion(self):
+        # Fechas repetidas: el cursor (-fecha, id) desempata por id
+        await self.poblar(9, lambda d: {"fecha": INICIO + timedelta(days=d % 4), "trabajador_rut": f"{10_000_000 + d}-0"})
+        ids, url = [], "/api/asistencias/?page_size=2"
+        while url:
+            pagina = (await self.pedir("get", url)).json()
+            self.assertLessEqual(len(pagina["results"]), 2)
+            ids += [fila["id"] for fila in pagina["results"]]
+            url = pagina["next"]
+        esperado = [pk async for pk in Asistencia.objects.order_by("-fecha", "id").values_list("id", flat=True)]
+        self.assertEqual(ids, esperado)
+
+    async def test_stream(self):
+        await self.poblar(5, lambda d: {})
+        respuesta = await self.pedir("get", "/api/asistencias/?stream=ndjson&chunk_size=2&fields=id,fecha")
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta["Content-Type"], "application/x-ndjson")
+        contenido = b"".join([parte async for parte in respuesta.streaming_content])
+        esperado = [
+            {"id": pk, "fecha": str(fecha)}
+            async for pk, fecha in Asistencia.objects.order_by("id").values_list("id", "fecha")
+        ]
+        self.assertEqual([json.loads(linea) for linea in contenido.splitlines()], esperado)
+        self.assertEqual((await self.pedir("get", "/api/asistencias/?stream=xml")).status_code, 400)
+
+
+class TrabajosTests(TransactionTestCase):
+    """
+    Cola de ``/api/trabajos/``. Los trabajos se ejecutan en este proceso
+    como ``runworker --procesos 0``, con las transacciones reales.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("trabajos", password="x"))
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.enterContext(override_settings(API_JOBS_DIR=directorio.name))
+        self.directorio = directorio.name
+
+    def procesar(self):
+        while pks := trabajos.reclamar("tests", 1):
+            trabajos.ejecutar(pks[0])
+
+    def consultar(self, respuesta):
+        self.assertEqual(respuesta.status_code, 202, respuesta.content[:500])
+        self.procesar()
+        return self.client.get(respuesta["Location"]).json()
+
+    def test_encolar_y_consultar(self):
+        Asistencia.objects.create(trabajador_rut="11111111-1", fecha=INICIO, estado="PRESENTE")
+        trabajo = self.consultar(self.client.post("/api/trabajos/", {"tarea": "reconstruir_resumen"}, format="json"))
+        self.assertEqual(trabajo["estado"], Trabajo.COMPLETADO)
+        self.assertEqual(trabajo["progreso"], 1)
+        self.assertEqual(trabajo["resultado"], {"filas": 1})
+        self.assertEqual(self.client.get("/api/trabajos/", {"estado": Trabajo.COMPLETADO}).json()["results"][0]["id"], trabajo["id"])
+
+        respuesta = self.client.post("/api/trabajos/", {"tarea": "no_existe"}, format="json")
+        self.assertEqual(respuesta.status_code, 400)
+
+    def test_reintentos_y_fallo_definitivo(self):
+        def fallar(trabajo):
+            raise RuntimeError("sin conexión")
+
+        trabajos.TAREAS["fallar"] = fallar
+        self.addCleanup(trabajos.TAREAS.pop, "fallar")
+        trabajo = trabajos.encolar("fallar", max_intentos=2)
+
+        with self.assertLogs("core.trabajos", "ERROR"):
+            self.procesar()
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.intentos), (Trabajo.PENDIENTE, 1))
+        self.assertIn("sin conexión", trabajo.error)
+        self.assertGreater(trabajo.disponible_desde, timezone.now())
+
+        Trabajo.objects.update(disponible_desde=timezone.now())
+        with self.assertLogs("core.trabajos", "ERROR"):
+            self.procesar()
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.intentos), (Trabajo.FALLIDO, 2))
+
+    def test_importar_en_segundo_plano(self):
+        Trabajador.objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+        )
+        contenido = "trabajador_rut,fecha,estado\n" + "".join(
+            f"12345678-5,{INICIO + timedelta(days=d)},PRESENTE\n" for d in range(30)
+        )
+        archivo = SimpleUploadedFile("asistencias.csv", contenido.encode())
+        trabajo = self.consultar(self.client.post("/api/asistencias/importar/?en_segundo_plano=1", {"archivo": archivo}))
+        self.assertEqual(trabajo["estado"], Trabajo.COMPLETADO)
+        self.assertEqual(trabajo["resultado"]["guardados"], 30)
+        self.assertEqual(Asistencia.objects.count(), 30)
+        self.assertEqual(list(Path(self.directorio).iterdir()), [])
+
+    def test_requiere_autenticacion(self):
+        trabajo = trabajos.encolar("purgar_cambios", {"dias": 30})
+        anonimo = APIClient()
+        for url in ("/api/trabajos/", f"/api/trabajos/{trabajo.pk}/"):
+            with self.subTest(url):
+                self.assertEqual(anonimo.get(url).status_code, 401)
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_cancelar(self):
+        trabajo = trabajos.encolar("reconstruir_resumen")
+        respuesta = self.client.delete(f"/api/trabajos/{trabajo.pk}/")
+        self.assertEqual(respuesta.json()["estado"], Trabajo.CANCELADO)
+        self.assertEqual(self.client.delete(f"/api/trabajos/{trabajo.pk}/").status_code, 409)
+        self.assertEqual(trabajos.reclamar("tests", 1), [])
+
+
+class NominaTests(TestCase):
+    """Montos de ``core/nomina.py`` contra el cálculo a mano."""
+
+    def trabajador(self, rut, sueldo_base, fecha_ingreso=date(2020, 1, 1)):
+        return Trabajador.objects.create(
+            rut=rut, nombre="Nombre", apellido=rut, fecha_nacimiento=date(1990, 1, 1),
+            email=f"{rut}@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+            turno="DIURNO", fecha_ingreso=fecha_ingreso, sueldo_base=Decimal(sueldo_base), estado="ACTIVO",
+        )
+
+    def asistir(self, trabajador, dias, estado="PRESENTE", **campos):
+        Asistencia.objects.bulk_create([
+            Asistencia(
+                trabajador=trabajador, trabajador_rut=trabajador.rut, trabajador_nombre=trabajador.nombre,
+                fecha=INICIO + timedelta(days=d), estado=estado, **campos,
+            )
+            for d in dias
+        ])
+
+    def test_calculo_y_upsert(self):
+        # Valor día 22.000, valor hora 660.000 × 28 / (30 × 44) = 14.000
+        ana = self.trabajador("11111111-1", 660000)
+        self.asistir(ana, range(20))
+        self.asistir(ana, [20], estado="AUSENTE")
+        self.asistir(ana, [21], minutos_atraso=30, horas_extras=Decimal("2"))
+        # Ingresa el día 11: se descuentan 10 días a 11.000
+        beto = self.trabajador("22222222-2", 330000, fecha_ingreso=date(2025, 1, 11))
+        self.asistir(beto, [10, 11, 12])
+        # Sólo ausencias: sin sueldo
+        self.asistir(self.trabajador("33333333-3", 500000), [0, 1], estado="AUSENTE")
+        # Sin asistencias en el mes: sin fila
+        self.trabajador("44444444-4", 500000)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            informe = nomina.generar("2025-01")
+        self.assertEqual(informe["trabajadores"], 3)
+        sueldos = dict(SueldoTrabajador.objects.values_list("trabajador_rut", "sueldo_total_mes"))
+        self.assertEqual(sueldos, {
+            "11111111-1": Decimal("660000") - 22000 - 7000 + 42000,
+            "22222222-2": Decimal("330000") - 110000,
+            "33333333-3": 0,
+        })
+        self.assertEqual(SueldoTrabajador.objects.get(trabajador=ana).cantidad_trabajos_mes, 21)
+        self.assertEqual(
+            resumen.consultar({"desde": "2025-01", "hasta": "2025-01"})[0]["sueldo_total_mes"], sum(sueldos.values()),
+        )
+
+        # Recalcular actualiza el monto de la misma fila y conserva lo
+        # ingresado a mano (trabajos del mes, eficiencia asociada)
+        SueldoTrabajador.objects.filter(trabajador=ana).update(
+            cantidad_trabajos_mes=4, tipo_trabajos_mes="Soldaduras", id_eficiencia_asociada=7,
+        )
+        self.asistir(ana, [22], estado="AUSENTE")
+        with self.captureOnCommitCallbacks(execute=True):
+            nomina.generar("2025-01")
+        sueldo = SueldoTrabajador.objects.get(trabajador=ana)
+        self.assertEqual(sueldo.sueldo_total_mes, sueldos["11111111-1"] - 22000)
+        self.assertEqual(
+            (sueldo.cantidad_trabajos_mes, sueldo.tipo_trabajos_mes, sueldo.id_eficiencia_asociada),
+            (4, "Soldaduras", 7),
+        )
+        self.assertEqual(SueldoTrabajador.objects.count(), 3)
+
+    def test_consultas_no_dependen_de_los_trabajadores(self):
+        for n in ESCALAS:
+            for i in range(Trabajador.objects.count(), n):
+                self.asistir(self.trabajador(f"{10_000_000 + i}-{i % 10}", 600000), range(3))
+            with CaptureQueriesContext(connection) as consultas:
+                nomina.calcular("2025-01")
+            self.assertEqual(len(consultas), 2)
+
+    def test_mes_invalido(self):
+        cliente = APIClient()
+        cliente.force_authenticate(User.objects.create_user("nomina", password="x"))
+        respuesta = cliente.post("/api/sueldos/calcular/", {"mes": "2025-13"}, format="json")
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("mes", respuesta.json())
+        self.assertFalse(Trabajo.objects.exists())
+
+
+class TrabajadorRelacionadoTests(TestCase):
+    """Vínculo de los registros con su Trabajador por id o por RUT."""
+
+    @classmethod
+    def setUpTestData(cls):
+        def trabajador(rut, nombre):
+            return Trabajador.objects.create(
+                rut=rut, nombre=nombre, apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+                email=f"{rut}@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+                turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+            )
+
+        cls.ana = trabajador("12345678-5", "Ana")
+        cls.beto = trabajador("11111111-1", "Beto")
+
+    def validar(self, context=None, **datos):
+        serializer = AsistenciaSerializer(
+            data={"fecha": str(INICIO), "estado": "PRESENTE", **datos}, context=context or {},
+        )
+        serializer.is_valid()
+        return serializer
+
+    def lote(self):
+        # Contexto que arma bulk.py: los trabajadores del lote ya resueltos
+        return {
+            "trabajadores_por_id": {t.pk: t for t in (self.ana, self.beto)},
+            "trabajadores_por_rut": {t.rut: t for t in (self.ana, self.beto)},
+            "verificar_unicidad": False,
+        }
+
+    def test_por_rut(self):
+        for context in (None, self.lote()):
+            datos = self.validar(context, trabajador_rut=self.beto.rut).validated_data
+            self.assertEqual((datos["trabajador"], datos["trabajador_nombre"]), (self.beto, "Beto Pérez"))
+
+            datos = self.validar(context, trabajador=self.ana.pk).validated_data
+            self.assertEqual((datos["trabajador_rut"], datos["trabajador_nombre"]), (self.ana.rut, "Ana Pérez"))
+
+    def test_rut_distinto_al_del_trabajador(self):
+        for context in (None, self.lote()):
+            serializer = self.validar(context, trabajador=self.ana.pk, trabajador_rut=self.beto.rut)
+            self.assertEqual(serializer.errors, {"non_field_errors": ["El RUT no coincide con el trabajador indicado."]})
+
+    def test_rut_desconocido(self):
+        for context in (None, self.lote()):
+            # Se guarda sin FK si trae el nombre; sin él no hay de dónde sacarlo
+            serializer = self.validar(context, trabajador_rut="99999999-9", trabajador_nombre="Carla")
+            self.assertIsNone(serializer.validated_data["trabajador"])
+            serializer = self.validar(context, trabajador_rut="99999999-9")
+            self.assertEqual(list(serializer.errors), ["trabajador_nombre"])
+
+    def test_id_desconocido_en_lote(self):
+        with self.assertNumQueries(0):
+            serializer = self.validar(self.lote(), trabajador=0)
+        self.assertEqual(serializer.errors["trabajador"][0].code, "does_not_exist")
+        self.assertEqual(self.validar(self.lote(), trabajador="x").errors["trabajador"][0].code, "incorrect_type")
+
+
+class MigracionesTests(TransactionTestCase):
+    """Migraciones de datos de ``core``, aplicadas sobre una base con datos."""
+
+    def migrar(self, *destino):
+        destino = [("core", nombre) for nombre in destino]
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(destino)
+        return executor.loader.project_state(destino).apps
+
+    def tearDown(self):
+        self.migrar(*(nombre for _app, nombre in MigrationExecutor(connection).loader.graph.leaf_nodes("core")))
+
+    def test_vincular_por_rut(self):
+        apps = self.migrar("0002_trabajador_fk")
+        ana = apps.get_model("core", "Trabajador").objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+        )
+        comunes = {"trabajador_nombre": "Ana"}
+        registros = {
+            "Asistencia": {"fecha": INICIO, "estado": "PRESENTE"},
+            "EficienciaTrabajador": {"id_eficiencia": 1},
+            "DesempenoTrabajador": {"id_desempeno": 1},
+            "SueldoTrabajador": {"mes": "2025-01", "tipo_trabajos_mes": "x"},
+        }
+        for nombre, campos in registros.items():
+            apps.get_model("core", nombre).objects.create(trabajador_rut=ana.rut, **comunes, **campos)
+        Asistencia = apps.get_model("core", "Asistencia")
+        Asistencia.objects.create(trabajador_rut="99999999-9", **comunes, fecha=INICIO, estado="PRESENTE")
+
+        apps = self.migrar("0003_backfill_trabajador")
+        for nombre in registros:
+            # Un RUT sin trabajador queda sin FK
+            esperado = [("12345678-5", ana.pk)] + ([("99999999-9", None)] if nombre == "Asistencia" else [])
+            filas = apps.get_model("core", nombre).objects.order_by("id").values_list("trabajador_rut", "trabajador_id")
+            self.assertEqual(list(filas), esperado, nombre)
+
+    def test_asistencias_duplicadas(self):
+        Asistencia = self.migrar("0004_indices_consultas").get_model("core", "Asistencia")
+        comunes = {"trabajador_rut": "12345678-5", "trabajador_nombre": "Ana"}
+        primera, segunda, _otra = Asistencia.objects.bulk_create([
+            Asistencia(**comunes, fecha=INICIO, estado="PRESENTE"),
+            Asistencia(**comunes, fecha=INICIO, estado="AUSENTE"),
+            Asistencia(**comunes, fecha=INICIO + timedelta(days=1), estado="PRESENTE"),
+        ])
+
+        with self.assertRaisesMessage(CommandError, f"12345678-5 {INICIO}: ids {primera.pk}, {segunda.pk}"):
+            self.migrar("0005_asistencia_unica")
+        self.assertEqual(Asistencia.objects.count(), 3)
+
+        segunda.delete()
+        self.migrar("0005_asistencia_unica")
+        self.assertEqual(sorted(Asistencia.objects.values_list("estado", flat=True)), ["PRESENTE", "PRESENTE"])
+
+    def test_sueldos_duplicados(self):
+        SueldoTrabajador = self.migrar("0009_trabajos").get_model("core", "SueldoTrabajador")
+        comunes = {"trabajador_nombre": "Ana", "tipo_trabajos_mes": "x"}
+        primero, segundo, _otro = SueldoTrabajador.objects.bulk_create([
+            SueldoTrabajador(**comunes, trabajador_rut="12345678-5", mes="2025-01", sueldo_total_mes=1),
+            SueldoTrabajador(**comunes, trabajador_rut="12345678-5", mes="2025-01", sueldo_total_mes=2),
+            SueldoTrabajador(**comunes, trabajador_rut="12345678-5", mes="2025-02", sueldo_total_mes=3),
+        ])
+
+        with self.assertRaisesMessage(CommandError, f"12345678-5 2025-01: ids {primero.pk}, {segundo.pk}"):
+            self.migrar("0010_sueldo_unico")
+        self.assertEqual(SueldoTrabajador.objects.count(), 3)
+
+        primero.delete()
+        self.migrar("0010_sueldo_unico")
+        self.assertEqual(
+            sorted(SueldoTrabajador.objects.values_list("mes", "sueldo_total_mes")),
+            [("2025-01", 2), ("2025-02", 3)],
+        )
+
+
+class StatsTests(TestCase):
+    """Valores de ``stats.distribucion_sueldos`` con diez sueldos conocidos."""
+
+    @classmethod
+    def setUpTestData(cls):
+        ana = Trabajador.objects.create(
+            rut="12345678-5", nombre="Ana", apellido="Pérez", fecha_nacimiento=date(1990, 1, 1),
+            email="ana@example.com", rol_cargo="Operario", tipo_contrato="Indefinido", area="Bodega",
+            turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+        )
+        # 100.000 a 500.000 en enero y 600.000 a 1.000.000 en febrero; Ana
+        # tiene el menor sueldo de cada mes
+        for i in range(10):
+            rut = ana.rut if i % 5 == 0 else f"{i}-{i}"
+            SueldoTrabajador.objects.create(
+                trabajador=ana if rut == ana.rut else None, trabajador_rut=rut, mes=f"2025-0{i // 5 + 1}",
+                tipo_trabajos_mes="x", sueldo_total_mes=Decimal((i + 1) * 100000),
+            )
+
+    def distribucion(self, **params):
+        datos = stats.distribucion_sueldos(params)
+        return datos, {p: v and int(v) for p, v in datos.pop("percentiles").items()}
+
+    def test_rango_mas_cercano(self):
+        datos, percentiles = self.distribucion(percentiles="0,10,25,50,75,90,100")
+        self.assertEqual(
+            (datos["registros"], datos["minimo"], datos["maximo"], datos["promedio"], datos["total"]),
+            (10, 100000, 1000000, 550000, 5500000),
+        )
+        self.assertEqual(percentiles, {
+            "0": 100000, "10": 100000, "25": 300000, "50": 500000, "75": 800000, "90": 900000, "100": 1000000,
+        })
+
+    def test_filtros(self):
+        datos, percentiles = self.distribucion(desde="2025-02", percentiles="10,50,90")
+        self.assertEqual((datos["registros"], datos["minimo"]), (5, 600000))
+        self.assertEqual(percentiles, {"10": 600000, "50": 800000, "90": 1000000})
+
+        datos, percentiles = self.distribucion(area="Bodega", hasta="2025-01", percentiles="50")
+        self.assertEqual((datos["registros"], percentiles), (1, {"50": 100000}))
+
+        datos, percentiles = self.distribucion(desde="2025-03", percentiles="50")
+        self.assertEqual((datos["registros"], datos["minimo"], percentiles), (0, None, {"50": None}))
+
+    def test_meses_invalidos(self):
+        for params in ({"desde": "2025-1"}, {"hasta": "2025-13"}, {"desde": "2025-01-15"}, {"hasta": "enero"}):
+            respuesta = self.client.get("/api/stats/sueldos/", params)
+            self.assertEqual(respuesta.status_code, 400, params)
+            self.assertEqual(list(respuesta.json()), list(params))
+
+
+class EficienciaTests(TestCase):
+    """Indicadores y ranking de ``core/eficiencia.py`` con tres trabajadores."""
+
+    @classmethod
+    def setUpTestData(cls):
+        def trabajador(rut):
+            return Trabajador.objects.create(
+                rut=rut, nombre="Nombre", apellido=rut, fecha_nacimiento=date(1990, 1, 1),
+                email=f"{rut}@example.com", rol_cargo="Operario", tipo_contrato="Indefinido",
+                turno="DIURNO", fecha_ingreso=date(2020, 1, 1), estado="ACTIVO",
+            )
+
+        def asistir(t, dia, entrada, salida, estado="PRESENTE", atraso=0):
+            Asistencia.objects.create(
+                trabajador=t, trabajador_rut=t.rut, trabajador_nombre=t.nombre, fecha=INICIO + timedelta(days=dia),
+                hora_entrada=entrada, hora_salida=salida, estado=estado, minutos_atraso=atraso,
+            )
+
+        # 18 h, 36 trabajos, sueldo del mes 720.000
+        ana = trabajador("11111111-1")
+        for dia in (0, 1):
+            asistir(ana, dia, "08:00", "17:00")
+        EficienciaTrabajador.objects.create(trabajador_rut=ana.rut, id_eficiencia=1, trabajos_completados_en_1_mes=1)
+        EficienciaTrabajador.objects.create(trabajador_rut=ana.rut, id_eficiencia=2, trabajos_completados_en_1_mes=36)
+        SueldoTrabajador.objects.create(
+            trabajador_rut=ana.rut, mes="2025-01", tipo_trabajos_mes="x", sueldo_total_mes=Decimal("720000"),
+        )
+        # Turnos de noche (16 h), una ausencia y 10 minutos de atraso; sin
+        # sueldo del mes se usa el informado
+        beto = trabajador("22222222-2")
+        asistir(beto, 0, "22:00", "06:00", atraso=10)
+        asistir(beto, 1, "22:00", "06:00")
+        asistir(beto, 2, None, None, estado="AUSENTE")
+        EficienciaTrabajador.objects.create(
+            trabajador_rut=beto.rut, id_eficiencia=3, trabajos_completados_en_1_mes=16, sueldo_promedio_informado=800000,
+        )
+        Accidente.objects.create(
+            fecha=INICIO, tipo="Caída", gravedad="LEVE", lugar="Bodega", trabajadores_involucrados="33333333-3, 22222222-2",
+        )
+        # Sin eficiencia informada; su RUT es parte del de beto
+        asistir(trabajador("2222222-2"), 0, "08:00", "17:00")
+
+    def test_indicadores_y_ranking(self):
+        with self.assertNumQueries(1):
+            filas, columnas = eficiencia.calcular("2025-01")
+        self.assertEqual([f[0] for f in filas], ["11111111-1", "2222222-2", "22222222-2"])
+        self.assertEqual(columnas["horas_trabajadas"].tolist(), [18, 9, 16])
+        self.assertEqual(columnas["trabajos_por_hora"][[0, 2]].tolist(), [2, 1])
+        self.assertEqual(columnas["costo_por_trabajo"][[0, 2]].tolist(), [20000, 50000])
+        self.assertEqual(columnas["accidentes"].tolist(), [0, 0, 1])
+        # Promedio ponderado de percentiles; sin trabajos sólo cuentan los demás
+        self.assertEqual(columnas["puntaje"].round(2).tolist(), [71.67, 66.67, 21.67])
+        self.assertEqual(columnas["ranking"].tolist(), [1, 2, 3])
+
+    def test_endpoint(self):
+        respuesta = self.client.get("/api/eficiencias/puntajes/", {"mes": "2025-01", "limite": 2})
+        datos = respuesta.json()
+        self.assertEqual(datos["trabajadores"], 3)
+        self.assertEqual([r["trabajador_rut"] for r in datos["results"]], ["11111111-1", "2222222-2"])
+        self.assertIsNone(datos["results"][1]["costo_por_trabajo"])
+        self.assertEqual(datos["percentiles"]["horas_trabajadas"]["50"], 16)
+
+        datos = self.client.get("/api/eficiencias/puntajes/", {"trabajador_rut": "22222222-2"}).json()
+        self.assertEqual(datos["mes"], "2025-01")
+        self.assertEqual([(r["ranking"], r["trabajos"]) for r in datos["results"]], [(3, 16)])
+
+        self.assertEqual(self.client.get("/api/eficiencias/puntajes/", {"mes": "2025-1"}).status_code, 400)
+
+
+class PerfilesTests(SimpleTestCase):
+    """Variables que exige ``DJANGO_PROFILE=prod`` (``backend/settings.py``)."""
+
+    PROD = {
+        "DJANGO_PROFILE": "prod", "DJANGO_SECRET_KEY": "x" * 50,
+        "DJANGO_ALLOWED_HOSTS": "api.example.com", "REDIS_URL": "redis://cache:6379/0", "API_METRICS_TOKEN": "m" * 32,
+    }
+
+    def cargar(self, **variables):
+        """Importa los settings en otro proceso; devuelve el error o ``""``."""
+        entorno = {k: v for k, v in os.environ.items() if k not in self.PROD and k != "CACHE_BACKEND"}
+        entorno.update({k: v for k, v in {**self.PROD, **variables}.items() if v is not None})
+        resultado = subprocess.run(
+            [sys.executable, "-c", "import backend.settings"],
+            cwd=settings.BASE_DIR, env=entorno, capture_output=True, text=True,
+        )
+        return resultado.stderr.strip().splitlines()[-1] if resultado.returncode else ""
+
+    def test_prod(self):
+        self.assertEqual(self.cargar(), "")
+        self.assertEqual(self.cargar(REDIS_URL=None, CACHE_BACKEND="locmem"), "")
+        self.assertIn("DJANGO_ALLOWED_HOSTS", self.cargar(DJANGO_ALLOWED_HOSTS=None))
+        self.assertIn("DJANGO_ALLOWED_HOSTS", self.cargar(DJANGO_ALLOWED_HOSTS=""))
+        self.assertIn("REDIS_URL o CACHE_BACKEND", self.cargar(REDIS_URL=None))
+        self.assertIn("DJANGO_SECRET_KEY", self.cargar(DJANGO_SECRET_KEY=None))
+        self.assertIn("API_METRICS_TOKEN", self.cargar(API_METRICS_TOKEN=None))
+        self.assertIn("API_METRICS_TOKEN", self.cargar(API_METRICS_TOKEN=""))
+
+    @override_settings(API_METRICS_TOKEN="m" * 32)
+    def test_metrics_con_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer otro").status_code, 401)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION=f"Bearer {'m' * 32}").status_code, 200)
+
+    def test_otros_perfiles_no_exigen_variables(self):
+        for perfil in ("dev", "bench"):
+            with self.subTest(perfil):
+                self.assertEqual(
+                    self.cargar(
+                        DJANGO_PROFILE=perfil, DJANGO_SECRET_KEY=None, DJANGO_ALLOWED_HOSTS=None, REDIS_URL=None,
+                        API_METRICS_TOKEN=None,
+                    ),
+                    "",
+                )
@@ -0,0 +1,191 @@
+# core/trabajos.py
+"""
+Cola de trabajos en segundo plano guardada en la tabla ``Trabajo``, sin
+broker externo.
+
+- ``encolar`` crea el trabajo (lo usan las vistas: responden ``202`` y el
+  cliente consulta ``/api/trabajos/<id>/``).
+- ``manage.py runworker`` reclama trabajos con ``reclamar`` y los ejecuta en
+  un pool de procesos con ``ejecutar``.
+- Las tareas se registran con ``@tarea("nombre")`` (ver ``core/tareas.py``)
+  y reciben el ``Trabajo`` y sus ``parametros``; informan el avance con
+  ``avanzar`` y devuelven un resultado serializable a JSON.
+
+Reclamar es un ``UPDATE ... WHERE estado = 'PENDIENTE'`` por trabajo: si
+dos workers eligen el mismo, sólo uno modifica la fila. Así funciona igual
+en SQLite, MySQL y PostgreSQL sin ``SELECT ... FOR UPDATE SKIP LOCKED``.
+"""
+import logging
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, connections
+from django.db.models import F
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+
+from .models import Trabajo
+
+logger = logging.getLogger(__name__)
+
+TAREAS = {}
+
+
+def tarea(nombre):
+    """Registra la función como tarea ``nombre``."""
+    def registrar(funcion):
+        TAREAS[nombre] = funcion
+        return funcion
+    return registrar
+
+
+def _max_intentos():
+    return getattr(settings, "API_JOBS_MAX_ATTEMPTS", 3)
+
+
+def _reintento(intentos):
+    # Espera exponencial: 30 s, 60 s, 120 s...
+    return timedelta(seconds=getattr(settings, "API_JOBS_RETRY_SECONDS", 30) * 2 ** max(0, intentos - 1))
+
+
+def _timeout():
+    return timedelta(seconds=getattr(settings, "API_JOBS_TIMEOUT_SECONDS", 600))
+
+
+# ---------------------- cola ---------------------- #
+def encolar(nombre, parametros=None, max_intentos=None):
+    if nombre not in TAREAS:
+        raise ValidationError({"tarea": f"Use una de: {', '.join(sorted(TAREAS))}."})
+    return Trabajo.objects.create(
+        tarea=nombre,
+        parametros=parametros or {},
+        max_intentos=max_intentos or _max_intentos(),
+    )
+
+
+def cancelar(trabajo):
+    """Cancela un trabajo que todavía no empezó. Devuelve si se canceló."""
+    return bool(Trabajo.objects.filter(pk=trabajo.pk, estado=Trabajo.PENDIENTE).update(
+        estado=Trabajo.CANCELADO, terminado=timezone.now(),
+    ))
+
+
+def reclamar(worker, cantidad):
+    """Marca hasta ``cantidad`` trabajos disponibles como de ``worker``. Devuelve sus ids."""
+    ahora = timezone.now()
+    candidatos = Trabajo.objects.filter(
+        estado=Trabajo.PENDIENTE, disponible_desde__lte=ahora,
+    ).order_by("id").values_list("id", flat=True)[:cantidad * 2]
+
+    reclamados = []
+    for pk in candidatos:
+        tomado = Trabajo.objects.filter(pk=pk, estado=Trabajo.PENDIENTE).update(
+            estado=Trabajo.EJECUTANDO, worker=worker, intentos=F("intentos") + 1,
+            iniciado=ahora, latido=ahora,
+        )
+        if tomado:
+            reclamados.append(pk)
+            if len(reclamados) == cantidad:
+                break
+    return reclamados
+
+
+def latir(pks):
+    """Renueva el latido de los trabajos en curso; sin latido ``recuperar`` los da por perdidos."""
+    if not pks:
+        return
+    try:
+        Trabajo.objects.filter(pk__in=list(pks), estado=Trabajo.EJECUTANDO).update(latido=timezone.now())
+    except DatabaseError:
+        # SQLite bloqueada por la transacción de un trabajo: se reintenta en la próxima vuelta
+        logger.warning("No se pudo renovar el latido de %d trabajos.", len(pks))
+
+
+def fallar(pk, error):
+    """Devuelve el trabajo a la cola con espera exponencial o, sin intentos restantes, lo marca FALLIDO."""
+    trabajo = Trabajo.objects.only("intentos", "max_intentos").get(pk=pk)
+    ahora = timezone.now()
+    en_curso = Trabajo.objects.filter(pk=pk, estado=Trabajo.EJECUTANDO)
+    if trabajo.intentos < trabajo.max_intentos:
+        en_curso.update(
+            estado=Trabajo.PENDIENTE, error=error, worker="",
+            disponible_desde=ahora + _reintento(trabajo.intentos),
+        )
+    else:
+        en_curso.update(estado=Trabajo.FALLIDO, error=error, terminado=ahora)
+
+
+def recuperar():
+    """Reencola los trabajos cuyo worker dejó de dar señales (proceso terminado a la fuerza)."""
+    perdidos = list(Trabajo.objects.filter(
+        estado=Trabajo.EJECUTANDO, latido__lt=timezone.now() - _timeout(),
+    ).values_list("id", flat=True))
+    for pk in perdidos:
+        fallar(pk, "El worker dejó de responder.")
+    return len(perdidos)
+
+
+# ---------------------- ejecución ---------------------- #
+def _fuera_de_la_transaccion(funcion):
+    # Otra conexión (la del thread) para que el avance se vea antes del COMMIT
+    def correr():
+        try:
+            funcion()
+        finally:
+            connections.close_all()
+
+    hilo = threading.Thread(target=correr)
+    hilo.start()
+    hilo.join()
+
+
+def avanzar(trabajo, hecho, total, detalle=""):
+    """
+    Informa el avance (``hecho`` de ``total``). Escribe a lo más una vez por
+    segundo, así las tareas pueden llamarlo en cada bloque.
+    """
+    ahora = time.monotonic()
+    if ahora - getattr(trabajo, "_ultimo_avance", 0) < 1:
+        return
+    trabajo._ultimo_avance = ahora
+    trabajo.progreso = min(1, hecho / total) if total else 0
+    trabajo.detalle = detalle[:200]
+
+    def guardar():
+        Trabajo.objects.filter(pk=trabajo.pk).update(
+            progreso=trabajo.progreso, detalle=trabajo.detalle, latido=timezone.now(),
+        )
+
+    if not connection.in_atomic_block:
+        guardar()
+    elif connection.vendor != "sqlite":
+        _fuera_de_la_transaccion(guardar)
+    # SQLite admite un solo escritor: dentro de la transacción de la tarea
+    # el avance se vería recién al terminar, así que no se escribe.
+
+
+def ejecutar(pk):
+    """Ejecuta un trabajo ya reclamado. Corre en los procesos del pool de ``runworker``."""
+    close_old_connections()
+    try:
+        trabajo = Trabajo.objects.get(pk=pk)
+        funcion = TAREAS.get(trabajo.tarea)
+        try:
+            if funcion is None:
+                raise LookupError(f"La tarea {trabajo.tarea!r} no está registrada.")
+            resultado = funcion(trabajo, **trabajo.parametros)
+        except Exception:
+            logger.exception("Falló el trabajo %s.", trabajo)
+            fallar(pk, traceback.format_exc())
+            return
+        ahora = timezone.now()
+        Trabajo.objects.filter(pk=pk, estado=Trabajo.EJECUTANDO).update(
+            estado=Trabajo.COMPLETADO, progreso=1, resultado=resultado, error="",
+            terminado=ahora, latido=ahora,
+        )
+    finally:
+        close_old_connections()
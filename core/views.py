@@ -1,22 +1,34 @@
 # core/views.py
-from django.http import JsonResponse
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
 
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 
 from drf_spectacular.utils import extend_schema
 
 from .models import (
     Trabajador, Asistencia, Accidente,
-    EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador
+    EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador, Trabajo
 )
 from .serializers import (
     TrabajadorSerializer, AsistenciaSerializer, AccidenteSerializer,
-    EficienciaTrabajadorSerializer, DesempenoTrabajadorSerializer, SueldoTrabajadorSerializer
+    EficienciaTrabajadorSerializer, DesempenoTrabajadorSerializer, SueldoTrabajadorSerializer,
+    TrabajoSerializer
 )
+from . import cache, cambios, eficiencia, fastpath, importacion, metricas, nomina, resumen, stats, trabajos
+from .authentication import CachedTokenAuthentication
+from .bulk import procesar_lote, upsert_uno
+from .condicional import agregar_validadores, no_modificado, validadores_listado, validadores_objeto
+from .filters import campos_solicitados, columnas, filtrar, ordenamiento
+from .pagination import KeysetPagination
+from .streaming import respuesta_stream
 
 # ===================== HOME =====================
 def home(request):
@@ -27,13 +39,90 @@ def home(request):
             "/api/asistencias/",
             "/api/accidentes/",
             "/api/eficiencias/",
+            "/api/eficiencias/puntajes/",
             "/api/desempenos/",
             "/api/sueldos/",
-            "/api/token/"
+            "/api/resumen-mensual/",
+            "/api/changes/",
+            "/api/events/",
+            "/api/trabajos/",
+            "/api/stats/asistencia/",
+            "/api/stats/atrasos/",
+            "/api/stats/accidentes/",
+            "/api/stats/sueldos/",
+            "/api/token/",
+            "/metrics"
         ]
     })
 
 
+# ===================== MÉTRICAS =====================
+def metrics(request):
+    """Métricas de este proceso en formato Prometheus (ver core/metricas.py)."""
+    token = getattr(settings, "API_METRICS_TOKEN", "")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+    return HttpResponse(metricas.exportar(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ===================== LISTADOS =====================
+
+def _listar(request, queryset, serializer_class, ordering=("id",)):
+    params = request.query_params
+    queryset = filtrar(queryset, params)
+    ordering = ordenamiento(params, queryset.model, ordering)
+    fields = campos_solicitados(params, serializer_class)
+    if fields is not None:
+        queryset = queryset.only(*columnas(queryset.model, fields, ordering))
+
+    usar_cache = cache.habilitada() and not params.get("stream")
+    if usar_cache:
+        clave = cache.clave_respuesta(request, queryset.model)
+        entrada = cache.obtener(clave)
+        if entrada is not None:
+            etag, timestamp = entrada["etag"], entrada["timestamp"]
+            respuesta = no_modificado(request, etag, timestamp) or Response(entrada["data"])
+            respuesta["X-Cache"] = "HIT"
+            return agregar_validadores(respuesta, etag, timestamp)
+
+    etag, timestamp = validadores_listado(request, queryset)
+    respuesta = no_modificado(request, etag, timestamp)
+    if respuesta is not None:
+        return respuesta
+
+    if params.get("stream"):
+        return agregar_validadores(
+            respuesta_stream(request, queryset, serializer_class, fields=fields), etag, timestamp
+        )
+
+    paginator = KeysetPagination(ordering=ordering)
+    if fastpath.habilitada(serializer_class):
+        extra = [campo.lstrip("-") for campo in ordering]
+        valores, convertir = fastpath.valores(queryset, serializer_class, fields, extra=extra)
+        filas = paginator.paginate_queryset(valores, request)
+        with metricas.medir("serializacion"):
+            data = convertir(filas)
+    else:
+        page = paginator.paginate_queryset(queryset, request)
+        with metricas.medir("serializacion"):
+            data = serializer_class(page, many=True, fields=fields).data
+    respuesta = paginator.get_paginated_response(data)
+    if usar_cache:
+        cache.guardar(clave, {"data": respuesta.data, "etag": etag, "timestamp": timestamp})
+        respuesta["X-Cache"] = "MISS"
+    return agregar_validadores(respuesta, etag, timestamp)
+
+
+def _detalle(request, obj, serializer_class):
+    etag, timestamp = validadores_objeto(request, obj)
+    respuesta = no_modificado(request, etag, timestamp)
+    if respuesta is not None:
+        return respuesta
+    with metricas.medir("serializacion"):
+        data = serializer_class(obj).data
+    return agregar_validadores(Response(data), etag, timestamp)
+
+
 # ===================== TRABAJADORES =====================
 
 @extend_schema(
@@ -41,14 +130,12 @@ def home(request):
     responses={200: TrabajadorSerializer(many=True), 201: TrabajadorSerializer}
 )
 @api_view(["GET", "POST"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def trabajador_list(request):
 
     if request.method == "GET":
-        trabajadores = Trabajador.objects.all()
-        serializer = TrabajadorSerializer(trabajadores, many=True)
-        return Response(serializer.data)
+        return _listar(request, Trabajador.objects.all(), TrabajadorSerializer)
 
     if request.method == "POST":
         serializer = TrabajadorSerializer(data=request.data)
@@ -65,7 +152,7 @@ def trabajador_list(request):
     responses={200: TrabajadorSerializer, 204: None}
 )
 @api_view(["GET", "PUT", "DELETE"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def trabajador_detail(request, pk):
 
@@ -75,8 +162,7 @@ def trabajador_detail(request, pk):
         return Response({"detail": "Trabajador no encontrado"}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        serializer = TrabajadorSerializer(trabajador)
-        return Response(serializer.data)
+        return _detalle(request, trabajador, TrabajadorSerializer)
 
     if request.method == "PUT":
         serializer = TrabajadorSerializer(trabajador, data=request.data)
@@ -96,16 +182,17 @@ def trabajador_detail(request, pk):
     responses={200: AsistenciaSerializer(many=True), 201: AsistenciaSerializer}
 )
 @api_view(["GET", "POST"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def asistencia_list(request):
 
     if request.method == "GET":
-        asistencias = Asistencia.objects.all()
-        serializer = AsistenciaSerializer(asistencias, many=True)
-        return Response(serializer.data)
+        return _listar(request, Asistencia.objects.all(), AsistenciaSerializer, ordering=("-fecha", "id"))
 
     if request.method == "POST":
+        if request.query_params.get("upsert"):
+            return upsert_uno(request, AsistenciaSerializer)
+
         serializer = AsistenciaSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -117,7 +204,7 @@ def asistencia_list(request):
     responses={200: AsistenciaSerializer, 204: None}
 )
 @api_view(["GET", "PUT", "DELETE"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def asistencia_detail(request, pk):
 
@@ -127,8 +214,7 @@ def asistencia_detail(request, pk):
         return Response({"detail": "Asistencia no encontrada"}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        serializer = AsistenciaSerializer(asistencia)
-        return Response(serializer.data)
+        return _detalle(request, asistencia, AsistenciaSerializer)
 
     if request.method == "PUT":
         serializer = AsistenciaSerializer(asistencia, data=request.data)
@@ -141,6 +227,65 @@ def asistencia_detail(request, pk):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@extend_schema(
+    request=AsistenciaSerializer(many=True),
+    responses={200: AsistenciaSerializer(many=True), 201: AsistenciaSerializer(many=True)}
+)
+@api_view(["POST", "PUT", "PATCH", "DELETE"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def asistencia_bulk(request):
+    return procesar_lote(request, AsistenciaSerializer)
+
+
+_ARCHIVO = {"type": "object", "properties": {"archivo": {"type": "string", "format": "binary"}}}
+
+
+def _importar(request, serializer_class):
+    archivo = request.FILES.get("archivo")
+    if archivo is None:
+        return Response({"archivo": ["Adjunte el archivo CSV o XLSX en el campo 'archivo'."]},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if request.query_params.get("en_segundo_plano"):
+        return _importar_en_segundo_plano(request, serializer_class, archivo)
+    informe = importacion.importar(
+        importacion.leer(archivo, archivo.name),
+        serializer_class,
+        upsert=bool(request.query_params.get("upsert")),
+    )
+    codigo = status.HTTP_400_BAD_REQUEST if informe["errores"] else status.HTTP_201_CREATED
+    return Response(informe, status=codigo)
+
+
+def _importar_en_segundo_plano(request, serializer_class, archivo):
+    # El archivo queda en API_JOBS_DIR hasta que la tarea "importar" lo procese
+    extension = Path(archivo.name).suffix.lower()
+    if extension not in importacion.FORMATOS:
+        return Response({"archivo": [f"Formato no soportado; use {' o '.join(importacion.FORMATOS)}."]},
+                        status=status.HTTP_400_BAD_REQUEST)
+    directorio = Path(settings.API_JOBS_DIR)
+    directorio.mkdir(parents=True, exist_ok=True)
+    ruta = directorio / f"{uuid.uuid4().hex}{extension}"
+    with ruta.open("wb") as destino:
+        for parte in archivo.chunks():
+            destino.write(parte)
+
+    recurso = next(nombre for nombre, clase in importacion.RECURSOS.items() if clase is serializer_class)
+    trabajo = trabajos.encolar("importar", {
+        "recurso": recurso, "archivo": ruta.name, "nombre": archivo.name,
+        "upsert": bool(request.query_params.get("upsert")),
+    })
+    return _trabajo_aceptado(trabajo)
+
+
+@extend_schema(request={"multipart/form-data": _ARCHIVO}, responses={201: dict, 202: TrabajoSerializer, 400: dict})
+@api_view(["POST"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def asistencia_importar(request):
+    return _importar(request, AsistenciaSerializer)
+
+
 # ===================== ACCIDENTES =====================
 
 @extend_schema(
@@ -148,14 +293,12 @@ def asistencia_detail(request, pk):
     responses={200: AccidenteSerializer(many=True), 201: AccidenteSerializer}
 )
 @api_view(["GET", "POST"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def accidente_list(request):
 
     if request.method == "GET":
-        accidentes = Accidente.objects.all()
-        serializer = AccidenteSerializer(accidentes, many=True)
-        return Response(serializer.data)
+        return _listar(request, Accidente.objects.all(), AccidenteSerializer)
 
     if request.method == "POST":
         serializer = AccidenteSerializer(data=request.data)
@@ -169,7 +312,7 @@ def accidente_list(request):
     responses={200: AccidenteSerializer, 204: None}
 )
 @api_view(["GET", "PUT", "DELETE"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def accidente_detail(request, pk):
 
@@ -179,8 +322,7 @@ def accidente_detail(request, pk):
         return Response({"detail": "Accidente no encontrado"}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        serializer = AccidenteSerializer(accidente)
-        return Response(serializer.data)
+        return _detalle(request, accidente, AccidenteSerializer)
 
     if request.method == "PUT":
         serializer = AccidenteSerializer(accidente, data=request.data)
@@ -200,14 +342,12 @@ def accidente_detail(request, pk):
     responses={200: EficienciaTrabajadorSerializer(many=True), 201: EficienciaTrabajadorSerializer}
 )
 @api_view(["GET", "POST"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def eficiencia_list(request):
 
     if request.method == "GET":
-        data = EficienciaTrabajador.objects.all()
-        serializer = EficienciaTrabajadorSerializer(data, many=True)
-        return Response(serializer.data)
+        return _listar(request, EficienciaTrabajador.objects.all(), EficienciaTrabajadorSerializer)
 
     if request.method == "POST":
         serializer = EficienciaTrabajadorSerializer(data=request.data)
@@ -221,7 +361,7 @@ def eficiencia_list(request):
     responses={200: EficienciaTrabajadorSerializer, 204: None}
 )
 @api_view(["GET", "PUT", "DELETE"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def eficiencia_detail(request, pk):
 
@@ -231,7 +371,7 @@ def eficiencia_detail(request, pk):
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        return Response(EficienciaTrabajadorSerializer(obj).data)
+        return _detalle(request, obj, EficienciaTrabajadorSerializer)
 
     if request.method == "PUT":
         serializer = EficienciaTrabajadorSerializer(obj, data=request.data)
@@ -244,6 +384,15 @@ def eficiencia_detail(request, pk):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@extend_schema(responses={200: dict})
+@api_view(["GET"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def eficiencia_puntajes(request):
+    """Ranking de eficiencia del mes (``core/eficiencia.py``)."""
+    return Response(eficiencia.consultar(request.query_params))
+
+
 # ===================== DESEMPEÑOS =====================
 
 @extend_schema(
@@ -251,13 +400,12 @@ def eficiencia_detail(request, pk):
     responses={200: DesempenoTrabajadorSerializer(many=True), 201: DesempenoTrabajadorSerializer}
 )
 @api_view(["GET", "POST"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def desempeno_list(request):
 
     if request.method == "GET":
-        data = DesempenoTrabajador.objects.all()
-        return Response(DesempenoTrabajadorSerializer(data, many=True).data)
+        return _listar(request, DesempenoTrabajador.objects.all(), DesempenoTrabajadorSerializer)
 
     if request.method == "POST":
         serializer = DesempenoTrabajadorSerializer(data=request.data)
@@ -271,7 +419,7 @@ def desempeno_list(request):
     responses={200: DesempenoTrabajadorSerializer, 204: None}
 )
 @api_view(["GET", "PUT", "DELETE"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def desempeno_detail(request, pk):
 
@@ -281,7 +429,7 @@ def desempeno_detail(request, pk):
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        return Response(DesempenoTrabajadorSerializer(obj).data)
+        return _detalle(request, obj, DesempenoTrabajadorSerializer)
 
     if request.method == "PUT":
         serializer = DesempenoTrabajadorSerializer(obj, data=request.data)
@@ -301,13 +449,12 @@ def desempeno_detail(request, pk):
     responses={200: SueldoTrabajadorSerializer(many=True), 201: SueldoTrabajadorSerializer}
 )
 @api_view(["GET", "POST"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def sueldo_list(request):
 
     if request.method == "GET":
-        data = SueldoTrabajador.objects.all()
-        return Response(SueldoTrabajadorSerializer(data, many=True).data)
+        return _listar(request, SueldoTrabajador.objects.all(), SueldoTrabajadorSerializer)
 
     if request.method == "POST":
         serializer = SueldoTrabajadorSerializer(data=request.data)
@@ -321,7 +468,7 @@ def sueldo_list(request):
     responses={200: SueldoTrabajadorSerializer, 204: None}
 )
 @api_view(["GET", "PUT", "DELETE"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def sueldo_detail(request, pk):
 
@@ -331,7 +478,7 @@ def sueldo_detail(request, pk):
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        return Response(SueldoTrabajadorSerializer(obj).data)
+        return _detalle(request, obj, SueldoTrabajadorSerializer)
 
     if request.method == "PUT":
         serializer = SueldoTrabajadorSerializer(obj, data=request.data)
@@ -342,3 +489,150 @@ def sueldo_detail(request, pk):
     if request.method == "DELETE":
         obj.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(
+    request=SueldoTrabajadorSerializer(many=True),
+    responses={200: SueldoTrabajadorSerializer(many=True), 201: SueldoTrabajadorSerializer(many=True)}
+)
+@api_view(["POST", "PUT", "PATCH", "DELETE"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def sueldo_bulk(request):
+    return procesar_lote(request, SueldoTrabajadorSerializer)
+
+
+@extend_schema(request={"multipart/form-data": _ARCHIVO}, responses={201: dict, 202: TrabajoSerializer, 400: dict})
+@api_view(["POST"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def sueldo_importar(request):
+    return _importar(request, SueldoTrabajadorSerializer)
+
+
+_MES = {"type": "object", "properties": {"mes": {"type": "string", "example": "2025-11"}}}
+
+
+@extend_schema(request=_MES, responses={202: TrabajoSerializer, 400: dict})
+@api_view(["POST"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def sueldo_calcular(request):
+    """Encola el cálculo de la nómina del mes (``core/nomina.py``)."""
+    mes = nomina.validar_mes(request.data.get("mes"))
+    return _trabajo_aceptado(trabajos.encolar("calcular_nomina", {"mes": mes}))
+
+
+# ===================== RESUMEN MENSUAL =====================
+
+@extend_schema(responses={200: dict})
+@api_view(["GET"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def resumen_mensual(request):
+    return Response(resumen.consultar(request.query_params))
+
+
+# ===================== CAMBIOS =====================
+
+@extend_schema(responses={200: dict, 410: dict})
+@api_view(["GET"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def changes(request):
+    datos = cambios.consultar(request.query_params)
+    if datos.pop("reiniciar", False):
+        datos["detail"] = "El cursor es anterior a los cambios conservados; descargue las tablas completas."
+        return Response(datos, status=status.HTTP_410_GONE)
+    return Response(datos)
+
+
+# ===================== TRABAJOS =====================
+
+def _trabajo_aceptado(trabajo):
+    return Response(
+        TrabajoSerializer(trabajo).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Location": reverse("trabajo_detail", args=[trabajo.pk])},
+    )
+
+
+# Los trabajos exigen autenticación también para leer: parametros y error
+# pueden traer RUTs, rutas de archivos o trazas internas
+@extend_schema(
+    request=TrabajoSerializer,
+    responses={200: TrabajoSerializer(many=True), 202: TrabajoSerializer}
+)
+@api_view(["GET", "POST"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def trabajo_list(request):
+
+    if request.method == "GET":
+        queryset = filtrar(Trabajo.objects.all(), request.query_params)
+        paginator = KeysetPagination(ordering=("-id",))
+        page = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_response(TrabajoSerializer(page, many=True).data)
+
+    serializer = TrabajoSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    trabajo = trabajos.encolar(
+        serializer.validated_data["tarea"],
+        serializer.validated_data.get("parametros"),
+        serializer.validated_data.get("max_intentos"),
+    )
+    return _trabajo_aceptado(trabajo)
+
+
+@extend_schema(responses={200: TrabajoSerializer, 409: dict})
+@api_view(["GET", "DELETE"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def trabajo_detail(request, pk):
+
+    try:
+        trabajo = Trabajo.objects.get(pk=pk)
+    except Trabajo.DoesNotExist:
+        return Response({"detail": "Trabajo no encontrado"}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == "DELETE":
+        if not trabajos.cancelar(trabajo):
+            return Response({"detail": f"Sólo se puede cancelar un trabajo PENDIENTE (está {trabajo.estado})."},
+                            status=status.HTTP_409_CONFLICT)
+        trabajo.refresh_from_db()
+
+    return Response(TrabajoSerializer(trabajo).data)
+
+
+# ===================== ESTADÍSTICAS =====================
+
+@extend_schema(responses={200: dict})
+@api_view(["GET"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def stats_asistencia(request):
+    return Response(stats.asistencia_por_grupo(request.query_params))
+
+
+@extend_schema(responses={200: dict})
+@api_view(["GET"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def stats_atrasos(request):
+    return Response(stats.atraso_por_trabajador(request.query_params))
+
+
+@extend_schema(responses={200: dict})
+@api_view(["GET"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def stats_accidentes(request):
+    return Response(stats.accidentes_por_mes(request.query_params))
+
+
+@extend_schema(responses={200: dict})
+@api_view(["GET"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def stats_sueldos(request):
+    return Response(stats.distribucion_sueldos(request.query_params))
@@ -0,0 +1,312 @@
+# core/views_async.py
+"""
+Versiones async de los endpoints CRUD para servir la API con ASGI
+(``uvicorn backend.asgi:application``).
+
+Las vistas usan el ORM async (``aget``, ``adelete`` e iteración
+``async for``), así una petición que espera a la base de datos no ocupa
+un thread del worker mientras tanto. La validación y el guardado de los
+serializers (``is_valid``, ``save``, que pueden tener lógica propia) y la
+autenticación se ejecutan con ``sync_to_async``.
+
+Responden igual que las vistas de ``core/views.py`` (filtros, orden,
+``?fields=``, paginación por cursor, ``?stream=``, GET condicional y caché
+de listados) y se activan con ``API_ASYNC_VIEWS`` (ver ``backend/urls.py``).
+Las operaciones en lote, el resumen y las estadísticas siguen siendo
+síncronas.
+
+``stream_eventos`` (``/api/events/``) entrega los cambios en vivo con
+Server-Sent Events y sólo funciona con ASGI.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from rest_framework import exceptions, status
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+
+from . import cache, cambios, eventos, fastpath, metricas
+from .authentication import CachedTokenAuthentication
+from .bulk import upsert_uno
+from .condicional import agregar_validadores, avalidadores_listado, no_modificado, validadores_objeto
+from .filters import campos_solicitados, columnas, filtrar, ordenamiento
+from .models import (
+    Trabajador, Asistencia, Accidente,
+    EficienciaTrabajador, DesempenoTrabajador, SueldoTrabajador
+)
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer
+from .serializers import (
+    TrabajadorSerializer, AsistenciaSerializer, AccidenteSerializer,
+    EficienciaTrabajadorSerializer, DesempenoTrabajadorSerializer, SueldoTrabajadorSerializer
+)
+from .streaming import arespuesta_stream
+
+_renderer = FastJSONRenderer()
+
+
+def _respuesta(data=None, status_code=status.HTTP_200_OK):
+    if data is None:
+        return HttpResponse(status=status_code)
+    return HttpResponse(_renderer.render(data), status=status_code, content_type="application/json")
+
+
+def _error(exc):
+    detalle = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    respuesta = _respuesta(detalle, exc.status_code)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        respuesta.status_code = status.HTTP_401_UNAUTHORIZED
+        respuesta["WWW-Authenticate"] = CachedTokenAuthentication().authenticate_header(None)
+    return respuesta
+
+
+def _usuario(request):
+    # Fuerza la autenticación (cache o base de datos) fuera del event loop
+    return request.user
+
+
+async def _preparar(django_request, metodos):
+    """
+    Envuelve la petición en un ``Request`` de DRF (query_params, data) y
+    aplica autenticación y ``IsAuthenticatedOrReadOnly``.
+    """
+    if django_request.method not in metodos:
+        raise exceptions.MethodNotAllowed(django_request.method)
+    request = Request(
+        django_request,
+        parsers=[JSONParser(), FormParser(), MultiPartParser()],
+        authenticators=[CachedTokenAuthentication()],
+    )
+    user = await sync_to_async(_usuario)(request)
+    if request.method not in SAFE_METHODS and not (user and user.is_authenticated):
+        raise exceptions.NotAuthenticated()
+    return request
+
+
+def _api(metodos):
+    """Decorador: prepara la petición y convierte las APIException en JSON."""
+    def decorador(vista):
+        @wraps(vista)
+        async def envoltura(django_request, *args, **kwargs):
+            try:
+                request = await _preparar(django_request, metodos)
+                return await vista(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                respuesta = _error(exc)
+                if isinstance(exc, exceptions.MethodNotAllowed):
+                    respuesta["Allow"] = ", ".join(metodos)
+                return respuesta
+        return csrf_exempt(envoltura)
+    return decorador
+
+
+# ===================== LISTADOS =====================
+
+def _cache_listado(request, model):
+    clave = cache.clave_respuesta(request, model)
+    return clave, cache.obtener(clave)
+
+
+async def _listar(request, queryset, serializer_class, ordering=("id",)):
+    params = request.query_params
+    queryset = filtrar(queryset, params)
+    ordering = ordenamiento(params, queryset.model, ordering)
+    fields = campos_solicitados(params, serializer_class)
+    if fields is not None:
+        queryset = queryset.only(*columnas(queryset.model, fields, ordering))
+
+    usar_cache = cache.habilitada() and not params.get("stream")
+    if usar_cache:
+        clave, entrada = await sync_to_async(_cache_listado)(request, queryset.model)
+        if entrada is not None:
+            etag, timestamp = entrada["etag"], entrada["timestamp"]
+            respuesta = no_modificado(request, etag, timestamp) or _respuesta(entrada["data"])
+            respuesta["X-Cache"] = "HIT"
+            return agregar_validadores(respuesta, etag, timestamp)
+
+    etag, timestamp = await avalidadores_listado(request, queryset)
+    respuesta = no_modificado(request, etag, timestamp)
+    if respuesta is not None:
+        return respuesta
+
+    if params.get("stream"):
+        return agregar_validadores(
+            arespuesta_stream(request, queryset, serializer_class, fields=fields), etag, timestamp
+        )
+
+    paginator = KeysetPagination(ordering=ordering)
+    if fastpath.habilitada(serializer_class):
+        extra = [campo.lstrip("-") for campo in ordering]
+        valores, convertir = fastpath.valores(queryset, serializer_class, fields, extra=extra)
+        filas = await paginator.apaginate_queryset(valores, request)
+        with metricas.medir("serializacion"):
+            data = convertir(filas)
+    else:
+        page = await paginator.apaginate_queryset(queryset, request)
+        with metricas.medir("serializacion"):
+            data = serializer_class(page, many=True, fields=fields).data
+    data = {"next": paginator.get_next_link(), "results": data}
+    respuesta = _respuesta(data)
+    if usar_cache:
+        await sync_to_async(cache.guardar)(clave, {"data": data, "etag": etag, "timestamp": timestamp})
+        respuesta["X-Cache"] = "MISS"
+    return agregar_validadores(respuesta, etag, timestamp)
+
+
+# ===================== CRUD =====================
+
+def crud(model, serializer_class, ordering=("id",), no_encontrado=None, upsert=False):
+    """
+    Genera las vistas async ``(lista, detalle)`` de ``model``.
+
+    ``lista`` atiende GET (listado) y POST (creación, o ``?upsert=1`` si
+    ``upsert``); ``detalle`` atiende GET, PUT y DELETE.
+    """
+
+    @_api(("GET", "POST"))
+    async def lista(request):
+        if request.method == "GET":
+            return await _listar(request, model.objects.all(), serializer_class, ordering=ordering)
+
+        if upsert and request.query_params.get("upsert"):
+            respuesta = await sync_to_async(upsert_uno)(request, serializer_class)
+            return _respuesta(respuesta.data, respuesta.status_code)
+
+        serializer = serializer_class(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        # serializer.save() como la vista síncrona: respeta create() del serializer
+        await sync_to_async(serializer.save)()
+        return _respuesta(serializer.data, status.HTTP_201_CREATED)
+
+    @_api(("GET", "PUT", "DELETE"))
+    async def detalle(request, pk):
+        try:
+            obj = await model.objects.aget(pk=pk)
+        except model.DoesNotExist:
+            cuerpo = {"detail": no_encontrado} if no_encontrado else None
+            return _respuesta(cuerpo, status.HTTP_404_NOT_FOUND)
+
+        if request.method == "GET":
+            etag, timestamp = validadores_objeto(request, obj)
+            respuesta = no_modificado(request, etag, timestamp)
+            if respuesta is not None:
+                return respuesta
+            with metricas.medir("serializacion"):
+                data = serializer_class(obj).data
+            return agregar_validadores(_respuesta(data), etag, timestamp)
+
+        if request.method == "PUT":
+            serializer = serializer_class(obj, data=request.data)
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+            await sync_to_async(serializer.save)()
+            return _respuesta(serializer.data)
+
+        await obj.adelete()
+        return _respuesta(status_code=status.HTTP_204_NO_CONTENT)
+
+    lista.__name__ = f"{model._meta.model_name}_list"
+    detalle.__name__ = f"{model._meta.model_name}_detail"
+    return lista, detalle
+
+
+trabajador_list, trabajador_detail = crud(
+    Trabajador, TrabajadorSerializer, no_encontrado="Trabajador no encontrado"
+)
+asistencia_list, asistencia_detail = crud(
+    Asistencia, AsistenciaSerializer, ordering=("-fecha", "id"),
+    no_encontrado="Asistencia no encontrada", upsert=True,
+)
+accidente_list, accidente_detail = crud(
+    Accidente, AccidenteSerializer, no_encontrado="Accidente no encontrado"
+)
+eficiencia_list, eficiencia_detail = crud(EficienciaTrabajador, EficienciaTrabajadorSerializer)
+desempeno_list, desempeno_detail = crud(DesempenoTrabajador, DesempenoTrabajadorSerializer)
+sueldo_list, sueldo_detail = crud(SueldoTrabajador, SueldoTrabajadorSerializer)
+
+
+# ===================== EVENTOS (SSE) =====================
+
+def _sse(nombre, datos, cursor=None):
+    partes = [b"event: " + nombre.encode()]
+    if cursor is not None:
+        partes.append(b"id: " + str(cursor).encode())
+    partes.append(b"data: " + _renderer.render(datos))
+    return b"\n".join(partes) + b"\n\n"
+
+
+async def _flujo(since, recursos):
+    """
+    Reenvía los eventos del broker. Con ``since`` (``Last-Event-ID`` al
+    reconectar) primero reproduce ``/api/changes/`` desde ese cursor; la
+    suscripción se abre antes para no perder lo que llegue mientras tanto.
+    """
+    latido = getattr(settings, "API_EVENTS_HEARTBEAT_SECONDS", 15)
+    async with eventos.broker().suscribir() as suscripcion:
+        yield b"retry: 3000\n\n"
+
+        ultimo = None
+        if since is not None:
+            params = {"since": str(since), "recursos": ",".join(recursos)}
+            consultar = sync_to_async(cambios.consultar)
+            # Segunda pasada: los cambios que eran muy recientes para la primera
+            for pasada in range(2):
+                if pasada:
+                    await asyncio.sleep(getattr(settings, "API_CHANGES_LAG_SECONDS", 2))
+                mas = True
+                while mas:
+                    pagina = await consultar(params)
+                    if pagina.get("reiniciar"):
+                        yield _sse("reiniciar", {"cursor": pagina["cursor"]}, pagina["cursor"])
+                    for i, cambio in enumerate(pagina["cambios"], start=1):
+                        cursor = pagina["cursor"] if i == len(pagina["cambios"]) else None
+                        yield _sse("cambio", {"tipo": "cambio", **cambio, "cursor": cursor}, cursor)
+                    params["since"], mas = pagina["cursor"], pagina["mas"]
+            ultimo = int(params["since"])
+
+        while True:
+            lote = await suscripcion.recibir(latido)
+            if suscripcion.desbordada:
+                suscripcion.desbordada = False
+                yield _sse("desfase", {"detail": "Se descartaron eventos; sincronice con /api/changes/."})
+            if lote is None:
+                yield b": ping\n\n"
+                continue
+            for evento in lote:
+                if recursos and evento["recurso"] not in recursos:
+                    continue
+                cursor = evento.get("cursor")
+                if cursor is not None and ultimo is not None and int(cursor) <= ultimo:
+                    continue
+                yield _sse(evento["tipo"], evento, cursor)
+
+
+@_api(("GET",))
+async def stream_eventos(request):
+    """
+    ``GET /api/events/?recursos=accidentes,asistencias``: Server-Sent Events
+    con cada alta, modificación o eliminación confirmada.
+    """
+    if not isinstance(request._request, ASGIRequest):
+        return _respuesta(
+            {"detail": "Los eventos requieren un servidor ASGI (uvicorn backend.asgi:application)."},
+            status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    recursos = cambios._recursos(request.query_params)
+    since = request.headers.get("Last-Event-ID") or request.query_params.get("since")
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            raise exceptions.ValidationError({"since": "Debe ser un número entero."})
+
+    respuesta = StreamingHttpResponse(_flujo(since, recursos), content_type="text/event-stream")
+    respuesta["Cache-Control"] = "no-cache"
+    respuesta["X-Accel-Buffering"] = "no"
+    return respuesta
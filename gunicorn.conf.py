@@ -0,0 +1,35 @@
+# gunicorn.conf.py
+"""
+Configuración de gunicorn leída del entorno:
+
+    gunicorn backend.wsgi            # vistas síncronas (gthread)
+    API_ASYNC_VIEWS=1 gunicorn backend.asgi:application   # uvicorn workers
+
+WEB_CONCURRENCY (procesos), GUNICORN_THREADS, GUNICORN_TIMEOUT,
+GUNICORN_MAX_REQUESTS y PORT ajustan los workers. Con conexiones
+persistentes cada thread mantiene una conexión abierta: el total hacia la
+base de datos es procesos × threads (o procesos × DB_POOL_MAX_SIZE con el
+pool de PostgreSQL).
+"""
+import multiprocessing
+import os
+
+from backend.env import env_bool, env_int
+
+bind = f"0.0.0.0:{env_int('PORT', 8000)}"
+workers = env_int("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+
+if env_bool("API_ASYNC_VIEWS"):
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    worker_class = "gthread"
+    threads = env_int("GUNICORN_THREADS", 4)
+
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+
+# Recicla los procesos periódicamente (fugas de memoria de dependencias)
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = max_requests // 10
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")